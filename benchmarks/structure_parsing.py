@@ -0,0 +1,69 @@
+"""Micro-benchmarks for parsing the XML structure files shipped in `data/`.
+
+Run with `python benchmarks/structure_parsing.py` from the repository root.
+"""
+
+from pathlib import Path
+from timeit import timeit
+
+from lxml import etree
+
+from survey_framework.data_import.survey_structure import (
+    StructureParser,
+    _clean_html,
+    _clean_text,
+    read_lime_questionnaire_structure,
+)
+
+DATA_PATH = Path(__file__).parent.parent / "data"
+STRUCTURE_FILES = sorted(DATA_PATH.glob("*.xml"))
+REPEAT = 5
+
+
+def collect_texts(xml_file: Path) -> list[str]:
+    """Collect the text content of every element, as passed to `_clean_text`.
+
+    Args:
+        xml_file: Path to the XML structure file
+
+    Returns:
+        One string per element.
+    """
+    return [
+        "".join(element.itertext())
+        for element in etree.parse(xml_file).iter()
+        if isinstance(element.tag, str)
+    ]
+
+
+def bench_clean_text() -> None:
+    """Compare the regex fast path against always using the HTML parser."""
+    for xml_file in STRUCTURE_FILES:
+        texts = collect_texts(xml_file)
+        assert [_clean_text(t) for t in texts] == [_clean_html(t) for t in texts]
+
+        html = timeit(lambda t=texts: [_clean_html(s) for s in t], number=REPEAT)
+        fast = timeit(lambda t=texts: [_clean_text(s) for s in t], number=REPEAT)
+        print(
+            f"{xml_file.name}: {len(texts)} texts, "
+            f"html parser {html / REPEAT * 1000:.1f} ms, "
+            f"fast path {fast / REPEAT * 1000:.1f} ms ({html / fast:.1f}x)"
+        )
+
+
+def bench_structure() -> None:
+    """Time reading the full structure with each parser backend."""
+    for xml_file in STRUCTURE_FILES:
+        timings = []
+        for parser in StructureParser:
+            seconds = timeit(
+                lambda f=xml_file, p=parser: read_lime_questionnaire_structure(f, p),
+                number=REPEAT,
+            )
+            timings.append(f"{parser} {seconds / REPEAT * 1000:.1f} ms")
+        print(f"{xml_file.name}: {', '.join(timings)}")
+
+
+if __name__ == "__main__":
+    bench_clean_text()
+    bench_structure()
@@ -0,0 +1,328 @@
+"""Correlation matrices of many columns with a few scores, computed in one pass.
+
+`DataFrame.corrwith` correlates all columns with a single Series, so correlating
+e.g. all C1 items with four health scores aligns the tables and ranks every
+column once per score. `correlate` aligns both tables once and sorts every
+column once. Like pandas, every pair of columns uses the rows where both are
+present (pairwise-complete), and Spearman ranks are taken within these rows.
+
+- Pearson: sums over the pairwise-complete rows are masked matrix products of
+  all columns at once.
+- Spearman: the ranks within the complete rows of every pair are derived from
+  the sort order of each column in linear time, without sorting again. Without
+  missing values, the ranks are computed once and correlated like Pearson.
+- Kendall: every pair is passed to `scipy.stats.kendalltau`, like pandas does.
+"""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["CorrMethod", "Correlations", "correlate"]
+
+# number of column pairs times rows that Spearman ranks at once
+_CHUNK_SIZE = 1 << 22
+# variance relative to the sum of squares below which a column counts as constant
+_CONSTANT = 1e-12
+
+
+class CorrMethod(StrEnum):
+    """Correlation Method used by Pandas."""
+
+    KENDALL = "kendall"  # Kendall's tau
+    PEARSON = "pearson"  # Pearson's rho
+    SPEARMAN = "spearman"  # Spearman's rho
+
+
+@dataclass(frozen=True, slots=True)
+class Correlations:
+    """Correlations of data columns (rows) with target columns (columns).
+
+    Attributes:
+        coefficients: correlation coefficients, NaN if there are less than two
+            complete pairs or one of the columns is constant on them
+        counts: number of complete pairs, i.e. rows where both columns are present
+        p_values: two-sided p-values of the coefficients, or None if they were not
+            requested
+    """
+
+    coefficients: pd.DataFrame
+    counts: pd.DataFrame
+    p_values: pd.DataFrame | None = None
+
+
+def _tie_groups(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort every column and find its groups of equal values.
+
+    Args:
+        values: 2D array, NaN for missing values
+
+    Returns:
+        Tuple of the row positions that sort every column, and for every sorted
+        position the first and the last sorted position of its group of ties
+    """
+    length = len(values)
+    order = np.argsort(values, axis=0, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=0)
+    positions = np.broadcast_to(np.arange(length)[:, None], values.shape)
+
+    # NaN != NaN, so missing values are never tied
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:-1] = starts[1:]
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=0)
+    last = np.where(ends, positions, length - 1)[::-1]
+    last = np.minimum.accumulate(last, axis=0)[::-1]
+    return order, first, last
+
+
+def _ranks(
+    order: np.ndarray, first: np.ndarray, last: np.ndarray, valid: np.ndarray
+) -> np.ndarray:
+    """Rank one column within several subsets of its rows, using its sort order.
+
+    Args:
+        order: row positions that sort the column, see `_tie_groups`
+        first: first sorted position of the ties of every sorted position
+        last: last sorted position of the ties of every sorted position
+        valid: 2D array, the rows to rank in every column
+
+    Returns:
+        Ranks starting at 1 within every subset, ties get their average rank
+        like with `scipy.stats.rankdata`. The ranks of invalid rows are
+        meaningless.
+    """
+    counted = valid[order]
+    # number of valid rows up to every sorted position
+    total = np.cumsum(counted, axis=0)
+    ranks = np.empty(valid.shape)
+    ranks[order] = ((total - counted)[first] + 1 + total[last]) / 2
+    return ranks
+
+
+def _rank_columns(order: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """Rank all rows of every column, see `_tie_groups` for the arguments.
+
+    Returns:
+        Ranks starting at 1, ties get their average rank
+    """
+    valid = np.ones((len(order), 1), dtype=bool)
+    ranks = np.empty(order.shape)
+    for i in range(order.shape[1]):
+        ranks[:, i] = _ranks(order[:, i], first[:, i], last[:, i], valid)[:, 0]
+    return ranks
+
+
+def _paired_spearman(
+    x_ranks: np.ndarray, y_ranks: np.ndarray, valid: np.ndarray
+) -> np.ndarray:
+    """Correlate the ranks of x with those of y, on the rows they were ranked on.
+
+    Args:
+        x_ranks: ranks within the valid rows, see `_ranks`
+        y_ranks: ranks within the valid rows, same shape as x_ranks
+        valid: rows that were ranked
+
+    Returns:
+        Spearman correlation coefficients, reduced over the first axis
+    """
+    # ranks within n rows have the mean (n + 1) / 2
+    mean = (valid.sum(axis=0) + 1) / 2
+    x_ranks = (x_ranks - mean) * valid
+    y_ranks = (y_ranks - mean) * valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coefficients = (x_ranks * y_ranks).sum(axis=0) / np.sqrt(
+            (x_ranks * x_ranks).sum(axis=0) * (y_ranks * y_ranks).sum(axis=0)
+        )
+    return np.clip(coefficients, -1, 1)
+
+
+def _masked_pearson(
+    x: np.ndarray, y: np.ndarray, x_valid: np.ndarray, y_valid: np.ndarray
+) -> np.ndarray:
+    """Correlate all columns of x with all columns of y, on pairwise-complete rows.
+
+    Args:
+        x: 2D array of values, NaN for missing values
+        y: 2D array of values, NaN for missing values
+        x_valid: where x is not missing
+        y_valid: where y is not missing
+
+    Returns:
+        Pearson correlation coefficients, one row per column of x
+    """
+    x_weights = x_valid.astype(float)
+    y_weights = y_valid.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # centering first keeps the sums small, so their differences stay exact
+        x = np.where(x_valid, x - np.nansum(x, axis=0) / x_weights.sum(axis=0), 0.0)
+        y = np.where(y_valid, y - np.nansum(y, axis=0) / y_weights.sum(axis=0), 0.0)
+        count = x_weights.T @ y_weights
+        x_sum = x.T @ y_weights
+        y_sum = x_weights.T @ y
+        x_squares = (x * x).T @ y_weights
+        y_squares = x_weights.T @ (y * y)
+        x_variance = x_squares - x_sum**2 / count
+        y_variance = y_squares - y_sum**2 / count
+        covariance = x.T @ y - x_sum * y_sum / count
+        coefficients = covariance / np.sqrt(x_variance * y_variance)
+
+    # rounding errors of constant columns must not look like correlations
+    constant = (x_variance <= _CONSTANT * x_squares) | (
+        y_variance <= _CONSTANT * y_squares
+    )
+    coefficients[constant | (count < 2)] = np.nan
+    return np.clip(coefficients, -1, 1)
+
+
+def _spearman(
+    x: np.ndarray, y: np.ndarray, x_valid: np.ndarray, y_valid: np.ndarray
+) -> np.ndarray:
+    """Spearman correlation of all columns of x with all columns of y.
+
+    Args:
+        x: 2D array of values, NaN for missing values
+        y: 2D array of values, NaN for missing values
+        x_valid: where x is not missing
+        y_valid: where y is not missing
+
+    Returns:
+        Spearman correlation coefficients, one row per column of x
+    """
+    x_order, x_first, x_last = _tie_groups(x)
+    y_order, y_first, y_last = _tie_groups(y)
+    if x_valid.all() and y_valid.all():
+        # all pairs are complete, so every column is ranked only once
+        return _masked_pearson(
+            _rank_columns(x_order, x_first, x_last),
+            _rank_columns(y_order, y_first, y_last),
+            x_valid,
+            y_valid,
+        )
+
+    # rank both columns of every pair within its complete rows, for a chunk of x
+    length, targets = y.shape
+    coefficients = np.empty((x.shape[1], targets))
+    chunk = max(1, _CHUNK_SIZE // max(1, length * targets))
+    for start in range(0, x.shape[1], chunk):
+        columns = range(start, min(start + chunk, x.shape[1]))
+        valid = x_valid[:, columns, None] & y_valid[:, None, :]
+        x_ranks = np.empty(valid.shape)
+        y_ranks = np.empty(valid.shape)
+        for k, i in enumerate(columns):
+            x_ranks[:, k] = _ranks(
+                x_order[:, i], x_first[:, i], x_last[:, i], valid[:, k]
+            )
+        for j in range(targets):
+            y_ranks[:, :, j] = _ranks(
+                y_order[:, j], y_first[:, j], y_last[:, j], valid[:, :, j]
+            )
+        coefficients[start : columns.stop] = _paired_spearman(x_ranks, y_ranks, valid)
+    return coefficients
+
+
+def _kendall(
+    x: np.ndarray, y: np.ndarray, x_valid: np.ndarray, y_valid: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Kendall's tau-b of all columns of x with all columns of y.
+
+    Args:
+        x: 2D array of values, NaN for missing values
+        y: 2D array of values, NaN for missing values
+        x_valid: where x is not missing
+        y_valid: where y is not missing
+
+    Returns:
+        Tuple of the correlation coefficients and their p-values, one row per
+        column of x
+    """
+    from scipy import stats
+
+    coefficients = np.full((x.shape[1], y.shape[1]), np.nan)
+    p_values = coefficients.copy()
+    for i, j in np.ndindex(coefficients.shape):
+        valid = x_valid[:, i] & y_valid[:, j]
+        if valid.sum() < 2:
+            continue
+        result = stats.kendalltau(x[valid, i], y[valid, j])
+        coefficients[i, j] = result.statistic
+        p_values[i, j] = result.pvalue
+    return coefficients, p_values
+
+
+def _t_test(coefficients: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of Pearson or Spearman correlation coefficients.
+
+    Args:
+        coefficients: correlation coefficients
+        counts: number of complete pairs of every coefficient
+
+    Returns:
+        p-values of the t-test of the coefficients, as by `scipy.stats.spearmanr`
+    """
+    from scipy import stats
+
+    freedom = counts - 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = coefficients * np.sqrt(freedom / ((1 - coefficients) * (1 + coefficients)))
+        p_values = 2 * stats.t.sf(np.abs(t), np.where(freedom > 0, freedom, np.nan))
+    return np.where(np.isnan(coefficients), np.nan, p_values)
+
+
+def correlate(
+    data: pd.DataFrame,
+    targets: pd.DataFrame | None = None,
+    method: CorrMethod = CorrMethod.SPEARMAN,
+    p_values: bool = False,
+) -> Correlations:
+    """Correlate all columns of a table with all columns of another.
+
+    Gives the same coefficients as `data.corrwith(targets[column], method=...)`
+    for every target column, but aligns and sorts every column only once. The
+    tables are aligned on their index, and every pair of columns is correlated
+    on the rows where both are present.
+
+    Args:
+        data: numeric columns, the rows of the result
+        targets: numeric columns, e.g. scores, the columns of the result.
+            Defaults to `data`, for its full correlation matrix.
+        method: statistical correlation method
+        p_values: whether to compute two-sided p-values, which needs scipy
+
+    Returns:
+        Correlation coefficients, numbers of complete pairs and p-values
+    """
+    if targets is None:
+        targets = data
+    data, targets = data.align(targets, join="inner", axis="index")
+
+    x = data.to_numpy(dtype=float, na_value=np.nan)
+    y = targets.to_numpy(dtype=float, na_value=np.nan)
+    x_valid = ~np.isnan(x)
+    y_valid = ~np.isnan(y)
+    counts = x_valid.T.astype(np.int64) @ y_valid.astype(np.int64)
+
+    probabilities = None
+    match CorrMethod(method):
+        case CorrMethod.PEARSON:
+            coefficients = _masked_pearson(x, y, x_valid, y_valid)
+        case CorrMethod.SPEARMAN:
+            coefficients = _spearman(x, y, x_valid, y_valid)
+        case CorrMethod.KENDALL:
+            coefficients, probabilities = _kendall(x, y, x_valid, y_valid)
+    if not p_values:
+        probabilities = None
+    elif probabilities is None:
+        probabilities = _t_test(coefficients, counts)
+
+    def frame(values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=data.columns, columns=targets.columns)
+
+    return Correlations(
+        coefficients=frame(coefficients),
+        counts=frame(counts),
+        p_values=None if probabilities is None else frame(probabilities),
+    )
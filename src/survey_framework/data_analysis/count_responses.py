@@ -6,8 +6,48 @@ as well as "grouped" variants for both (which can be used for comparison barplot
 
 from collections.abc import Hashable
 
+import numpy as np
 import pandas as pd
 
+from ..data_import.multiple_choice import MultipleChoiceBits
+
+
+def _ordered(
+    values: "pd.Series[str]", orderlist: list[str]
+) -> "pd.Series[str] | pd.Categorical":
+    """Make answer options sortable in the given order.
+
+    Categorical values (like all answers with options, see `LimeSurveyData`) only
+    get their categories replaced, other values are converted.
+
+    Args:
+        values: answer options or groups
+        orderlist: the options in the wanted order
+
+    Returns:
+        Ordered categorical values
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.set_categories(orderlist, ordered=True)
+    return pd.Categorical(values, categories=orderlist, ordered=True)
+
+
+def _observed(values: pd.Series) -> pd.Series:
+    """Drop the categories that do not occur in categorical values.
+
+    Answers with options have all of them as categories (see `LimeSurveyData`),
+    but counts only list the options and groups that occur in the data.
+
+    Args:
+        values: answer options or groups
+
+    Returns:
+        The values, categorical ones only with their occurring categories
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.remove_unused_categories()
+    return values
+
 
 def prepare_df_single(
     data: pd.DataFrame, q: str, ordering: dict[str, list[str]]
@@ -30,22 +70,30 @@ def prepare_df_single(
     assert "id" not in data.columns
     N_question = data.count().iloc[0]
 
-    # need to reset the index, otherwise count returns an empty DF.
-    data_q_counts = (
-        data.reset_index()
-        .groupby(q, observed=False)
-        .count()
-        .rename(columns={"id": "count"})
-    )
+    answers = _observed(data[q])
+    if isinstance(answers.dtype, pd.CategoricalDtype):
+        # count the category codes directly, missing answers have code -1
+        codes = answers.cat.codes.to_numpy()
+        categories = answers.cat.categories
+        data_q_counts = pd.DataFrame(
+            {"count": np.bincount(codes[codes >= 0], minlength=len(categories))},
+            index=pd.CategoricalIndex(categories, dtype=answers.dtype, name=q),
+        )
+    else:
+        # need to reset the index, otherwise count returns an empty DF.
+        data_q_counts = (
+            data.reset_index()
+            .groupby(q, observed=False)
+            .count()
+            .rename(columns={"id": "count"})
+        )
 
     # sort the dataframe
     data_q_counts_sorted = data_q_counts.reset_index()
     orderlist = ordering.get(q)
     if orderlist:
         # sort with given order
-        data_q_counts_sorted[q] = pd.Categorical(
-            data_q_counts_sorted[q], categories=orderlist, ordered=True
-        )
+        data_q_counts_sorted[q] = _ordered(data_q_counts_sorted[q], orderlist)
         data_q_counts_sorted = data_q_counts_sorted.sort_values(by=q)
 
     # add percentages column
@@ -58,7 +106,7 @@ def prepare_df_single(
 
 
 def prepare_df_multiple(
-    data: pd.DataFrame, q: str, ordering: dict[str, list[str]]
+    data: pd.DataFrame | MultipleChoiceBits, q: str, ordering: dict[str, list[str]]
 ) -> tuple[pd.DataFrame, int]:
     """Count participants in the data. This function is for multiple-choice questions.
 
@@ -68,18 +116,22 @@ def prepare_df_multiple(
         - proportion: share of participants (relative to "total") that gave this answ.
 
     Args:
-        data: The main DataFrame of answers
+        data: The main DataFrame of answers, or the packed answers from
+            `LimeSurveyData.get_multiple_choice`
         q: name of the output column for answer options
         ordering: Answer re-ordering dict, e.g. ORDER from `order/order2024.py`
 
     Returns:
         Tuple of [DataFrame, participant number]. The latter is used as N in plots.
     """
-    # boolean value: participants who answered anything (summed up later)
-    data["total"] = data.sum(axis="columns").gt(0)
-    # melt into long form
-    responses_melted = pd.melt(data, id_vars=["total"], value_name="count", var_name=q)
-    responses_counts = responses_melted.groupby(q).sum()
+    if not isinstance(data, MultipleChoiceBits):
+        data = MultipleChoiceBits.from_responses(data)
+
+    # count participants who answered anything, and who chose each option
+    responses_counts = pd.DataFrame(
+        {"total": data.total(), "count": data.counts()}
+    ).rename_axis(q)
+    responses_counts = responses_counts.sort_index()
 
     # add percentages column
     responses_counts["proportion"] = (
@@ -95,9 +147,7 @@ def prepare_df_multiple(
     orderlist = ordering.get(q)
     if orderlist:
         # sort with given order
-        responses_clean[q] = pd.Categorical(
-            responses_clean[q], categories=orderlist, ordered=True
-        )
+        responses_clean[q] = _ordered(responses_clean[q], orderlist)
         responses_sorted = responses_clean.sort_values(by=q)
     else:
         # no order given, sort by descending values
@@ -139,6 +189,8 @@ def prepare_df_comparison(
     """
     assert "id" not in responses_df_all.columns
     responses_joined = responses_df_all.join(responses_df_comparison)
+    responses_joined[q] = _observed(responses_joined[q])
+    responses_joined[q_comparison] = _observed(responses_joined[q_comparison])
 
     grouped_by_center = responses_joined.groupby(q_comparison, observed=False)[q]
     responses_df_counts = pd.concat(
@@ -152,13 +204,11 @@ def prepare_df_comparison(
     # sort DF
     order_left = ordering.get(q)
     if order_left:
-        responses_df_counts[q] = pd.Categorical(
-            responses_df_counts[q], categories=order_left, ordered=True
-        )
+        responses_df_counts[q] = _ordered(responses_df_counts[q], order_left)
     order_right = ordering.get(q_comparison)
     if order_right:
-        responses_df_counts[q_comparison] = pd.Categorical(
-            responses_df_counts[q_comparison], categories=order_right, ordered=True
+        responses_df_counts[q_comparison] = _ordered(
+            responses_df_counts[q_comparison], order_right
         )
     responses_df_counts_sorted = responses_df_counts.sort_values(by=[q_comparison, q])
 
@@ -166,7 +216,7 @@ def prepare_df_comparison(
 
 
 def prepare_df_comparison_multiple(
-    responses_df: pd.DataFrame,
+    responses_df: pd.DataFrame | MultipleChoiceBits,
     comparison_series: "pd.Series[str]",
     q: str,
     q_comparison: str,
@@ -184,7 +234,8 @@ def prepare_df_comparison_multiple(
         - proportion: share of participants (relative to "total") that gave this answ.
 
     Args:
-        responses_df: The main DataFrame of answers
+        responses_df: The main DataFrame of answers, or the packed answers from
+            `LimeSurveyData.get_multiple_choice`
         comparison_series: Participant group (shares index with the main DF)
         q: name of the output column for answer options
         q_comparison: name of the output column for groups
@@ -193,19 +244,14 @@ def prepare_df_comparison_multiple(
     Returns:
         Tuple of [DataFrame, group size dict]. The latter is used as N in plots.
     """
-    # boolean value: participants who answered anything (summed up per group later)
-    responses_df["total"] = responses_df.sum(axis="columns").gt(0)
-    # melt into long form, merge with comparison
-    responses_melt = pd.melt(
-        responses_df.reset_index(),
-        id_vars=["id", "total"],
-        var_name=q,
-        value_name="count",
-    ).join(comparison_series, on="id")
+    if not isinstance(responses_df, MultipleChoiceBits):
+        responses_df = MultipleChoiceBits.from_responses(responses_df)
 
     # for each subquestion, count `True` values, and normalize per group
     responses_counts = (
-        responses_melt.groupby([q_comparison, q]).sum().drop(columns=["id"])
+        responses_df.group_counts(comparison_series)
+        .rename_axis([q_comparison, q])
+        .sort_index()
     )
     responses_counts["proportion"] = (
         responses_counts["count"] / responses_counts["total"]
@@ -215,18 +261,18 @@ def prepare_df_comparison_multiple(
     responses_clean = responses_counts.reset_index()
 
     # get the number of participants per group in q_comparison
-    participants = responses_clean.set_index(q_comparison)["total"].drop_duplicates()
+    participants = responses_clean.drop_duplicates(q_comparison).set_index(
+        q_comparison
+    )["total"]
 
     # ordering (copied from `prepare_df_comparison` above)
     order_left = ordering.get(q)
     if order_left:
-        responses_clean[q] = pd.Categorical(
-            responses_clean[q], categories=order_left, ordered=True
-        )
+        responses_clean[q] = _ordered(responses_clean[q], order_left)
     order_right = ordering.get(q_comparison)
     if order_right:
-        responses_clean[q_comparison] = pd.Categorical(
-            responses_clean[q_comparison], categories=order_right, ordered=True
+        responses_clean[q_comparison] = _ordered(
+            responses_clean[q_comparison], order_right
         )
     responses_sort = responses_clean.sort_values(by=[q_comparison, q])
     # print(responses_sort)
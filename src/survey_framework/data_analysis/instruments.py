@@ -0,0 +1,639 @@
+"""Registry of the validated instruments (questionnaires) used in the survey.
+
+An `Instrument` declares how the answers to the subquestions of one question are
+scored: the score table of every item, how item scores are combined into a total
+(see `Scaling`), how many items must be answered, and the class boundaries of the
+total. Adding the scales of a new survey wave is a matter of registering more
+instruments with `register_instrument`, e.g. created from a TOML or JSON file
+with `Instrument.from_config`.
+
+`CompiledInstruments` compiles the score tables of any number of instruments into
+one lookup table, so all of them are scored in one batch over the response
+matrix, see `compile_instruments`.
+"""
+
+import functools
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from enum import StrEnum
+from types import MappingProxyType
+from typing import Any, Self
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "CompiledInstruments",
+    "Instrument",
+    "Scaling",
+    "compile_instruments",
+    "get_instrument",
+    "register_instrument",
+    "registered_instruments",
+]
+
+
+class Scaling(StrEnum):
+    """How item scores are combined into the total score of an instrument."""
+
+    # sum of all items, missing if any item is missing
+    SUM = "sum"
+    # sum of the answered items, scaled up to all items
+    # e.g. scale by 8/5 if 5/8 items answered
+    SCALED_SUM = "scaled_sum"
+    # mean of the answered items
+    MEAN = "mean"
+
+
+@dataclass(frozen=True, slots=True)
+class Instrument:
+    """Declaration of how to score a validated instrument.
+
+    Attributes:
+        name: name of the instrument, also prefix of its output columns
+        question: code of the question whose subquestions are the items, e.g. "D1"
+        items: key in `score_tables` of every item, in subquestion order. A single
+            key is used for any number of items.
+        score_tables: score of every answer code, by key. Answer codes without
+            score (e.g. "I don't want to answer") are treated as missing.
+        weight: factor applied to all scores of the tables
+        scaling: how the item scores are combined into a total
+        min_answered: totals of participants with fewer answered items (per
+            scale) are missing
+        boundaries: bins to classify the total into `classes`
+        classes: class labels
+        scales: scale of every item, for instruments with one total per scale
+            (named after the scale), or empty for a single total
+        decimals: number of decimals to round the totals to, or None
+    """
+
+    name: str
+    question: str
+    items: tuple[str, ...]
+    score_tables: Mapping[str, Mapping[str, float]]
+    weight: float = 1
+    scaling: Scaling = Scaling.SCALED_SUM
+    min_answered: float = 0
+    boundaries: tuple[float, ...] = ()
+    classes: tuple[str, ...] = ()
+    scales: tuple[str, ...] = ()
+    decimals: int | None = None
+
+    def __post_init__(self) -> None:
+        """Check the declaration and make the score tables read-only.
+
+        Raises:
+            ValueError: The declaration is inconsistent
+        """
+        if not self.items:
+            raise ValueError(f"Instrument {self.name} has no items")
+        missing = set(self.items) - set(self.score_tables)
+        if missing:
+            raise ValueError(f"Instrument {self.name} has no score tables {missing}")
+        if self.scales and len(self.scales) != len(self.items):
+            raise ValueError(f"Instrument {self.name} needs a scale for every item")
+        if self.scales and self.boundaries:
+            raise ValueError(f"Instrument {self.name} can't classify several scales")
+
+        object.__setattr__(
+            self,
+            "score_tables",
+            MappingProxyType(
+                {
+                    key: MappingProxyType(dict(table))
+                    for key, table in self.score_tables.items()
+                }
+            ),
+        )
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> Self:
+        """Create an instrument from plain data, e.g. a table of a TOML file.
+
+        Args:
+            config: attributes of the instrument, lists are accepted for tuples
+                and the value of a `Scaling` for `scaling`
+
+        Raises:
+            ValueError: Unknown attributes or inconsistent declaration
+            KeyError: Missing required attributes
+
+        Returns:
+            The instrument, not registered yet
+        """
+        unknown = set(config) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown instrument attributes {sorted(unknown)}")
+
+        settings = dict(config)
+        for name in ("items", "boundaries", "classes", "scales"):
+            if name in settings:
+                settings[name] = tuple(settings[name])
+        if "scaling" in settings:
+            settings["scaling"] = Scaling(settings["scaling"])
+        return cls(**settings)
+
+    def item_keys(self, num_items: int) -> tuple[str, ...]:
+        """Get the score table key of every item.
+
+        Args:
+            num_items: number of answered subquestions
+
+        Raises:
+            ValueError: The number of items does not match
+
+        Returns:
+            Key in `score_tables` of every item
+        """
+        if len(self.items) == 1:
+            return self.items * num_items
+        if num_items != len(self.items):
+            raise ValueError(
+                f"expected {len(self.items)} items of {self.question}, got {num_items}"
+            )
+        return self.items
+
+    def select_items(self, responses: pd.DataFrame) -> pd.DataFrame:
+        """Get the answers to the items from all responses.
+
+        Args:
+            responses: response columns, named like "D1_SQ001"
+
+        Returns:
+            The columns of the subquestions of `question`
+        """
+        columns = [
+            column
+            for column in responses.columns
+            if str(column).split("_")[0] == self.question
+        ]
+        return responses[columns]
+
+
+class CompiledInstruments:
+    """Instruments compiled into one lookup table, to score them in one batch.
+
+    The score tables are stacked into one array, with a row of scores per table
+    and a column per answer code. Answers are turned into positions in this
+    array via their categorical codes (once per set of categories), so the whole
+    response matrix is scored by one indexing operation. The totals of every
+    instrument are then reduced from its block of item scores.
+
+    Attributes:
+        instruments: the compiled instruments, by name
+    """
+
+    def __init__(self, instruments: Iterable[Instrument]) -> None:
+        """Compile the score tables of instruments.
+
+        Args:
+            instruments: instruments with unique names
+        """
+        self.instruments = MappingProxyType(
+            {instrument.name: instrument for instrument in instruments}
+        )
+
+        tables: list[Mapping[str, float]] = []
+        weights: list[float] = []
+        # row of every score table in the array, by instrument and key
+        self._rows: dict[str, dict[str, int]] = {}
+        for instrument in self.instruments.values():
+            rows = self._rows[instrument.name] = {}
+            for key, table in instrument.score_tables.items():
+                rows[key] = len(tables)
+                tables.append(table)
+                weights.append(instrument.weight)
+
+        self._codes = pd.Index(
+            list(dict.fromkeys(code for table in tables for code in table))
+        )
+        # the last entry of every row (NaN) is for all answers without score
+        self._width = len(self._codes) + 1
+        self._table = np.full((len(tables), self._width), np.nan)
+        for row, table, weight in zip(self._table, tables, weights, strict=True):
+            row[self._codes.get_indexer(pd.Index(list(table)))] = [
+                score * weight for score in table.values()
+            ]
+
+    def score(
+        self, responses: pd.DataFrame, keep_subscores: bool = False
+    ) -> pd.DataFrame:
+        """Score all instruments in one batch.
+
+        Args:
+            responses: responses containing the subquestions of all instruments,
+                e.g. `LimeSurveyData.responses`
+            keep_subscores: Whether to include scores of the items
+
+        Raises:
+            ValueError: The number of items of an instrument does not match
+
+        Returns:
+            For every instrument, the item scores ("<column>_score", optional),
+            the totals ("<name>_score" or one column per scale) and classes
+            ("<name>_class", if the instrument has boundaries)
+        """
+        return self._evaluate(
+            [
+                (instrument, instrument.select_items(responses))
+                for instrument in self.instruments.values()
+            ],
+            responses.index,
+            keep_subscores,
+        )
+
+    def score_items(
+        self, name: str, answers: pd.DataFrame, keep_subscores: bool = False
+    ) -> pd.DataFrame:
+        """Score one instrument, given the answers to its items.
+
+        Args:
+            name: name of the instrument
+            answers: one column per item, in order of the items
+            keep_subscores: Whether to include scores of the items
+
+        Raises:
+            KeyError: There is no such instrument
+            ValueError: The number of items does not match
+
+        Returns:
+            Item scores ("<column>_score", optional), totals ("<name>_score" or one
+            column per scale) and classes ("<name>_class", if the instrument has
+            boundaries)
+        """
+        return self._evaluate(
+            [(self.instruments[name], answers)], answers.index, keep_subscores
+        )
+
+    def _evaluate(
+        self,
+        items: Sequence[tuple[Instrument, pd.DataFrame]],
+        index: pd.Index,
+        keep_subscores: bool,
+    ) -> pd.DataFrame:
+        """Score the answers to the items of instruments.
+
+        Args:
+            items: instruments with the answers to their items
+            index: participants of all answers
+            keep_subscores: Whether to include scores of the items
+
+        Returns:
+            Scores of all instruments, see `score`
+        """
+        keys = [instrument.item_keys(answers.shape[1]) for instrument, answers in items]
+
+        # positions in the flattened table, one row per item
+        num_items = sum(answers.shape[1] for _, answers in items)
+        positions = np.empty((num_items, len(index)), dtype=np.intp)
+        # positions of the categories in a row, once per set of categories
+        recoded: dict[int, np.ndarray] = {}
+        i = 0
+        for (instrument, answers), item_keys in zip(items, keys, strict=True):
+            rows = self._rows[instrument.name]
+            for key, (_, column) in zip(item_keys, answers.items(), strict=True):
+                offset = rows[key] * self._width
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    categories = column.cat.categories
+                    lookup = recoded.get(id(categories))
+                    if lookup is None:
+                        # missing answers have code -1, i.e. the appended position
+                        lookup = np.append(self._codes.get_indexer(categories), -1)
+                        lookup[lookup < 0] = self._width - 1
+                        recoded[id(categories)] = lookup
+                    positions[i] = (lookup + offset)[column.cat.codes.to_numpy()]
+                else:
+                    found = self._codes.get_indexer(column)
+                    found[found < 0] = self._width - 1
+                    positions[i] = found + offset
+                i += 1
+
+        # one row per participant, so that row sums add up like DataFrame.sum
+        scores = np.ascontiguousarray(self._table.ravel().take(positions).T)
+        # like np.nansum, but only once for all instruments
+        answered = ~np.isnan(scores)
+        filled = np.where(answered, scores, 0)
+
+        frames = []
+        start = 0
+        for instrument, answers in items:
+            stop = start + answers.shape[1]
+            span = slice(start, stop)
+            frames.append(
+                _totals(
+                    instrument,
+                    (scores[:, span], filled[:, span], answered[:, span]),
+                    answers,
+                    keep_subscores,
+                )
+            )
+            start = stop
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, axis="columns")
+
+
+# item scores, the same with 0 for missing scores, and whether items are answered
+ItemScores = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _combine(
+    item_scores: ItemScores, scaling: Scaling, min_answered: float
+) -> np.ndarray:
+    """Combine item scores into totals.
+
+    Args:
+        item_scores: item scores, one row per participant
+        scaling: how to combine the scores
+        min_answered: minimum number of answered items
+
+    Returns:
+        Total of every participant, NaN if too few items are answered
+    """
+    scores, filled, answered = item_scores
+    if scaling == Scaling.SUM:
+        total = scores.sum(axis=1)
+    else:
+        responses_counts = np.count_nonzero(answered, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total = filled.sum(axis=1) / responses_counts
+            if scaling == Scaling.SCALED_SUM:
+                total *= scores.shape[1]
+        total[responses_counts < min_answered] = np.nan
+    return total
+
+
+def _totals(
+    instrument: Instrument,
+    item_scores: ItemScores,
+    answers: pd.DataFrame,
+    keep_subscores: bool,
+) -> pd.DataFrame:
+    """Compute the totals and classes of an instrument.
+
+    Args:
+        instrument: the instrument
+        item_scores: item scores, one row per participant
+        answers: answers the scores were looked up from
+        keep_subscores: Whether to include the item scores
+
+    Returns:
+        Output columns of the instrument, see `CompiledInstruments.score`
+    """
+    if keep_subscores:
+        df = pd.DataFrame(
+            item_scores[0],
+            index=answers.index,
+            columns=[f"{column}_score" for column in answers.columns],
+        )
+    else:
+        df = pd.DataFrame(index=answers.index)
+
+    if instrument.scales:
+        item_scales = np.array(instrument.scales)
+        scores, filled, answered = item_scores
+        totals = {}
+        for scale in dict.fromkeys(instrument.scales):
+            items = item_scales == scale
+            totals[scale] = _combine(
+                (scores[:, items], filled[:, items], answered[:, items]),
+                instrument.scaling,
+                instrument.min_answered,
+            )
+    else:
+        totals = {
+            f"{instrument.name}_score": _combine(
+                item_scores, instrument.scaling, instrument.min_answered
+            )
+        }
+    for column, total in totals.items():
+        if instrument.decimals is not None:
+            total = total.round(instrument.decimals)
+        df[column] = total
+
+    if instrument.boundaries:
+        df[f"{instrument.name}_class"] = pd.cut(
+            df[f"{instrument.name}_score"],
+            bins=instrument.boundaries,
+            include_lowest=True,
+            labels=instrument.classes,
+        )
+    return df
+
+
+_REGISTRY: dict[str, Instrument] = {}
+
+
+def register_instrument(instrument: Instrument) -> Instrument:
+    """Add an instrument to the registry.
+
+    Args:
+        instrument: the instrument
+
+    Raises:
+        ValueError: There already is an instrument with this name
+
+    Returns:
+        The instrument
+    """
+    if instrument.name in _REGISTRY:
+        raise ValueError(f"Instrument {instrument.name} is already registered")
+    _REGISTRY[instrument.name] = instrument
+    return instrument
+
+
+def get_instrument(name: str) -> Instrument:
+    """Get a registered instrument.
+
+    Args:
+        name: name of the instrument
+
+    Raises:
+        KeyError: There is no such instrument
+
+    Returns:
+        The instrument
+    """
+    return _REGISTRY[name]
+
+
+def registered_instruments() -> tuple[str, ...]:
+    """Get the names of all registered instruments, in order of registration."""
+    return tuple(_REGISTRY)
+
+
+def compile_instruments(names: Iterable[str] | None = None) -> CompiledInstruments:
+    """Compile registered instruments, to score them in one batch.
+
+    Compiled instruments are cached, since registered instruments can't change.
+
+    Args:
+        names: names of the instruments, or None for all registered instruments
+
+    Raises:
+        KeyError: There is no such instrument
+
+    Returns:
+        The compiled instruments
+    """
+    return _compile(tuple(_REGISTRY if names is None else names))
+
+
+@functools.cache
+def _compile(names: tuple[str, ...]) -> CompiledInstruments:
+    """Compile registered instruments, see `compile_instruments`."""
+    return CompiledInstruments(get_instrument(name) for name in names)
+
+
+# scores of the STAI answers, by direction of the item
+_STAI = {
+    "pos": {
+        "A1": 4,  # "Not at all
+        "A2": 3,  # "Somewhat"
+        "A3": 2,  # "Moderately
+        "A4": 1,  # "Very much"
+    },
+    "neg": {
+        "A1": 1,  # "Not at all"
+        "A2": 2,  # "Somewhat"
+        "A3": 3,  # "Moderately"
+        "A4": 4,  # "Very much"
+    },
+}
+_ANXIETY_CLASSES = ("no or low anxiety", "moderate anxiety", "high anxiety")
+
+# the scaled totals need at least half of the items answered
+# TODO: we might want to be more strict here
+register_instrument(
+    # six-item short-form of the state scale (STAI-6)
+    Instrument(
+        name="state_anxiety",
+        question="D1",
+        items=("pos", "neg", "neg", "pos", "pos", "neg"),
+        score_tables=_STAI,
+        weight=10 / 3,
+        min_answered=3,
+        boundaries=(20, 40, 60, 80),
+        classes=_ANXIETY_CLASSES,
+    )
+)
+register_instrument(
+    # eight items of the trait scale
+    Instrument(
+        name="trait_anxiety",
+        question="D2",
+        items=("pos", "neg", "neg", "pos", "neg", "neg", "pos", "neg"),
+        score_tables=_STAI,
+        weight=5 / 2,
+        min_answered=4,
+        boundaries=(20, 40, 60, 80),
+        classes=_ANXIETY_CLASSES,
+    )
+)
+register_instrument(
+    # Patient Health Questionnaire depression scale (PHQ-8)
+    Instrument(
+        name="depression",
+        question="D3",
+        items=("freq",) * 8,
+        score_tables={
+            "freq": {
+                "A1": 0,  # "Not at all"
+                "A2": 1,  # "Several days"
+                "A3": 2,  # "More than half the days"
+                "A4": 3,  # "Nearly every day"
+            }
+        },
+        min_answered=4,
+        boundaries=(0, 4, 9, 14, 19, 24),
+        classes=(
+            "no to minimal depression",
+            "mild depression",
+            "moderate depression",
+            "moderately severe depression",
+            "severe depression",
+        ),
+    )
+)
+register_instrument(
+    # Patient Health Questionnaire somatic symptom scale (PHQ-15), the survey
+    # asks 14 of the items, scaled up to the range of the PHQ-15
+    Instrument(
+        name="somatic",
+        question="D4",
+        items=("bother",),
+        score_tables={
+            "bother": {
+                "A2": 0,  # "Not bothered
+                "A3": 1,  # "Bothered a little"
+                "A4": 2,  # "Bothered a lot
+            }
+        },
+        weight=15 / 14,
+        min_answered=7,
+        boundaries=(0, 4, 9, 14, 30),
+        classes=(
+            "No somatic symptoms",
+            "Mild somatic symptoms",
+            "Moderate somatic symptoms",
+            "Severe somatic symptoms",
+        ),
+    )
+)
+register_instrument(
+    # Maslach Burnout Inventory - General Survey (MBI-GS), sums of its three scales
+    Instrument(
+        name="burnout",
+        question="D3d",
+        items=("freq",) * 16,
+        score_tables={
+            "freq": {
+                "A2": 0,  # "Never"
+                "A3": 1,  # "A few times a year or less"
+                "A4": 2,  # "Once a month or less"
+                "A5": 3,  # "A few times a month"
+                "A6": 4,  # "Once a week"
+                "A7": 5,  # "A few times a week"
+                "A8": 6,  # "Every day"
+            }
+        },
+        scaling=Scaling.SUM,
+        scales=(
+            "Exhaustion",  # I feel emotionally drained from my work.
+            "Exhaustion",  # I feel used up at the end of the workday.
+            "Exhaustion",  # I feel tired when I get up in the morning and have to ...
+            "Exhaustion",  # Working all day is really a strain for me.
+            "Professional Efficacy",  # I can effectively solve the problems that ...
+            "Exhaustion",  # I feel burned out from my work.
+            "Professional Efficacy",  # I feel I am making an effective ...
+            "Cynicism",  # I have become less interested in my work since I ...
+            "Cynicism",  # I have become less enthusiastic about my work.
+            "Professional Efficacy",  # In my opinion, I am good at my job.
+            "Professional Efficacy",  # I feel exhilarated when I accomplish ...
+            "Professional Efficacy",  # I have accomplished many worthwhile ...
+            "Cynicism",  # I just want to do my job and not be bothered.
+            "Cynicism",  # I have become more cynical about whether my work ...
+            "Cynicism",  # I doubt the significance of my work.
+            "Professional Efficacy",  # At my work, I feel confident that I am ...
+        ),
+    )
+)
+register_instrument(
+    # satisfaction with aspects of the job, rounded mean rating
+    Instrument(
+        name="satisfaction",
+        question="C1",
+        items=("rating",),
+        score_tables={
+            "rating": {
+                "A1": 5.0,  # "Very satisfied"
+                "A2": 4.0,  # "Satisfied"
+                "A3": 3.0,  # "Neither/nor"
+                "A4": 2.0,  # "Dissatisfied"
+                "A5": 1.0,  # "Very dissatisfied"
+            }
+        },
+        scaling=Scaling.MEAN,
+        decimals=0,
+    )
+)
@@ -3,8 +3,11 @@
 from enum import StrEnum
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from .instruments import compile_instruments, get_instrument
+
 
 class Condition(StrEnum):
     """Enumeration of mental health conditions, to be used with rate_mental_health."""
@@ -14,6 +17,14 @@ class Condition(StrEnum):
     DEPRESSION = "D3"
 
 
+# registered instruments of the conditions, see `instruments`
+_CONDITION_INSTRUMENTS = {
+    Condition.STATE_ANXIETY: "state_anxiety",
+    Condition.TRAIT_ANXIETY: "trait_anxiety",
+    Condition.DEPRESSION: "depression",
+}
+
+
 def rate_mental_health(
     responses: pd.DataFrame,
     condition: Condition,
@@ -39,111 +50,13 @@ def rate_mental_health(
     Returns:
         Mental health condition ratings ("score") and classifications ("class").
     """
-    # Set up condition-specific parameters
-    match condition:
-        case Condition.STATE_ANXIETY:
-            num_subquestions = 6
-            base_score = 10 / 3
-            conversion = ["pos", "neg", "neg", "pos", "pos", "neg"]
-            label = "state_anxiety"
-            classification_boundaries = [20, 40, 60, 80]
-            classes = ["no or low anxiety", "moderate anxiety", "high anxiety"]
-
-        case Condition.TRAIT_ANXIETY:
-            num_subquestions = 8
-            base_score = 5 / 2
-            conversion = [
-                "pos",
-                "neg",
-                "neg",
-                "pos",
-                "neg",
-                "neg",
-                "pos",
-                "neg",
-            ]
-            label = "trait_anxiety"
-            classification_boundaries = [20, 40, 60, 80]
-            classes = ["no or low anxiety", "moderate anxiety", "high anxiety"]
-
-        case Condition.DEPRESSION:
-            num_subquestions = 8
-            base_score = 1
-            conversion = ["freq" for _ in range(8)]
-            label = "depression"
-            classification_boundaries = [0, 4, 9, 14, 19, 24]
-            classes = [
-                "no to minimal depression",
-                "mild depression",
-                "moderate depression",
-                "moderately severe depression",
-                "severe depression",
-            ]
-
-        case _:
-            raise AssertionError("unreachable")
-
     # sanity check
     q_code = responses.columns[0].split("_")[0]
     if q_code != condition:
         raise ValueError(f"expected question {condition}, got {q_code}")
 
-    # Set up score conversion dicts
-    pos_direction_scores = {
-        "A1": 4 * base_score,  # "Not at all
-        "A2": 3 * base_score,  # "Somewhat"
-        "A3": 2 * base_score,  # "Moderately
-        "A4": 1 * base_score,  # "Very much"
-    }
-    neg_direction_scores = {
-        "A1": 1 * base_score,  # "Not at all"
-        "A2": 2 * base_score,  # "Somewhat"
-        "A3": 3 * base_score,  # "Moderately"
-        "A4": 4 * base_score,  # "Very much"
-    }
-    frequency_scores = {
-        "A1": 0 * base_score,  # "Not at all"
-        "A2": 1 * base_score,  # "Several days"
-        "A3": 2 * base_score,  # "More than half the days"
-        "A4": 3 * base_score,  # "Nearly every day"
-    }
-    conversion_dicts = {
-        "pos": pos_direction_scores,
-        "neg": neg_direction_scores,
-        "freq": frequency_scores,
-    }
-
-    # Map responses from code to score
-    df = pd.DataFrame()
-    for column, conv in zip(responses.columns, conversion, strict=True):
-        df[f"{column}_score"] = responses[column].map(
-            conversion_dicts[conv], na_action="ignore"
-        )
-
-    # Calculate total anxiety or depression scores
-    # scaled by number of non-NaN responses
-    # e.g. scale by 8/5 if 5/8 subquestions answered
-    responses_counts = df.notna().sum(axis=1)
-    df[f"{label}_score"] = (
-        df.sum(axis=1, skipna=True).div(responses_counts).mul(num_subquestions)
-    )
-
-    # Suppress entries with less than half of all subquestions answered
-    # TODO: we might want to be more strict here
-    df.loc[responses_counts < num_subquestions / 2, f"{label}_score"] = None
-
-    # Classify into categories
-    df[f"{label}_class"] = pd.cut(
-        df[f"{label}_score"],
-        bins=classification_boundaries,
-        include_lowest=True,
-        labels=classes,
-    )
-
-    if not keep_subscores:
-        df = df.drop(df.columns[:-2], axis=1)
-
-    return df
+    name = _CONDITION_INSTRUMENTS[condition]
+    return compile_instruments([name]).score_items(name, responses, keep_subscores)
 
 
 def rate_somatic(
@@ -166,59 +79,16 @@ def rate_somatic(
         PHQ15 classifications in two columns ("D4_class" and "D4_score").
     """
     PHQ15 = "D4"
-    label = "somatic"
 
     # sanity check
     q_code = responses.columns[0].split("_")[0]
     if q_code != PHQ15:
         raise ValueError(f"expected question {PHQ15}, got {q_code}")
 
-    num_subquestions = 14
-    base_score = 15 / 14
-    classification_boundaries = [0, 4, 9, 14, 30]
-    classes = [
-        "No somatic symptoms",
-        "Mild somatic symptoms",
-        "Moderate somatic symptoms",
-        "Severe somatic symptoms",
-    ]
-
-    # Set up score conversion dicts
-    scores = {
-        "A2": 0 * base_score,  # "Not bothered
-        "A3": 1 * base_score,  # "Bothered a little"
-        "A4": 2 * base_score,  # "Bothered a lot
-    }
-
-    # Map responses from code to score
-    df = pd.DataFrame()
-    for column in responses.columns:
-        df[f"{column}_score"] = responses[column].map(scores, na_action="ignore")
-
-    # Calculate total scores scaled by number of non-NaN responses
-    # e.g. scale by 8/5 if 5/8 subquestions answered
-    responses_counts = df.notna().sum(axis=1)
-    df[f"{label}_score"] = (
-        df.sum(axis=1, skipna=True).div(responses_counts).mul(num_subquestions)
-    )
-
-    # Suppress entries with less than half of all subquestions answered
-    # TODO: we might want to be more strict here
-    df.loc[responses_counts < num_subquestions / 2, f"{label}_score"] = None
-
-    # Classify into categories
-    df[f"{label}_class"] = pd.cut(
-        df[f"{label}_score"],
-        bins=classification_boundaries,
-        include_lowest=True,
-        labels=classes,
+    return compile_instruments(["somatic"]).score_items(
+        "somatic", responses, keep_subscores
     )
 
-    if not keep_subscores:
-        df = df.drop(df.columns[:-2], axis=1)
-
-    return df
-
 
 class Scale(StrEnum):
     """The three burnout scales defined by the MBI."""
@@ -238,6 +108,57 @@ class Profile(StrEnum):
     BURNOUT = "Burnout"
 
 
+def _flag(flags: np.ndarray, scores: "pd.Series[float]") -> "pd.Series[Any]":
+    """Turn a boolean classification into a column, missing where scores are.
+
+    Args:
+        flags: classification of every participant
+        scores: scores the classification was made from
+
+    Returns:
+        Boolean column, or object column with NaN for missing scores
+    """
+    column = pd.Series(flags, index=scores.index)
+    missing = scores.isna()
+    if missing.any():
+        # like Series.map: all missing gives a float column, some an object column
+        column = column.astype(object).mask(missing).infer_objects()
+    return column
+
+
+def _classify_burnout(df: pd.DataFrame) -> None:
+    """Add the critical flags of the scales and the burnout profile.
+
+    Args:
+        df: scores with a column for each `Scale`, modified in place
+    """
+    # boolean classification according to Table 3 in the manual
+    # for PE, critical == good, hence the ">" instead of ">="
+    exhausted = df[Scale.EX].div(5).to_numpy(dtype=float) >= 2.90
+    cynical = df[Scale.CY].div(5).to_numpy(dtype=float) >= 2.86
+    effective = df[Scale.PE].div(6).to_numpy(dtype=float) > 4.30
+    df["EX_critical"] = _flag(exhausted, df[Scale.EX])
+    df["CY_critical"] = _flag(cynical, df[Scale.CY])
+    df["PE_critical"] = _flag(effective, df[Scale.PE])
+
+    # assign burnout profiles according to Table 1 in the manual
+    decision_table = {
+        Profile.ENGAGED: ~exhausted & ~cynical & effective,
+        Profile.INEFFECTIVE: ~exhausted & ~cynical & ~effective,
+        Profile.OVEREXTENDED: exhausted & ~cynical,
+        Profile.DISENGAGED: ~exhausted & cynical,
+        Profile.BURNOUT: exhausted & cynical,
+    }
+    profiles = np.array(list(decision_table), dtype=object)
+    selected = np.select(list(decision_table.values()), range(len(profiles)))
+    # only participants with all three scores get a profile
+    complete = df[list(Scale)].notna().all(axis="columns").to_numpy()
+    df["Profile"] = pd.Series(profiles[selected], index=df.index).where(complete)
+    if not complete.any():
+        # like the row-wise classification, no profiles give a float column
+        df["Profile"] = df["Profile"].astype(float)
+
+
 def rate_burnout(responses: pd.DataFrame) -> pd.DataFrame:
     """Calculate burnout scores from participants' answers.
 
@@ -248,82 +169,56 @@ def rate_burnout(responses: pd.DataFrame) -> pd.DataFrame:
         responses: responses to question D3d (burnout)
 
     Returns:
-        SUM scores for each `Scale` (3 ints) and a burnout `Profile` (1 string)
+        One row per participant, in the order of `responses`: the participant
+        "id", SUM scores for each `Scale` and a burnout `Profile` (1 string)
     """
-    SCORE_MAP = {
-        "A2": 0,  # "Never"
-        "A3": 1,  # "A few times a year or less"
-        "A4": 2,  # "Once a month or less"
-        "A5": 3,  # "A few times a month"
-        "A6": 4,  # "Once a week"
-        "A7": 5,  # "A few times a week"
-        "A8": 6,  # "Every day"
-    }
+    MBI_GS = "D3d"
+
+    # sanity check
+    q_code = responses.columns[0].split("_")[0]
+    if q_code != MBI_GS:
+        raise ValueError(f"expected question {MBI_GS}, got {q_code}")
 
-    scales = [
-        Scale.EX,  # I feel emotionally drained from my work.
-        Scale.EX,  # I feel used up at the end of the workday.
-        Scale.EX,  # I feel tired when I get up in the morning and have to ...
-        Scale.EX,  # Working all day is really a strain for me.
-        Scale.PE,  # I can effectively solve the problems that arise in my work.
-        Scale.EX,  # I feel burned out from my work.
-        Scale.PE,  # I feel I am making an effective contribution to what ...
-        Scale.CY,  # I have become less interested in my work since I ...
-        Scale.CY,  # I have become less enthusiastic about my work.
-        Scale.PE,  # In my opinion, I am good at my job.
-        Scale.PE,  # I feel exhilarated when I accomplish something at work.
-        Scale.PE,  # I have accomplished many worthwhile things in this job.
-        Scale.CY,  # I just want to do my job and not be bothered.
-        Scale.CY,  # I have become more cynical about whether my work ...
-        Scale.CY,  # I doubt the significance of my work.
-        Scale.PE,  # At my work, I feel confident that I am effective at ...
-    ]
-
-    # make empty df with three columns
+    # sums of the scales, missing if any item is missing
+    totals = compile_instruments(["burnout"]).score_items("burnout", responses)
+
+    # one row per participant, in the order of `responses`, with an ID column
     df = pd.DataFrame(responses.index)
-    df[Scale.EX], df[Scale.CY], df[Scale.PE] = 0, 0, 0
+    for scale in Scale:
+        df[scale] = totals[scale].to_numpy()
 
-    for col, scale in zip(responses.columns, scales, strict=True):
-        # sum up the score in the relevant category
-        col_scores = responses[col].map(SCORE_MAP, na_action="ignore")
-        df[scale] += col_scores
+    _classify_burnout(df)
+    return df
 
-    # boolean classification according to Table 3 in the manual
-    # for PE, critical == good, hence the ">" instead of ">="
-    df["EX_critical"] = df[Scale.EX].div(5).map(lambda x: x >= 2.90, na_action="ignore")
-    df["CY_critical"] = df[Scale.CY].div(5).map(lambda x: x >= 2.86, na_action="ignore")
-    df["PE_critical"] = df[Scale.PE].div(6).map(lambda x: x > 4.30, na_action="ignore")
-
-    def classify(row: "pd.Series[Any]") -> Profile:
-        """Assign burnout profiles according to Table 1 in the manual.
-
-        Args:
-            row: a single participant
-
-        Returns:
-            burnout `Profile` of the participant
-        """
-        exhausted = row["EX_critical"]
-        cynical = row["CY_critical"]
-        effective = row["PE_critical"]
-        assert isinstance(exhausted, bool)
-        assert isinstance(cynical, bool)
-        assert isinstance(effective, bool)
-
-        if not exhausted and not cynical and effective:
-            return Profile.ENGAGED
-        elif not exhausted and not cynical and not effective:
-            return Profile.INEFFECTIVE
-        elif exhausted and not cynical:
-            return Profile.OVEREXTENDED
-        elif not exhausted and cynical:
-            return Profile.DISENGAGED
-        elif exhausted and cynical:
-            return Profile.BURNOUT
-        else:
-            raise AssertionError("unreachable")
-
-    df["Profile"] = df.dropna().apply(classify, axis=1, result_type="reduce")
+
+# instruments scored by `rate_health`
+HEALTH_INSTRUMENTS = (
+    "state_anxiety",
+    "trait_anxiety",
+    "depression",
+    "somatic",
+    "burnout",
+)
+
+
+def rate_health(responses: pd.DataFrame) -> pd.DataFrame:
+    """Calculate all (mental) health scores and classes in one batch.
+
+    This scores the `HEALTH_INSTRUMENTS` like `rate_mental_health`,
+    `rate_somatic` and `rate_burnout`, but all at once, see
+    `LimeSurveyData.health_scores` for a cached table of a survey.
+
+    Args:
+        responses: responses to questions D1, D2, D3, D4 and D3d
+
+    Returns:
+        One row per participant, like `responses`: total scores and classes of
+        every `Condition` and somatic symptoms ("<name>_score", "<name>_class"),
+        the burnout scores for each `Scale`, their critical flags and the burnout
+        `Profile`
+    """
+    df = compile_instruments(HEALTH_INSTRUMENTS).score(responses)
+    _classify_burnout(df)
     return df
 
 
@@ -350,27 +245,18 @@ def rate_satisfaction(
     if q_code not in SATISFACTION_QUESTIONS:
         raise ValueError(f"{q_code} is not a satisfaction-scale question")
 
-    # Set up score conversion dicts for individual questions
-    satisfaction_question_scores = {
-        "A1": 5.0,  # "Very satisfied"
-        "A2": 4.0,  # "Satisfied"
-        "A3": 3.0,  # "Neither/nor"
-        "A4": 2.0,  # "Dissatisfied"
-        "A5": 1.0,  # "Very dissatisfied"
-    }
-
-    # Map responses to score
-    df = pd.DataFrame()
-    for column in responses.columns:
-        df[f"{column}_score"] = responses[column].map(
-            satisfaction_question_scores, na_action="ignore"
-        )
+    # the rounded mean rating is computed by the instrument
+    df = compile_instruments(["satisfaction"]).score_items(
+        "satisfaction", responses, keep_subscores=True
+    )
 
-    # Calculate mean rating and round (ignoring NaN)
     if calc_average:
-        df[f"{q_code}_score"] = df.mean(axis=1, skipna=True).round()
+        scores = get_instrument("satisfaction").score_tables["rating"]
+        df = df.rename(columns={"satisfaction_score": f"{q_code}_score"})
         df[f"{q_code}_class"] = df[f"{q_code}_score"].map(
-            {v: k for k, v in satisfaction_question_scores.items()}
+            {v: k for k, v in scores.items()}
         )
+    else:
+        df = df.drop(columns="satisfaction_score")
 
     return df
@@ -0,0 +1,98 @@
+"""Shared, read-only answer options of survey questions.
+
+All subquestions of an array question, e.g. the 14 rows of D4, use the same
+answer options. `intern_choices` replaces their equal choice dicts by a single
+`ChoiceSet` object, which saves memory and is pickled only once when the
+questions table is cached or sent to worker processes. Every choice set gets an
+ID, so lookups derived from it (e.g. code to score arrays) can be cached once per
+choice set instead of once per column.
+"""
+
+from collections.abc import Iterable
+from typing import Any, NoReturn, Self, cast
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["ChoiceSet", "intern_choices"]
+
+
+class ChoiceSet(dict[str, str]):
+    """Read-only mapping of answer option codes to texts, in survey order.
+
+    It is a dict, so existing code that checks for dicts or reads choices keeps
+    working, but all methods that modify it raise a TypeError. Use `dict(...)`
+    to get a modifiable copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        """Refuse to modify the answer options.
+
+        Raises:
+            TypeError: always
+        """
+        raise TypeError("ChoiceSet is read-only, use dict(choices) for a copy.")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __reduce__(self) -> tuple[type[Self], tuple[dict[str, str]]]:
+        """Pickle as a plain dict, since items cannot be set after creation."""
+        return (type(self), (dict(self),))
+
+    def __repr__(self) -> str:
+        """Show the answer options like a dict."""
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+def intern_choices(
+    choices: Iterable[object],
+) -> tuple[list[object], pd.arrays.IntegerArray]:
+    """Replace equal choice dicts by one shared `ChoiceSet` each.
+
+    Choice dicts are equal if they contain the same items in the same order.
+
+    Args:
+        choices: choice dict of every column, or missing values like None/NaN
+
+    Returns:
+        Tuple of the interned choices (missing values are kept as they are) and
+        the choice set ID of every column, numbered in order of first
+        appearance (<NA> for columns without choices)
+    """
+    shared: dict[tuple[tuple[str, str], ...], int] = {}
+    choice_sets: list[ChoiceSet] = []
+    interned: list[object] = []
+    ids: list[int] = []
+    missing: list[bool] = []
+    for value in choices:
+        if not isinstance(value, dict):
+            interned.append(value)
+            ids.append(0)
+            missing.append(True)
+            continue
+
+        # answer codes and texts of the survey structure are strings
+        value = cast(dict[str, str], value)
+        key = tuple(value.items())
+        choice_set = shared.get(key)
+        if choice_set is None:
+            choice_set = shared[key] = len(choice_sets)
+            if not isinstance(value, ChoiceSet):
+                value = ChoiceSet(value)
+            choice_sets.append(value)
+        interned.append(choice_sets[choice_set])
+        ids.append(choice_set)
+        missing.append(False)
+
+    return interned, pd.arrays.IntegerArray(
+        np.array(ids, dtype=np.uint32), np.array(missing, dtype=bool)
+    )
@@ -1,16 +1,539 @@
 """Defines the central data type along with importing logic."""
 
-import re
+import bz2
+import contextlib
+import csv
+import gzip
+import io
+import lzma
+import os
 import warnings
-from collections.abc import Hashable, Iterable
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import StrEnum, auto
+from functools import partial
 from pathlib import Path
-from typing import cast
+from typing import Any, BinaryIO, Self, TextIO, cast
 
+import numpy as np
 import pandas as pd
 from pandas._typing import Dtype
+from pandas.core.arrays.masked import BaseMaskedArray
+
+from .choices import ChoiceSet, intern_choices
+from .lazy import LazyTable
+from .multiple_choice import MultipleChoiceBits
+from .schema import Schema
+from .shared import SharedTables, attach_tables
+from .snapshot import (
+    SnapshotWriter,
+    read_snapshot,
+    read_snapshot_columns,
+    write_snapshot,
+)
+from .structure_cache import (
+    read_cached_structure,
+    structure_digest,
+    write_cached_structure,
+)
+from .survey_structure import StructureParser, read_lime_questionnaire_structure
+
+# strings that `pd.read_csv` reads as missing values by default, see `na_values`
+_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+def _open_binary(path: str | os.PathLike[str]) -> BinaryIO:
+    """Open a (possibly compressed) CSV file for reading bytes.
+
+    Args:
+        path: Path to the file. Compression is inferred from the file extension.
+
+    Returns:
+        Binary file handle yielding the decompressed content
+    """
+    match Path(path).suffix:
+        case ".gz":
+            return cast(BinaryIO, gzip.open(path, "rb"))
+        case ".bz2":
+            return cast(BinaryIO, bz2.open(path, "rb"))
+        case ".xz":
+            return cast(BinaryIO, lzma.open(path, "rb"))
+        case _:
+            return open(path, "rb")
+
+
+def _open_text(path: str | os.PathLike[str]) -> TextIO:
+    """Open a (possibly compressed) CSV file for reading text.
+
+    Args:
+        path: Path to the file. Compression is inferred from the file extension.
+
+    Returns:
+        Text file handle, ready for the csv module and pandas alike
+    """
+    return io.TextIOWrapper(_open_binary(path), encoding="utf-8-sig", newline="")
+
+
+def _rename_column(column: str) -> str:
+    """Rename a CSV column to match the names in the survey structure.
+
+    E.g. "A8[SQ001]" becomes "A8_SQ001" and "A8[other]" becomes "A8other".
+
+    Args:
+        column: column name in the CSV file
+
+    Returns:
+        column name as used in `LimeSurveyData.questions`
+    """
+    return column.replace("[", "_").replace("]", "").replace("_other", "other")
+
+
+class CsvEngine(StrEnum):
+    """Backends for reading the responses CSV file."""
+
+    C = "c"
+    PYARROW = "pyarrow"
+
+
+def _read_csv_c(
+    fp: TextIO,
+    names: list[str],
+    dtype_dict: Mapping[Hashable, Dtype],
+    datetime_columns: Iterable[str],
+    usecols: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Read the body of the responses CSV file with the pandas C parser.
+
+    Args:
+        fp: text file handle, positioned after the header line
+        names: column names, starting with the index column
+        dtype_dict: pandas dtypes of the columns (by name in `names`)
+        datetime_columns: columns to parse as timestamps, not listed in dtype_dict
+        usecols: columns to read (besides the index), or None for all of them
+
+    Returns:
+        The responses, indexed by the first column
+    """
+    if usecols is not None:
+        selected = {names[0], *usecols}
+        usecols = [c for c in names if c in selected]
+        datetime_columns = [c for c in datetime_columns if c in selected]
+
+    return pd.read_csv(
+        fp,
+        header=None,
+        names=names,
+        index_col=names[0],
+        usecols=usecols,
+        dtype=dtype_dict,
+        parse_dates=list(datetime_columns),
+    )
+
+
+def _read_csv_pyarrow(
+    responses_file: Path,
+    names: list[str],
+    dtype_dict: Mapping[Hashable, Dtype],
+    datetime_columns: Iterable[str],
+    usecols: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Read the responses CSV file with the multithreaded pyarrow CSV reader.
+
+    The pandas dtypes from `LimeSurveyData._get_dtype_info` are translated into
+    Arrow types, so values are parsed directly into their final representation.
+    Columns without a dtype are inferred by pyarrow, like pandas would do.
+
+    Args:
+        responses_file: Path to the responses CSV file
+        names: column names, starting with the index column
+        dtype_dict: pandas dtypes of the columns (by name in `names`)
+        datetime_columns: columns to parse as timestamps, not listed in dtype_dict
+        usecols: columns to read (besides the index), or None for all of them
+
+    Returns:
+        The responses, indexed by the first column
+    """
+    # pyarrow is an optional dependency
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    # Arrow types for the dtypes used by `_get_dtype_info`, and back to pandas
+    arrow_types = {
+        pd.Int16Dtype(): pa.int16(),
+        pd.Int32Dtype(): pa.int32(),
+        pd.UInt32Dtype(): pa.uint32(),
+    }
+    pandas_types = {arrow: dtype for dtype, arrow in arrow_types.items()}
+
+    column_types = {}
+    for column, dtype in dtype_dict.items():
+        if dtype == "category":
+            column_types[column] = pa.dictionary(pa.int32(), pa.string())
+        elif dtype == "str":
+            column_types[column] = pa.string()
+        elif dtype == "float64":
+            column_types[column] = pa.float64()
+        else:
+            column_types[column] = arrow_types[dtype]
+    for column in datetime_columns:
+        column_types[column] = pa.string()
+
+    include_columns = []
+    if usecols is not None:
+        # keep the order of the file, like pandas does
+        selected = set(usecols)
+        include_columns = [names[0], *(c for c in names[1:] if c in selected)]
+        datetime_columns = [c for c in datetime_columns if c in selected]
+
+    with _open_binary(responses_file) as fp:
+        table = pa_csv.read_csv(
+            fp,
+            # the header is replaced by the already renamed column names
+            read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=include_columns,
+                null_values=_NA_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+
+    # Like pandas, keep the original strings if a column cannot be parsed as dates
+    for column in datetime_columns:
+        i = table.schema.get_field_index(column)
+        with contextlib.suppress(pa.ArrowInvalid):
+            table = table.set_column(
+                i, column, table.column(i).cast(pa.timestamp("ns"))
+            )
+
+    # pandas infers empty columns as float, Arrow as null type
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+
+    responses = table.to_pandas(
+        types_mapper=pandas_types.get, split_blocks=True, self_destruct=True
+    )
+    del table
+
+    for column, dtype in responses.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            # pandas sorts categories, Arrow keeps them in order of appearance
+            responses[column] = responses[column].cat.reorder_categories(
+                sorted(dtype.categories)
+            )
+        elif pd.api.types.is_object_dtype(dtype):
+            # pandas marks missing strings as NaN, Arrow as None
+            responses[column] = responses[column].where(
+                responses[column].notna(), np.nan
+            )
+
+    return responses.set_index(names[0])
+
+
+def _contingent_parent(other: pd.Series) -> pd.Series:
+    """Fill the parent column of a contingent "other" answer of a multiple choice.
+
+    LimeSurvey does not export these columns, see `LimeSurveyData._read_responses`.
+
+    Args:
+        other: responses to the contingent question, e.g. B1other
+
+    Returns:
+        "Y" where the contingent question was answered, NaN otherwise
+    """
+    return pd.Series(other.where(other.isnull(), "Y"))
+
+
+def _set_choice_categories(
+    df: pd.DataFrame, categories: Mapping[Hashable, pd.Index]
+) -> pd.DataFrame:
+    """Give the columns of questions with answer options fixed categories.
+
+    The categories are the answer codes in the order of the survey structure, so
+    the category codes of a column are the same for every file, chunk and subset
+    of rows. Values that are no answer codes (e.g. answer texts) are kept as
+    additional categories, sorted after the answer codes.
+
+    Args:
+        df: responses, with columns named like the survey structure
+        categories: answer codes by column name
+
+    Returns:
+        The responses with updated dtypes
+    """
+    updated = {}
+    for column, series in df.items():
+        choices = categories.get(column)
+        if choices is None:
+            continue
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        elif series.cat.categories.equals(choices):
+            continue
+        if not series.cat.categories.equals(choices):
+            extra = series.cat.categories.difference(choices, sort=True)
+            series = series.cat.set_categories(choices.append(extra))
+        updated[column] = series
+
+    if not updated:
+        return df
+    # replace all columns at once, setting them one by one is much slower
+    unchanged = df.drop(columns=list(updated))
+    return pd.concat([unchanged, pd.DataFrame(updated)], axis="columns")[df.columns]
+
+
+def _read_csv_columns(
+    responses_file: Path,
+    names: list[str],
+    dtype_dict: Mapping[Hashable, Dtype],
+    datetime_columns: Iterable[str],
+    csv_engine: CsvEngine,
+    contingent_parents: Mapping[Hashable, str],
+    choice_categories: Mapping[Hashable, pd.Index],
+    columns: list[Hashable],
+) -> pd.DataFrame:
+    """Read some columns of the responses CSV file, for lazy loading.
+
+    Args:
+        responses_file: Path to the responses CSV file
+        names: column names, starting with the index column
+        dtype_dict: pandas dtypes of the columns (by name in `names`)
+        datetime_columns: columns to parse as timestamps, not listed in dtype_dict
+        csv_engine: backend for reading the CSV file
+        contingent_parents: columns that are missing in the file, and the
+            contingent question columns they are filled from
+        choice_categories: answer codes of the columns with answer options
+        columns: columns to read
+
+    Returns:
+        The selected columns, indexed by the first column of the file
+    """
+    # the columns are named by the header of the file, so they are strings
+    usecols = [cast(str, contingent_parents.get(column, column)) for column in columns]
+    if csv_engine == CsvEngine.PYARROW:
+        df = _read_csv_pyarrow(
+            responses_file, names, dtype_dict, datetime_columns, usecols
+        )
+    else:
+        with _open_text(responses_file) as fp:
+            next(csv.reader(fp))
+            df = _read_csv_c(fp, names, dtype_dict, datetime_columns, usecols)
+
+    for column in columns:
+        if column in contingent_parents:
+            df[column] = _contingent_parent(df[contingent_parents[column]])
+    return _set_choice_categories(df, choice_categories)
+
+
+def _index_questions(questions: pd.DataFrame) -> dict[Hashable, np.ndarray]:
+    """Map question groups and column names to their rows in the questions table.
+
+    For every key, the rows are the same as selected by
+    `(questions["question_group"] == key) | (questions.index == key)`.
+
+    Args:
+        questions: survey structure, indexed by column name
+
+    Returns:
+        Sorted row positions, by question group or column name
+    """
+    positions: dict[Hashable, list[int]] = {}
+    for i, (name, group) in enumerate(
+        zip(questions.index, questions["question_group"], strict=True)
+    ):
+        positions.setdefault(group, []).append(i)
+        if name != group:
+            positions.setdefault(name, []).append(i)
+
+    return {key: np.array(rows, dtype=np.intp) for key, rows in positions.items()}
+
+
+def _index_sections(questions: pd.DataFrame) -> dict[Hashable, np.ndarray]:
+    """Map sections to their rows in the questions table.
+
+    Sections are keyed by their ID (e.g. 13910), and by their letter, which is
+    the first letter of their question codes (e.g. "D" for "D4"). Sections with
+    the same letter are merged.
+
+    Args:
+        questions: survey structure, indexed by column name
+
+    Returns:
+        Sorted row positions, by section ID or letter
+    """
+    letters = questions["question_group"].str.extract("^([A-Z])", expand=False)
+    positions: dict[Hashable, list[int]] = {}
+    for i, (section_id, letter) in enumerate(
+        zip(questions["section_id"], letters, strict=True)
+    ):
+        positions.setdefault(int(section_id), []).append(i)
+        if isinstance(letter, str):
+            positions.setdefault(letter, []).append(i)
+
+    return {key: np.array(rows, dtype=np.intp) for key, rows in positions.items()}
+
+
+def _read_only_view(array: np.ndarray) -> np.ndarray:
+    """Get a view of a numpy array that cannot be written to.
+
+    Args:
+        array: any numpy array
+
+    Returns:
+        Read-only view sharing the memory of the array
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild a DataFrame on read-only arrays, so values cannot be set in place.
+
+    Adding, replacing or dropping columns of (shallow copies of) the result still
+    works, only writing into the existing arrays raises a ValueError.
+
+    Args:
+        df: DataFrame with unique column names
+
+    Returns:
+        DataFrame with the same index, columns and dtypes
+    """
+    columns: dict[Hashable, Any] = {}
+    for name, series in df.items():
+        array = series.array
+        if isinstance(array, pd.Categorical):
+            # the codes property is a read-only view already,
+            # pandas-stubs lack `validate` and accept only sequences as codes
+            columns[name] = pd.Categorical.from_codes(
+                array.codes,  # ty: ignore[invalid-argument-type]
+                dtype=array.dtype,
+                validate=False,  # ty: ignore[unknown-argument]
+            )
+        elif isinstance(array, BaseMaskedArray):
+            # nullable integer / float / boolean: values and missing value mask
+            data = array.to_numpy(dtype=array.dtype.type, na_value=0)
+            columns[name] = type(array)(
+                _read_only_view(data), _read_only_view(array.isna())
+            )
+        elif isinstance(series.dtype, np.dtype):
+            columns[name] = _read_only_view(series.to_numpy())
+        else:
+            columns[name] = array
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _intern_choices(questions: pd.DataFrame) -> pd.DataFrame:
+    """Share one `ChoiceSet` between all columns with equal answer options.
+
+    Args:
+        questions: survey structure, indexed by column name
+
+    Returns:
+        Copy of the table with interned choices, and their IDs in the
+        "choice_set" column after "choices"
+    """
+    choices, choice_set_ids = intern_choices(questions["choices"])
+    questions = questions.drop(columns="choice_set", errors="ignore")
+    questions["choices"] = pd.Series(choices, index=questions.index, dtype=object)
+    questions.insert(
+        cast(int, questions.columns.get_loc("choices")) + 1,
+        "choice_set",
+        pd.Series(choice_set_ids, index=questions.index),
+    )
+    return questions
+
+
+def _parse_structure(
+    structure_file: Path,
+    structure_parser: StructureParser,
+    structure_cache: Path | None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Parse the structure XML file into the sections and questions tables.
+
+    Args:
+        structure_file: path to the structure XML file
+        structure_parser: backend for parsing the structure XML file
+        structure_cache: directory for caching the parsed structure, or None
+
+    Returns:
+        Tuple of sections and questions tables
+    """
+    if structure_cache is not None:
+        # the file is hashed once, for looking up and for storing the entry
+        digest = structure_digest(structure_file)
+        cached = read_cached_structure(
+            structure_file, structure_cache, structure_parser, digest
+        )
+        if cached is not None:
+            return cached
+
+    # Parse XML structure file
+    structure_dict = read_lime_questionnaire_structure(structure_file, structure_parser)
+
+    # Get pandas.DataFrame table for the structure
+    section_df = pd.DataFrame(structure_dict["sections"])
+    section_df = section_df.set_index("id")
+    question_df = pd.DataFrame(structure_dict["questions"])
+    question_df = question_df.set_index("name")
+    question_df["is_contingent"] = question_df.contingent_of_name.notnull()
+    question_df = _intern_choices(question_df)
+
+    if structure_cache is not None:
+        write_cached_structure(
+            structure_file,
+            structure_cache,
+            structure_parser,
+            section_df,
+            question_df,
+            digest,
+        )
+
+    return section_df, question_df
 
-from .survey_structure import read_lime_questionnaire_structure
+
+def _read_snapshot_columns(
+    path: Path,
+    table: str,
+    choice_categories: Mapping[Hashable, pd.Index],
+    columns: list[Hashable],
+) -> pd.DataFrame:
+    """Read some columns of a table in a snapshot file, for lazy loading.
+
+    Args:
+        path: snapshot file
+        table: name of the table
+        choice_categories: answer codes of the columns with answer options
+        columns: columns to read
+
+    Returns:
+        The selected columns
+    """
+    df = read_snapshot(path, [table], {table: columns})[table]
+    return _set_choice_categories(df, choice_categories)
 
 
 class QuestionType(StrEnum):
@@ -27,25 +550,91 @@ class LimeSurveyData:
 
     # we probably want these kind of constants defined somewhere else in one place
     na_label: str = "No Answer"
-    lime_system_info: pd.DataFrame
-    responses: pd.DataFrame
-    questions: pd.DataFrame
     sections: pd.DataFrame
+    _questions: pd.DataFrame
+    # lookups for the accessors, built whenever questions are assigned
+    _question_rows: dict[Hashable, np.ndarray]
+    _question_types: dict[Hashable, list[str]]
+    _section_rows: dict[Hashable, np.ndarray]
+    # question groups with columns of each type, in survey order
+    _type_groups: dict[str, list[str]]
+    _choices: dict[str, dict[str, str]]
+    _choice_categories: dict[Hashable, pd.Index]
+    _synthesized_columns: dict[str, str]
+    # compiled on first access to the schema property
+    _schema: Schema | None
+    # compiled schemas for reading responses CSV files, by header
+    _schemas: dict[tuple[str, ...], tuple[list[str], dict[Hashable, Dtype], list[str]]]
+    # maximum number of get_responses results to keep, 0 disables the cache
+    responses_cache_size: int = 32
+    _responses_cache: OrderedDict[tuple[str, bool], pd.DataFrame]
+    _multiple_choice_cache: dict[str, MultipleChoiceBits]
+    # computed on first call of health_scores
+    _health_scores: pd.DataFrame | None
+    _responses: pd.DataFrame
+    _lime_system_info: pd.DataFrame
+    # tables of which columns are read on first access, by attribute name
+    _lazy_tables: dict[str, LazyTable]
 
     def __init__(
         self,
-        structure_file: Path,
-        responses_file: Path,
+        structure_file: str | os.PathLike[str],
+        responses_file: str | os.PathLike[str],
+        structure_parser: StructureParser = StructureParser.LXML,
+        structure_cache: str | os.PathLike[str] | None = None,
+        csv_engine: CsvEngine = CsvEngine.C,
+        lazy: bool = False,
     ) -> None:
         """Initialize an instance of the Survey.
 
         Args:
             structure_file: path to the structure XML file
             responses_file: path to the responses CVS file
+            structure_parser: backend for parsing the structure XML file
+            structure_cache: directory for caching the parsed structure.
+                If None (default), the structure file is always parsed.
+            csv_engine: backend for reading the responses CSV file. The
+                multithreaded `CsvEngine.PYARROW` requires the `pyarrow` package.
+            lazy: only read the header of the responses CSV file now. Columns are
+                read when they are first needed, e.g. by `get_responses`, and
+                then kept in memory. Accessing `responses` reads all of them.
         """
+        self._init_caches()
         # Store path to structure file
-        self._read_structure(structure_file)
-        self._read_responses(responses_file)
+        self._read_structure(structure_file, structure_parser, structure_cache)
+        self._read_responses(responses_file, csv_engine, lazy)
+
+    def _init_caches(self) -> None:
+        """Set up the lazy tables and caches of a new instance."""
+        self._lazy_tables = {}
+        self._responses_cache = OrderedDict()
+        self._multiple_choice_cache = {}
+        self._health_scores = None
+
+    @classmethod
+    def _from_structure(
+        cls,
+        structure: tuple[pd.DataFrame, pd.DataFrame],
+        responses_file: Path,
+        csv_engine: CsvEngine = CsvEngine.C,
+        lazy: bool = False,
+    ) -> Self:
+        """Create a survey from an already parsed structure, see `load_surveys`.
+
+        Args:
+            structure: sections and questions tables, see `_parse_structure`
+            responses_file: path to the responses CSV file
+            csv_engine: backend for reading the responses CSV file
+            lazy: only read the header of the responses CSV file now
+
+        Returns:
+            The survey object
+        """
+        survey = cls.__new__(cls)
+        survey._init_caches()
+        survey.sections, survey.questions = structure
+        survey._read_responses(responses_file, csv_engine, lazy)
+        return survey
 
     def __str__(self) -> str:
         """Print all questions, responses and sections for debugging."""
@@ -54,24 +643,311 @@ class LimeSurveyData:
         string += f"SECTIONS\n{self.sections}\n"
         return string
 
+    @property
+    def questions(self) -> pd.DataFrame:
+        """Survey structure, one row per response column.
+
+        Assign a new DataFrame instead of modifying this one in place, so that
+        the lookups of `get_question` and friends are updated.
+        """
+        return self._questions
+
+    @questions.setter
+    def questions(self, questions: pd.DataFrame) -> None:
+        self._questions = questions
+        self._question_rows = _index_questions(questions)
+        types = questions["type"].to_numpy()
+        self._question_types = {
+            key: pd.unique(types[rows]).tolist()
+            for key, rows in self._question_rows.items()
+        }
+        self._section_rows = _index_sections(questions)
+        type_groups: dict[str, dict[str, None]] = {}
+        for question_type, group in zip(
+            types, questions["question_group"], strict=True
+        ):
+            type_groups.setdefault(question_type, {})[group] = None
+        self._type_groups = {
+            question_type: list(groups) for question_type, groups in type_groups.items()
+        }
+        self._choices = {}
+        # one index per choice set, shared by all of its columns
+        categories: dict[int, pd.Index] = {}
+        self._choice_categories = {
+            name: categories.setdefault(id(choices), pd.Index(list(choices)))
+            for name, choices in zip(questions.index, questions["choices"], strict=True)
+            if isinstance(choices, dict)
+        }
+        multiple_choice_contingent = questions[
+            (questions["type"] == "multiple-choice")
+            & questions["contingent_of_name"].notnull()
+        ]
+        self._synthesized_columns = dict(
+            zip(
+                multiple_choice_contingent["contingent_of_name"],
+                multiple_choice_contingent.index,
+                strict=True,
+            )
+        )
+        self._schemas = {}
+        self._schema = None
+        self._responses_cache = OrderedDict()
+        self._multiple_choice_cache = {}
+        self._health_scores = None
+
+    @property
+    def schema(self) -> Schema:
+        """Survey structure compiled into records, for fast lookups by code.
+
+        Use this instead of indexing `questions` when looking up single labels
+        or choices, e.g. `survey.schema["B1_SQ001"].label`. It is compiled on
+        first access from `sections` and `questions`, and again after new
+        questions are assigned.
+        """
+        if self._schema is None:
+            self._schema = Schema.from_tables(self.sections, self.questions)
+        return self._schema
+
+    @property
+    def synthesized_columns(self) -> dict[str, str]:
+        """Parents of the contingent "other" answers of multiple-choice questions.
+
+        For example "B1T" for "B1other". LimeSurvey does not export them, so they
+        are added on import, unless the responses file has them anyway. They are
+        "Y" where the contingent question was answered.
+
+        Returns:
+            The contingent question columns they are filled from, by column name
+        """
+        return dict(self._synthesized_columns)
+
+    def _get_question_rows(self, question: str) -> np.ndarray:
+        """Get the rows of a question group or column in `self.questions`.
+
+        Args:
+            question: Name of question or subquestion
+
+        Raises:
+            ValueError: There is no such question or subquestion
+
+        Returns:
+            Sorted row positions
+        """
+        rows = self._question_rows.get(question)
+        if rows is None:
+            raise ValueError(f"Unexpected question code '{question}'")
+        return rows
+
+    def _get_section_rows(self, section: str | int) -> np.ndarray:
+        """Get the rows of a section in `self.questions`.
+
+        Args:
+            section: Section letter (e.g. "D") or section ID
+
+        Raises:
+            ValueError: There is no such section
+
+        Returns:
+            Sorted row positions
+        """
+        rows = self._section_rows.get(section)
+        if rows is None:
+            raise ValueError(f"Unexpected section '{section}'")
+        return rows
+
+    @property
+    def responses(self) -> pd.DataFrame:
+        """Responses to the survey questions, one row per respondent.
+
+        Assign a new DataFrame instead of modifying this one in place, so that
+        cached results of `get_responses` are discarded.
+        """
+        lazy = self._lazy_tables.pop("responses", None)
+        if lazy is not None:
+            self._responses = lazy.get_all()
+        return self._responses
+
+    @responses.setter
+    def responses(self, responses: pd.DataFrame) -> None:
+        self._lazy_tables.pop("responses", None)
+        self._responses = responses
+        self._responses_cache = OrderedDict()
+        self._multiple_choice_cache = {}
+        self._health_scores = None
+
+    @property
+    def lime_system_info(self) -> pd.DataFrame:
+        """Technical fields of LimeSurvey, e.g. dates, language and timings."""
+        lazy = self._lazy_tables.pop("lime_system_info", None)
+        if lazy is not None:
+            self._lime_system_info = lazy.get_all()
+        return self._lime_system_info
+
+    @lime_system_info.setter
+    def lime_system_info(self, lime_system_info: pd.DataFrame) -> None:
+        self._lazy_tables.pop("lime_system_info", None)
+        self._lime_system_info = lime_system_info
+
+    def _get_response_columns(self, columns: list[str]) -> pd.DataFrame:
+        """Get some columns of the responses, reading only these in lazy mode.
+
+        Args:
+            columns: response columns, in the desired order
+
+        Returns:
+            DataFrame with the selected columns
+        """
+        lazy = self._lazy_tables.get("responses")
+        if lazy is not None:
+            return lazy.get(columns)
+        return self.responses.loc[:, columns]
+
+    def save_snapshot(self, path: Path) -> None:
+        """Save all survey tables into a columnar binary snapshot file.
+
+        Loading the snapshot with `from_snapshot` is much faster than reading the
+        original XML and CSV files. Dtypes (including categories and nullable
+        integers) as well as the answer choices are kept intact.
+
+        Args:
+            path: output file, overwritten if it exists
+        """
+        write_snapshot(
+            path,
+            {
+                "responses": self.responses,
+                "questions": self.questions,
+                "sections": self.sections,
+                "lime_system_info": self.lime_system_info,
+            },
+        )
+
+    def save_snapshot_from_csv(
+        self, responses_file: Path, path: Path, chunksize: int = 50_000
+    ) -> None:
+        """Convert a responses CSV file into a snapshot file with bounded memory.
+
+        The CSV file is read in chunks of rows (see `iter_responses`), which are
+        appended to the snapshot one after another. The snapshot contains the
+        structure of this survey object and can be loaded with `from_snapshot`.
+
+        Args:
+            responses_file: Path to the responses CSV file
+            path: output file, overwritten if it exists
+            chunksize: number of rows per chunk
+        """
+        with SnapshotWriter(path) as writer:
+            writer.append("questions", self.questions)
+            writer.append("sections", self.sections)
+            for responses, system_info in self.iter_responses(
+                responses_file, chunksize
+            ):
+                writer.append("responses", responses)
+                writer.append("lime_system_info", system_info)
+
+    @classmethod
+    def from_snapshot(cls, path: Path, lazy: bool = False) -> Self:
+        """Load a survey from a snapshot file written by `save_snapshot`.
+
+        Args:
+            path: snapshot file
+            lazy: only read the survey structure now, and response columns when
+                they are first needed (see `LimeSurveyData.__init__`)
+
+        Returns:
+            The survey object
+        """
+        survey = cls.__new__(cls)
+        survey._init_caches()
+
+        tables = read_snapshot(path, ["sections", "questions"] if lazy else None)
+        survey.sections = tables["sections"]
+        # choices are stored as plain dicts, share them again
+        survey.questions = _intern_choices(tables["questions"])
+
+        # parts written in chunks can add categories in a different order
+        categories = survey._choice_categories
+        if lazy:
+            columns = read_snapshot_columns(path)
+            for table in ["responses", "lime_system_info"]:
+                survey._lazy_tables[table] = LazyTable(
+                    pd.Index(columns[table], dtype=object),
+                    partial(_read_snapshot_columns, path, table, categories),
+                )
+        else:
+            survey.responses = _set_choice_categories(tables["responses"], categories)
+            survey.lime_system_info = tables["lime_system_info"]
+        return survey
+
+    def publish_shared(self) -> SharedTables:
+        """Copy all survey tables into shared memory, for worker processes.
+
+        Workers get the survey with `from_shared`, without copying the
+        responses. For example, with a `ProcessPoolExecutor`:
+
+            with survey.publish_shared() as shared, ProcessPoolExecutor() as pool:
+                pool.map(make_report, repeat(shared.name), centers)
+
+        where `make_report` calls `LimeSurveyData.from_shared(name)`. This
+        process must keep the returned object until the workers are done.
+
+        Returns:
+            Owner of the shared memory block, which frees it on `close`
+        """
+        return SharedTables.publish(
+            {
+                "responses": self.responses,
+                "questions": self.questions,
+                "sections": self.sections,
+                "lime_system_info": self.lime_system_info,
+            }
+        )
+
+    @classmethod
+    def from_shared(cls, name: str) -> Self:
+        """Get a survey published by another process with `publish_shared`.
+
+        The tables are attached once per process, later calls only create a new
+        survey object on top of them. Every survey gets its own DataFrames, so
+        columns assigned in one task do not show up in the next. Response values
+        are read-only, assign new columns or DataFrames instead of modifying them
+        in place.
+
+        Args:
+            name: name of the shared memory block, see `SharedTables.name`
+
+        Returns:
+            The survey object
+        """
+        tables = attach_tables(name)
+        survey = cls.__new__(cls)
+        survey._init_caches()
+        survey.responses = tables["responses"]
+        survey.lime_system_info = tables["lime_system_info"]
+        survey.sections = tables["sections"]
+        survey.questions = tables["questions"]
+        return survey
+
     # partially copied from N2Framework
-    def _read_structure(self, structure_file: Path) -> None:
+    def _read_structure(
+        self,
+        structure_file: str | os.PathLike[str],
+        structure_parser: StructureParser = StructureParser.LXML,
+        structure_cache: str | os.PathLike[str] | None = None,
+    ) -> None:
         """Read structure XML file.
 
         Args:
             structure_file: path to the structure XML file
+            structure_parser: backend for parsing the structure XML file
+            structure_cache: directory for caching the parsed structure, or None
         """
-        # Parse XML structure file
-        structure_dict = read_lime_questionnaire_structure(structure_file)
-
-        # Get pandas.DataFrame table for the structure
-        section_df = pd.DataFrame(structure_dict["sections"])
-        section_df = section_df.set_index("id")
-        question_df = pd.DataFrame(structure_dict["questions"])
-        question_df = question_df.set_index("name")
-        question_df["is_contingent"] = question_df.contingent_of_name.notnull()
-        self.sections = section_df
-        self.questions = question_df
+        # like pandas, also accept paths as strings
+        self.sections, self.questions = _parse_structure(
+            Path(structure_file),
+            structure_parser,
+            None if structure_cache is None else Path(structure_cache),
+        )
 
         # import hard-coded questions
         # for question, info in self.additional_questions.items():
@@ -80,44 +956,174 @@ class LimeSurveyData:
     # copied from N2Framework
     def _read_responses(
         self,
-        responses_file: Path,
+        responses_file: str | os.PathLike[str],
+        csv_engine: CsvEngine = CsvEngine.C,
+        lazy: bool = False,
     ) -> None:
         """Read responses CSV file.
 
         Args:
             responses_file: Path to the responses CSV file
+            csv_engine: backend for reading the CSV file
+            lazy: only read the header now, and columns on first access
         """
-        # Read 1st line of the csv file
-        response = pd.read_csv(responses_file, nrows=1, index_col=0)
+        responses_file = Path(responses_file)
+        with _open_text(responses_file) as fp:
+            names, dtypes, dates = self._read_header(fp)
+
+            # Read the rest of the csv with optimal dtypes, using the final names
+            if lazy:
+                # Only the columns are needed to set up the tables
+                responses = pd.DataFrame(
+                    columns=names[1:], index=pd.Index([], name=names[0])
+                )
+            elif csv_engine == CsvEngine.PYARROW:
+                responses = _read_csv_pyarrow(responses_file, names, dtypes, dates)
+            else:
+                responses = _read_csv_c(fp, names, dtypes, dates)
 
-        # Prepare dtype info
-        columns = response.columns
-        renamed_columns = (
-            columns.str.replace("[", "_", regex=False)
-            .str.replace("]", "", regex=False)
-            .str.replace("_other", "other", regex=False)
+        question_responses, system_info, contingent_parents = self._split_responses(
+            responses
         )
+
+        if lazy:
+            read_columns = partial(
+                _read_csv_columns,
+                responses_file,
+                names,
+                dtypes,
+                dates,
+                csv_engine,
+                contingent_parents,
+                self._choice_categories,
+            )
+            self._lazy_tables["responses"] = LazyTable(
+                question_responses.columns, read_columns
+            )
+            if "datestamp" in responses.columns:
+                self._lazy_tables["lime_system_info"] = LazyTable(
+                    system_info.columns, read_columns
+                )
+            else:
+                self.lime_system_info = system_info
+        else:
+            self.responses = question_responses
+            self.lime_system_info = system_info
+
+    def iter_responses(
+        self, responses_file: Path, chunksize: int = 50_000
+    ) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+        """Read the responses CSV file in chunks of rows.
+
+        Every chunk is processed like the complete file in `__init__`, i.e. with the
+        same dtypes, column names and added multiple-choice columns. Memory use is
+        bounded by the chunk size, so the chunks can be fed to incremental
+        aggregations or written to a snapshot (see `save_snapshot_from_csv`) even
+        if the whole file does not fit into memory. To avoid reading the file
+        completely when creating the survey object, use `lazy=True`.
+
+        Args:
+            responses_file: Path to the responses CSV file
+            chunksize: number of rows per chunk
+
+        Yields:
+            Tuples of responses and LimeSurvey system info, like the `responses`
+            and `lime_system_info` attributes
+        """
+        with _open_text(responses_file) as fp:
+            names, dtypes, dates = self._read_header(fp)
+            with pd.read_csv(
+                fp,
+                header=None,
+                names=names,
+                index_col=0,
+                dtype=dtypes,
+                parse_dates=dates,
+                chunksize=chunksize,
+            ) as reader:
+                for i, chunk in enumerate(reader):
+                    # the columns are the same for all chunks, only warn once
+                    question_responses, system_info, _ = self._split_responses(
+                        chunk, validate=i == 0
+                    )
+                    yield question_responses, system_info
+
+    def _read_header(
+        self, fp: TextIO
+    ) -> tuple[list[str], dict[Hashable, Dtype], list[str]]:
+        """Read the header of the responses CSV file and prepare reading the rest.
+
+        Args:
+            fp: text file handle, positioned at the start of the file. Afterwards,
+                it is positioned at the first row.
+
+        Returns:
+            Column names (index column first, renamed to match `self.questions`),
+            pandas dtypes of the columns and a list of datetime columns. They are
+            shared by all reads of files with the same header, do not modify them.
+        """
+        # Read the header line only, the file handle stays at the first row
+        header = tuple(next(csv.reader(fp)))
+
+        # Compile the schema once per header, e.g. for chunked or lazy reads
+        schema = self._schemas.get(header)
+        if schema is None:
+            schema = self._compile_schema(header)
+            self._schemas[header] = schema
+        return schema
+
+    def _compile_schema(
+        self, header: tuple[str, ...]
+    ) -> tuple[list[str], dict[Hashable, Dtype], list[str]]:
+        """Prepare reading a responses CSV file, see `_read_header`.
+
+        Args:
+            header: column names in the CSV file
+
+        Returns:
+            Column names, pandas dtypes of the columns and a list of datetime columns
+        """
+        # Prepare dtype info (the first column is the index)
+        index_column = header[0]
+        columns = pd.Index(header[1:])
+        renamed_columns = pd.Index([_rename_column(c) for c in columns])
         dtype_dict, datetime_columns = self._get_dtype_info(columns, renamed_columns)
+        renamed = dict(zip(columns, renamed_columns, strict=True))
+        names = [index_column, *renamed_columns]
+        # pandas does not parse dates in columns with an explicit dtype
+        dtypes = {
+            renamed[c]: dtype
+            for c, dtype in dtype_dict.items()
+            if c not in datetime_columns
+        }
+        dates = [renamed[c] for c in datetime_columns]
+
+        return names, dtypes, dates
+
+    def _split_responses(
+        self, responses: pd.DataFrame, validate: bool = True
+    ) -> tuple[pd.DataFrame, pd.DataFrame, dict[Hashable, str]]:
+        """Split the CSV content into question responses and system info.
+
+        Also adds the columns for multiple-choice questions that LimeSurvey does not
+        export, and drops columns that are not part of the survey structure.
 
-        # Read entire csv with optimal dtypes
-        responses = pd.read_csv(
-            responses_file,
-            index_col=0,
-            dtype=dtype_dict,
-            parse_dates=datetime_columns,
-            # infer_datetime_format=True,
-        )
-        responses = responses.rename(
-            columns=dict(zip(columns, renamed_columns, strict=True))
-        )
+        Args:
+            responses: content of the responses CSV file, with renamed columns
+            validate: warn about differences between the columns and the structure
 
-        if "datestamp" in columns:
+        Returns:
+            Question responses, LimeSurvey system info and the added columns along
+            with the contingent question columns they are filled from.
+        """
+        renamed_columns = responses.columns
+        if "datestamp" in renamed_columns:
             # CSV file is unprocessed data
             raw_data = True
 
             # Identify columns for survey questions
-            first_question = cast(int, columns.get_loc("datestamp")) + 1
-            last_question = cast(int, columns.get_loc("interviewtime")) - 1
+            first_question = cast(int, renamed_columns.get_loc("datestamp")) + 1
+            last_question = cast(int, renamed_columns.get_loc("interviewtime")) - 1
             question_columns = list(renamed_columns[first_question : last_question + 1])
 
             # Split df into question responses and timing info
@@ -130,17 +1136,7 @@ class LimeSurveyData:
             question_responses = responses
             system_info = pd.DataFrame()
 
-        # Set correct categories for categorical fields
-        # for column in self.questions.index:
-        #     choices = self.questions.loc[column, "choices"]
-        #     if (column in question_responses.columns) and pd.notnull(choices):
-        #         question_responses.loc[:, column] = (
-        #             question_responses.loc[:, column]
-        #             # We expect all categorical column to be category dtype already
-        #             #.astype("category")
-        #             .cat.set_categories(choices.keys())
-        #         )
-
+        contingent_parents: dict[Hashable, str] = {}
         if raw_data:
             # Add missing columns for multiple-choice questions with contingent question
             # A contingent question of a multiple-choice question typically looks
@@ -156,22 +1152,32 @@ class LimeSurveyData:
             # For some reason, LimeSurvey does not export values for the parent
             # <response> (B1T in this case).
             # So, here we add those columns artificially based on the contingent
-            # question values.
-            multiple_choice_questions = self.questions.index[
-                (self.questions["type"] == "multiple-choice")
-                & self.questions["contingent_of_name"].notnull()
-            ]
-            for question in multiple_choice_questions:
-                question_responses.insert(
-                    cast(int, question_responses.columns.get_loc(question)),
-                    self.questions.loc[question, "contingent_of_name"],
-                    # Fill in new column based on "{question_id}other" column data
-                    pd.Series(
-                        question_responses[question].where(
-                            question_responses[question].isnull(), "Y"
-                        )
-                    ),
-                )
+            # question values. Columns that are exported nevertheless are kept.
+            contingent_parents = {
+                parent: question
+                for parent, question in self._synthesized_columns.items()
+                if parent not in question_responses.columns
+            }
+            # Fill in new columns based on "{question_id}other" column data, and
+            # insert them in front of those all at once
+            synthesized = pd.DataFrame(
+                {
+                    parent: _contingent_parent(question_responses[question])
+                    for parent, question in contingent_parents.items()
+                },
+                index=question_responses.index,
+            )
+            parent_of = {
+                question: parent for parent, question in contingent_parents.items()
+            }
+            order = []
+            for column in question_responses.columns:
+                if column in parent_of:
+                    order.append(parent_of[column])
+                order.append(column)
+            question_responses = pd.concat(
+                [question_responses, synthesized], axis="columns"
+            )[order]
 
         # Validate data structure
         # Check for columns not listed in survey structure df
@@ -183,24 +1189,29 @@ class LimeSurveyData:
             )
         )
         if not_in_structure:
-            warnings.warn(
-                "The following columns in the data csv file are not found "
-                f"in the survey structure and are dropped:\n{not_in_structure}",
-                stacklevel=2,
-            )
+            if validate:
+                warnings.warn(
+                    "The following columns in the data csv file are not found "
+                    f"in the survey structure and are dropped:\n{not_in_structure}",
+                    stacklevel=3,
+                )
             question_responses = question_responses.drop(not_in_structure, axis=1)
         # Check for questions not listed in data csv
         not_in_data = list(set(self.questions.index) - set(question_responses.columns))
-        if not_in_data:
+        if not_in_data and validate:
             warnings.warn(
                 "The following questions in the survey structure are not found "
                 f"in the data csv file:\n{not_in_data}",
-                stacklevel=2,
+                stacklevel=3,
             )
 
         assert isinstance(question_responses, pd.DataFrame)
-        self.responses = question_responses
-        self.lime_system_info = system_info
+        # Set the categories in the order of the answer options
+        question_responses = _set_choice_categories(
+            question_responses, self._choice_categories
+        )
+
+        return question_responses, system_info, contingent_parents
 
     def _get_dtype_info(
         self, columns: Iterable[str], renamed_columns: Iterable[str]
@@ -214,51 +1225,52 @@ class LimeSurveyData:
         Returns:
             Dictionary of column names and dtypes and a list of datetime columns.
         """
-        # Compile dict with dtype for each column
-        dtype_dict: dict[Hashable, Dtype] = {}
-        # Compile list of datetime columns
+        columns = pd.Index(columns)
+
+        # Join the columns with the survey structure once, instead of per column
+        rows = self.questions.index.get_indexer(pd.Index(renamed_columns))
+        in_structure = rows >= 0
+        structure = self.questions.iloc[rows[in_structure]]
+        response_format = np.full(len(columns), None, dtype=object)
+        response_format[in_structure] = structure["format"].to_numpy()
+        has_choices = np.zeros(len(columns), dtype=bool)
+        has_choices[in_structure] = structure["choices"].notna().to_numpy()
+
+        # Rules in order of precedence: (mask, dtype, is datetime column)
+        # First try to infer dtype from XML structure information,
+        # then technical fields of limesurvey (Timing, Language, etc.)
+        technical = ~in_structure
+        is_timing = np.asarray(columns.str.contains("[Tt]ime", regex=True), dtype=bool)
+        rules: list[tuple[np.ndarray, Dtype, bool]] = [
+            # Categorical dtype for all questions with answer options
+            (in_structure & has_choices, "category", False),
+            (in_structure & (response_format == "date"), "str", True),
+            (in_structure & (response_format == "integer"), pd.Int32Dtype(), False),
+            (in_structure & (response_format == "longtext"), "str", False),
+            (technical & (columns == "id"), pd.UInt32Dtype(), False),
+            (technical & (columns == "submitdate"), "str", True),
+            (technical & (columns == "lastpage"), pd.Int16Dtype(), False),
+            (technical & (columns == "startlanguage"), "category", False),
+            (technical & (columns == "seed"), pd.UInt32Dtype(), False),
+            (technical & columns.isin(["startdate", "datestamp"]), "str", True),
+            # Float for all timing info
+            (technical & is_timing, "float64", False),
+        ]
+        # Index of the first matching rule per column, -1 means no dtype
+        rule = np.select(
+            [mask for mask, _, _ in rules], list(range(len(rules))), default=-1
+        )
+
+        # Compile dict with dtype for each column and list of datetime columns
         # (because pd.read_csv takes this as separate arg)
+        dtype_dict: dict[Hashable, Dtype] = {}
         datetime_columns = []
-
-        for column, renamed_column in zip(columns, renamed_columns, strict=True):
-            # First try to infer dtype from XML structure information
-            if renamed_column in self.questions.index:
-                response_format = self.questions.loc[renamed_column, "format"]
-                # Categorical dtype for all questions with answer options
-                if pd.notnull(self.questions.loc[renamed_column, "choices"]):
-                    dtype_dict[column] = "category"
-                elif response_format == "date":
-                    dtype_dict[column] = "str"
-                    datetime_columns.append(column)
-                elif response_format == "integer":
-                    dtype_dict[column] = pd.Int32Dtype()
-                elif response_format == "longtext":
-                    dtype_dict[column] = "str"
-                else:
-                    # Do not include dtype
-                    pass
-            # Technical fields of limesurvey (Timing, Langueage, etc.)
-            else:
-                if column == "id":
-                    dtype_dict[column] = pd.UInt32Dtype()
-                elif column == "submitdate":
-                    dtype_dict[column] = "str"
+        for column, i in zip(columns, rule.tolist(), strict=True):
+            if i >= 0:
+                _, dtype, is_datetime = rules[i]
+                dtype_dict[column] = dtype
+                if is_datetime:
                     datetime_columns.append(column)
-                elif column == "lastpage":
-                    dtype_dict[column] = pd.Int16Dtype()
-                elif column == "startlanguage":
-                    dtype_dict[column] = "category"
-                elif column == "seed":
-                    dtype_dict[column] = pd.UInt32Dtype()
-                elif column == "startdate" or column == "datestamp":
-                    dtype_dict[column] = "str"
-                    datetime_columns.append(column)
-                # Float for all timing info
-                elif re.search("[Tt]ime", column):
-                    dtype_dict[column] = "float64"
-                else:
-                    # Do not include dtype
-                    pass
 
         return dtype_dict, datetime_columns
 
@@ -286,13 +1298,7 @@ class LimeSurveyData:
         Returns:
             pd.DataFrame: Subset from `self.questions` with corresponding rows
         """
-        questions_subdf = self.questions[
-            (self.questions["question_group"] == question)
-            | (self.questions.index == question)
-        ]
-
-        if questions_subdf.empty:
-            raise ValueError(f"Unexpected question code '{question}'")
+        questions_subdf = self.questions.iloc[self._get_question_rows(question)]
 
         if drop_other:
             questions_subdf = questions_subdf[~questions_subdf.is_contingent]
@@ -308,12 +1314,18 @@ class LimeSurveyData:
           returns choices of that question or column
         * For free and contingent, returns None
 
+        The choices are cached and read-only, see `ChoiceSet`. Use `dict(...)` to
+        get a modifiable copy.
+
         Args:
             question: Name of question or subquestion to retrieve
 
         Returns:
             dict of choices mappings
         """
+        if question in self._choices:
+            return self._choices[question]
+
         question_info = self.get_question(question)
         question_info = question_info[~question_info.is_contingent]
         question_type = self.get_question_type(question)
@@ -323,14 +1335,17 @@ class LimeSurveyData:
             question_type == QuestionType.MULTIPLE_CHOICE
         ):
             # Flatten nested dict and get choice text directly for multiple-choice
-            choices_dict = {
-                cast(str, index): row.choices["Y"]
-                for index, row in question_info.iterrows()
-            }
+            choices_dict = ChoiceSet(
+                {
+                    cast(str, index): row.choices["Y"]
+                    for index, row in question_info.iterrows()
+                }
+            )
         # If single-choice, free, individual subquestion, or array
         else:
             choices_dict = question_info.choices.iloc[0]
 
+        self._choices[question] = choices_dict
         return choices_dict
 
     def get_responses(
@@ -340,6 +1355,11 @@ class LimeSurveyData:
     ) -> pd.DataFrame:
         """Get responses for given question with or without contingent questions.
 
+        The most recently used results are cached (see `responses_cache_size`).
+        They are returned as shallow copies whose values are read-only: columns
+        can be added, replaced or dropped, but modifying values in place raises
+        a ValueError. Use `.copy()` to get a modifiable DataFrame.
+
         Args:
             question: Question to get the responses for.
             drop_other: Whether to exclude contingent question (i.e. "other")
@@ -348,13 +1368,36 @@ class LimeSurveyData:
             ValueError: Inconsistent question types within question groups.
             ValueError: Unknown question types.
 
+        Returns:
+            The response data for the selected question.
+        """
+        key = (question, drop_other)
+        responses = self._responses_cache.get(key)
+        if responses is None:
+            responses = _read_only(self._select_responses(question, drop_other))
+            if self.responses_cache_size > 0:
+                self._responses_cache[key] = responses
+                if len(self._responses_cache) > self.responses_cache_size:
+                    self._responses_cache.popitem(last=False)
+        else:
+            self._responses_cache.move_to_end(key)
+
+        return responses.copy(deep=False)
+
+    def _select_responses(self, question: str, drop_other: bool) -> pd.DataFrame:
+        """Select the responses for a question, see `get_responses`.
+
+        Args:
+            question: Question to get the responses for.
+            drop_other: Whether to exclude contingent question (i.e. "other")
+
         Returns:
             The response data for the selected question.
         """
         question_group = self.get_question(question, drop_other=drop_other)
         question_type = self.get_question_type(question)
 
-        responses = self.responses.loc[:, list(question_group.index)]
+        responses = self._get_response_columns(list(question_group.index))
 
         # convert multiple-choice responses
         if question_type == QuestionType.MULTIPLE_CHOICE:
@@ -369,6 +1412,70 @@ class LimeSurveyData:
         assert isinstance(responses, pd.DataFrame)
         return responses
 
+    def get_multiple_choice(self, question: str) -> MultipleChoiceBits:
+        """Get the answers to a multiple-choice question, packed into bits.
+
+        Contingent questions (i.e. "other") are not included. The result is
+        cached until `questions` or `responses` are assigned.
+
+        Args:
+            question: Multiple-choice question to get the answers for.
+
+        Raises:
+            ValueError: The question is not a multiple-choice question.
+
+        Returns:
+            The packed answers, e.g. for counting in
+            `data_analysis.count_responses.prepare_df_multiple`.
+        """
+        bits = self._multiple_choice_cache.get(question)
+        if bits is None:
+            question_type = self.get_question_type(question)
+            if question_type != QuestionType.MULTIPLE_CHOICE:
+                raise ValueError(
+                    f"Question {question} is of type '{question_type}', "
+                    "not multiple-choice."
+                )
+            bits = MultipleChoiceBits.from_responses(
+                self.get_responses(question, drop_other=True)
+            )
+            self._multiple_choice_cache[question] = bits
+
+        return bits
+
+    def health_scores(self) -> pd.DataFrame:
+        """Get all (mental) health scores and classes, one row per respondent.
+
+        The `HEALTH_INSTRUMENTS` (anxiety, depression, somatic symptoms and
+        burnout) are scored in one batch with `rate_health`, aligned on the
+        respondent ID. The result is cached until `questions` or `responses` are
+        assigned, and returned like `get_responses`, as a shallow copy with
+        read-only values. Plots can use its columns directly, e.g.
+        "trait_anxiety_class" for stacked bars or "somatic_score" for the
+        heatmap.
+
+        Raises:
+            ValueError: The survey lacks one of the questions
+
+        Returns:
+            Scores, classes and burnout profiles, see `rate_health`
+        """
+        if self._health_scores is None:
+            # data_analysis builds on data_import, so import scoring when needed
+            from ..data_analysis.instruments import get_instrument
+            from ..data_analysis.scoring import HEALTH_INSTRUMENTS, rate_health
+
+            responses = pd.concat(
+                [
+                    self.get_responses(get_instrument(name).question)
+                    for name in HEALTH_INSTRUMENTS
+                ],
+                axis="columns",
+            )
+            self._health_scores = _read_only(rate_health(responses))
+
+        return self._health_scores.copy(deep=False)
+
     def get_question_type(self, question: str) -> QuestionType:
         """Get question type and validate it.
 
@@ -382,12 +1489,12 @@ class LimeSurveyData:
         Returns:
             QuestionType: Question type like "single-choice", "array", etc.
         """
-        question_group = self.get_question(question)
-        question_types = question_group.type.unique()
+        self._get_question_rows(question)
+        question_types = self._question_types[question]
 
         if len(question_types) > 1:
             raise AssertionError(
-                f"Question {question} has multiple types {list(question_types)}."
+                f"Question {question} has multiple types {question_types}."
             )
 
         question_type = QuestionType(question_types[0])
@@ -403,11 +1510,70 @@ class LimeSurveyData:
         Returns:
             Question IDs for all matching questions.
         """
-        return list(
-            self.questions.loc[self.questions["type"] == type.value]["question_group"]
-            .unique()
-            .tolist()
-        )
+        return list(self._type_groups.get(type.value, []))
+
+    def get_section_questions(
+        self, section: str | int, type: QuestionType | None = None
+    ) -> list[str]:
+        """Get all questions of a section, optionally only those of a QuestionType.
+
+        Args:
+            section: Section letter (e.g. "D" for questions D1, D2, ...) or
+                section ID (the index of `self.sections`)
+            type: Desired QuestionType, e.g. SINGLE_CHOICE. If None (default),
+                questions of all types are returned.
+
+        Raises:
+            ValueError: There is no such section
+
+        Returns:
+            Question IDs in survey order.
+        """
+        rows = self._get_section_rows(section)
+        groups = pd.unique(self.questions["question_group"].to_numpy()[rows]).tolist()
+        if type is not None:
+            groups = [
+                group for group in groups if type.value in self._question_types[group]
+            ]
+        return groups
+
+    def get_section_responses(
+        self, section: str | int, drop_other: bool = False
+    ) -> pd.DataFrame:
+        """Get the responses to all questions of a section at once.
+
+        The columns are converted like in `get_responses`. Columns of the
+        structure that are missing in the responses are skipped.
+
+        Args:
+            section: Section letter (e.g. "D" for questions D1, D2, ...) or
+                section ID (the index of `self.sections`)
+            drop_other: Whether to exclude contingent questions (i.e. "other")
+
+        Raises:
+            ValueError: There is no such section
+
+        Returns:
+            The response data for the section, columns in survey order.
+        """
+        section_questions = self.questions.iloc[self._get_section_rows(section)]
+        if drop_other:
+            section_questions = section_questions[~section_questions.is_contingent]
+
+        lazy = self._lazy_tables.get("responses")
+        available = lazy.columns if lazy is not None else self.responses.columns
+        section_questions = section_questions[section_questions.index.isin(available)]
+        responses = self._get_response_columns(list(section_questions.index))
+
+        # convert multiple-choice responses, see `_select_responses`
+        multiple_choice = (
+            section_questions["type"] == QuestionType.MULTIPLE_CHOICE.value
+        ) & ~section_questions["is_contingent"]
+        if multiple_choice.any():
+            columns = section_questions.index[multiple_choice]
+            responses[columns] = responses[columns].notnull()
+
+        return responses
 
     def query(self, expr: str) -> pd.DataFrame:
         """Filter responses DataFrame with a boolean expression.
@@ -420,3 +1586,58 @@ class LimeSurveyData:
             pd.DataFrame: Filtered responses
         """
         return self.responses.query(expr)
+
+
+def load_surveys(
+    files: Mapping[str, tuple[Path, Path]],
+    structure_parser: StructureParser = StructureParser.LXML,
+    structure_cache: Path | None = None,
+    csv_engine: CsvEngine = CsvEngine.C,
+    lazy: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, LimeSurveyData]:
+    """Load several surveys (e.g. the waves of a trend report) concurrently.
+
+    The structure XML files are parsed in worker processes, because parsing is
+    mostly pure Python. Afterwards, the responses CSV files are read in threads,
+    which overlap in I/O and the parts of the CSV readers that release the GIL.
+    The results are the same as creating the `LimeSurveyData` objects one after
+    another.
+
+    Args:
+        files: paths to the structure XML and responses CSV file, by wave name
+        structure_parser: backend for parsing the structure XML files
+        structure_cache: directory for caching the parsed structures, or None
+        csv_engine: backend for reading the responses CSV files
+        lazy: only read the headers of the responses CSV files now
+        max_workers: maximum number of processes and threads each, by default
+            one per survey (limited by the number of CPUs for processes)
+
+    Returns:
+        The survey objects, by wave name
+    """
+    if max_workers is None:
+        max_workers = max(len(files), 1)
+
+    # Finish all processes before starting threads, forking is not thread-safe
+    with ProcessPoolExecutor(min(max_workers, os.cpu_count() or 1)) as processes:
+        parsed = {
+            wave: processes.submit(
+                _parse_structure, structure_file, structure_parser, structure_cache
+            )
+            for wave, (structure_file, _) in files.items()
+        }
+        structures = {wave: future.result() for wave, future in parsed.items()}
+
+    with ThreadPoolExecutor(max_workers) as threads:
+        loaded = {
+            wave: threads.submit(
+                LimeSurveyData._from_structure,
+                structures[wave],
+                responses_file,
+                csv_engine,
+                lazy,
+            )
+            for wave, (_, responses_file) in files.items()
+        }
+        return {wave: future.result() for wave, future in loaded.items()}
@@ -1,9 +1,8 @@
 """These functions fix up two quirks specific to the data format of the 2024 survey."""
 
+from collections.abc import Iterable
 from typing import cast
 
-from bs4.element import Tag
-
 from ._types import QuestionTypeAlias, ResponseTypeAlias
 
 
@@ -21,39 +20,41 @@ def count_responses(responses: list[ResponseTypeAlias]) -> int:
         return len(responses)
 
 
-def name_response(response: Tag) -> str:
+def name_response(
+    var_name: str | None, subquestion_names: Iterable[str], choice_count: int
+) -> str:
     """Tag responses that do not have a varName (B4 in 2024 survey).
 
     B4 consists of ten subquestions, with each having two dimensions:
     kind of contract (B4_SQ0xx_1) and contract duration (B4_SQ0xx_2).
     We tag responses with either "B4a" or "B4b" here, and later rename subquestions.
 
+    The arguments are plain values (rather than parser elements), so that this
+    works the same for every structure parser backend.
+
     Args:
-        response: bs4 tag for the <response> element.
+        var_name: varName attribute of the <response> element, if any.
+        subquestion_names: varNames of all <subQuestion> elements of the question.
+        choice_count: Number of <value> elements within the <response> element.
 
     Returns:
         New name for the response, which is usually the varName of the reponse tag.
     """
-    name = cast(str, response.get("varName"))
-
-    if name is None:
-        parent = response.parent
-        assert parent is not None
-        for sq in parent.find_all("subQuestion"):
-            assert sq["varName"].startswith("B4_SQ"), (
+    if var_name is None:
+        for sq_name in subquestion_names:
+            assert sq_name.startswith("B4_SQ"), (
                 "only question B4 is known to have empty response tags"
             )
 
-        choices = response.find_all("value")
-        if len(choices) == 7:
+        if choice_count == 7:
             return "B4a"
-        elif len(choices) == 8:
+        elif choice_count == 8:
             return "B4b"
         else:
             raise AssertionError("expected 7 choices for B4-1 and 8 choices for B4-2.")
 
     else:
-        return name
+        return var_name
 
 
 def rename_question(questions: list[QuestionTypeAlias]) -> list[QuestionTypeAlias]:
@@ -0,0 +1,84 @@
+"""Tables whose columns are only read from disk when they are first accessed.
+
+Most analyses only need a few question groups, so reading (and keeping in memory)
+every column of a large response export is wasteful. A `LazyTable` knows the
+names of all columns up front, reads the requested ones through a callback, e.g.
+with `usecols` from a CSV file or from a columnar snapshot, and caches them.
+"""
+
+from collections.abc import Callable, Hashable, Iterable
+
+import pandas as pd
+
+__all__ = ["LazyTable"]
+
+
+class LazyTable:
+    """Table of which only requested columns are read, and then cached.
+
+    Attributes:
+        columns: all columns of the table, in order
+    """
+
+    def __init__(
+        self,
+        columns: pd.Index,
+        read_columns: Callable[[list[Hashable]], pd.DataFrame],
+    ) -> None:
+        """Create a table without reading any data.
+
+        Args:
+            columns: all columns of the table, in order
+            read_columns: callback that reads the given columns (with the index)
+        """
+        self.columns = columns
+        self._read_columns = read_columns
+        self._index: pd.Index | None = None
+        self._loaded: dict[Hashable, pd.Series] = {}
+
+    @property
+    def loaded_columns(self) -> list[Hashable]:
+        """Columns that have been read already, in order of reading."""
+        return list(self._loaded)
+
+    def get(self, columns: Iterable[Hashable]) -> pd.DataFrame:
+        """Get a subset of columns, reading the ones that are not cached yet.
+
+        Args:
+            columns: columns to get, in the desired order
+
+        Raises:
+            KeyError: Some columns are not part of the table.
+
+        Returns:
+            DataFrame with the selected columns
+        """
+        columns = list(columns)
+        missing = [column for column in columns if column not in self._loaded]
+        unknown = [column for column in missing if column not in self.columns]
+        if unknown:
+            raise KeyError(f"{unknown} not in index")
+
+        if missing or self._index is None:
+            df = self._read_columns(missing)
+            if self._index is None:
+                self._index = df.index
+            else:
+                # share one index object, so combining columns does not reindex
+                df.index = self._index
+            self._loaded.update(df.items())
+
+        return pd.DataFrame(
+            {column: self._loaded[column] for column in columns},
+            index=self._index,
+            columns=pd.Index(columns, dtype=object),
+            copy=False,
+        )
+
+    def get_all(self) -> pd.DataFrame:
+        """Get the full table, reading all columns that are not cached yet.
+
+        Returns:
+            DataFrame with all columns
+        """
+        return self.get(self.columns)
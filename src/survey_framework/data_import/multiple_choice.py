@@ -0,0 +1,203 @@
+"""Bit-packed storage for the answers to multiple-choice questions.
+
+LimeSurvey exports every option of a multiple-choice question as its own column,
+containing "Y" or nothing. `MultipleChoiceBits` stores a whole question as one
+bit per respondent and option instead: every option is a bitset over all
+respondents, packed into 64-bit words. This needs 8 times less memory than
+boolean columns (64 times less than object columns), and counting respondents
+becomes a popcount over a few words, optionally combined with the packed mask of
+a subgroup like a center.
+"""
+
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["MultipleChoiceBits"]
+
+# number of set bits for every possible byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _pack(values: np.ndarray) -> np.ndarray:
+    """Pack boolean values along the last axis into 64-bit words.
+
+    Args:
+        values: boolean array, respondents along the last axis
+
+    Returns:
+        Array of uint64 words, padded with zero bits
+    """
+    packed = np.packbits(values, axis=-1)
+    padding = -packed.shape[-1] % 8
+    if padding:
+        pad_width = [(0, 0)] * (packed.ndim - 1) + [(0, padding)]
+        packed = np.pad(packed, pad_width)
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Count the set bits along the last axis.
+
+    Args:
+        words: packed bits
+
+    Returns:
+        Number of set bits, with the last axis removed
+    """
+    if hasattr(np, "bitwise_count"):
+        # numpy >= 2.0 has a native popcount
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+class MultipleChoiceBits:
+    """Answers to a multiple-choice question, packed into bits.
+
+    Attributes:
+        options: column names of the answer options
+        index: respondent IDs
+        bits: one row of packed uint64 words per option
+    """
+
+    def __init__(self, options: pd.Index, index: pd.Index, bits: np.ndarray) -> None:
+        """Wrap packed answers, see `from_responses` for packing DataFrames.
+
+        Args:
+            options: column names of the answer options
+            index: respondent IDs
+            bits: one row of packed uint64 words per option
+        """
+        self.options = options
+        self.index = index
+        self.bits = bits
+
+    @classmethod
+    def from_responses(cls, responses: pd.DataFrame) -> Self:
+        """Pack the responses to a multiple-choice question.
+
+        Args:
+            responses: one column per option, either boolean like returned by
+                `LimeSurveyData.get_responses`, or "Y"/NaN like in the CSV file
+
+        Returns:
+            The packed answers
+        """
+        values = np.empty((responses.shape[1], responses.shape[0]), dtype=bool)
+        for i, (_, column) in enumerate(responses.items()):
+            if pd.api.types.is_bool_dtype(column.dtype):
+                values[i] = column.to_numpy(dtype=bool, na_value=False)
+            else:
+                values[i] = column.notna().to_numpy()
+        return cls(responses.columns, responses.index, _pack(values))
+
+    def __len__(self) -> int:
+        """Number of respondents."""
+        return len(self.index)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the packed answers."""
+        return self.bits.nbytes
+
+    def pack_mask(self, mask: "pd.Series[bool] | np.ndarray") -> np.ndarray:
+        """Pack a selection of respondents, e.g. all respondents of one center.
+
+        Args:
+            mask: boolean value per respondent. A Series is aligned to `index`
+                first, respondents missing in it are not selected.
+
+        Returns:
+            Packed mask, to be used with `counts` and `total`
+        """
+        if isinstance(mask, pd.Series):
+            mask = mask.reindex(self.index, fill_value=False).to_numpy()
+        return _pack(np.asarray(mask, dtype=bool))
+
+    def answered(self) -> np.ndarray:
+        """Get the respondents who selected at least one option.
+
+        Returns:
+            Packed mask of respondents
+        """
+        return np.bitwise_or.reduce(self.bits, axis=0)
+
+    def counts(self, mask: np.ndarray | None = None) -> "pd.Series[int]":
+        """Count the respondents who selected each option.
+
+        Args:
+            mask: packed selection of respondents (see `pack_mask`), or None for
+                all respondents
+
+        Returns:
+            Number of respondents, by option
+        """
+        bits = self.bits if mask is None else self.bits & mask
+        return pd.Series(_popcount(bits), index=self.options, name="count")
+
+    def total(self, mask: np.ndarray | None = None) -> int:
+        """Count the respondents who selected at least one option.
+
+        Args:
+            mask: packed selection of respondents (see `pack_mask`), or None for
+                all respondents
+
+        Returns:
+            Number of respondents
+        """
+        answered = self.answered()
+        if mask is not None:
+            answered &= mask
+        return int(_popcount(answered))
+
+    def group_counts(self, groups: pd.Series) -> pd.DataFrame:
+        """Count respondents per option within groups, e.g. per center.
+
+        Args:
+            groups: group of every respondent, aligned by respondent ID.
+                Respondents without group are ignored, and only groups with
+                respondents are included.
+
+        Returns:
+            Columns "total" (respondents in the group who selected at least one
+            option) and "count" (respondents in the group who selected the
+            option), indexed by group and option
+        """
+        groups = groups.reindex(self.index)
+        if isinstance(groups.dtype, pd.CategoricalDtype):
+            groups = groups.cat.remove_unused_categories()
+            keys = pd.CategoricalIndex(groups.cat.categories, dtype=groups.dtype)
+        else:
+            keys = pd.Index(groups.dropna().unique()).sort_values()
+
+        answered = self.answered()
+        totals = np.empty(len(keys), dtype=np.int64)
+        counts = np.empty((len(keys), len(self.options)), dtype=np.int64)
+        for i, key in enumerate(keys):
+            mask = self.pack_mask((groups == key).to_numpy(dtype=bool))
+            totals[i] = _popcount(answered & mask)
+            counts[i] = _popcount(self.bits & mask)
+
+        index = pd.MultiIndex.from_product(
+            [keys, self.options], names=[groups.name, self.options.name]
+        )
+        return pd.DataFrame(
+            {"total": np.repeat(totals, len(self.options)), "count": counts.ravel()},
+            index=index,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Unpack the answers into boolean columns.
+
+        Returns:
+            One boolean column per option, like `LimeSurveyData.get_responses`
+        """
+        values = np.unpackbits(
+            self.bits.view(np.uint8), axis=-1, count=len(self.index)
+        ).astype(bool)
+        return pd.DataFrame(
+            dict(zip(self.options, values, strict=True)),
+            index=self.index,
+            columns=self.options,
+        )
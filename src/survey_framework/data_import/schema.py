@@ -0,0 +1,213 @@
+"""Compiled survey structure for fast metadata lookups.
+
+`LimeSurveyData.questions` and `LimeSurveyData.sections` are DataFrames, which
+are convenient for filtering, but every lookup of a single label or choice text
+builds intermediate Series. Plots look up such metadata for every tick label and
+legend entry, so `Schema` compiles both tables once into plain records, which
+are found by code in a dict.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Self, TypeVar, cast
+
+import pandas as pd
+
+from .choices import ChoiceSet, intern_choices
+
+__all__ = ["Question", "Schema", "Section"]
+
+_T = TypeVar("_T")
+
+
+def _value(value: _T) -> _T | None:
+    """Replace missing values of the structure tables by None.
+
+    Args:
+        value: cell of the questions or sections table
+
+    Returns:
+        The value, or None if it is NaN
+    """
+    return None if isinstance(value, float) and value != value else value
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    """A section of the survey, i.e. a row of `LimeSurveyData.sections`.
+
+    Attributes:
+        id: section ID
+        title: section title
+        info: description shown at the start of the section
+    """
+
+    id: int
+    title: str
+    info: str
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    """A response column, i.e. a row of `LimeSurveyData.questions`.
+
+    Attributes:
+        name: column name, e.g. "B1_SQ001"
+        label: text of the (sub)question
+        format: response format like "longtext", or None
+        choices: answer option texts by code, or None for free text columns
+        choice_set: ID of the choices, shared by all columns with equal choices,
+            or None for free text columns
+        question_group: code of the question the column belongs to, e.g. "B1"
+        question_label: text of that question
+        question_description: help text of that question
+        type: question type, see `QuestionType`
+        section_id: ID of the section containing the question
+        contingent_of_name: column that this "other" answer belongs to, or None
+        contingent_of_choice: choice that this "other" answer belongs to, or None
+    """
+
+    name: str
+    label: str
+    format: str | None
+    choices: ChoiceSet | None
+    choice_set: int | None
+    question_group: str
+    question_label: str
+    question_description: str
+    type: str
+    section_id: int
+    contingent_of_name: str | None
+    contingent_of_choice: str | None
+
+    @property
+    def is_contingent(self) -> bool:
+        """Whether this column is the "other" answer of another column."""
+        return self.contingent_of_name is not None
+
+
+class Schema:
+    """Survey structure compiled into records, see `LimeSurveyData.schema`.
+
+    Choices are read-only, and columns with equal answer options share the same
+    `ChoiceSet`.
+
+    Attributes:
+        questions: question records, by column name
+        sections: section records, by section ID
+        groups: column names of every question group, in survey order
+    """
+
+    __slots__ = ("groups", "questions", "sections")
+
+    questions: Mapping[str, Question]
+    sections: Mapping[int, Section]
+    groups: Mapping[str, tuple[str, ...]]
+
+    def __init__(
+        self,
+        questions: Mapping[str, Question],
+        sections: Mapping[int, Section],
+    ) -> None:
+        """Collect compiled records, see `from_tables` for compiling DataFrames.
+
+        Args:
+            questions: question records, by column name
+            sections: section records, by section ID
+        """
+        self.questions = MappingProxyType(dict(questions))
+        self.sections = MappingProxyType(dict(sections))
+        groups: dict[str, list[str]] = {}
+        for name, question in self.questions.items():
+            groups.setdefault(question.question_group, []).append(name)
+        self.groups = MappingProxyType(
+            {group: tuple(names) for group, names in groups.items()}
+        )
+
+    @classmethod
+    def from_tables(cls, sections: pd.DataFrame, questions: pd.DataFrame) -> Self:
+        """Compile the sections and questions tables of a survey.
+
+        Args:
+            sections: sections table, indexed by section ID
+            questions: questions table, indexed by column name
+
+        Returns:
+            The compiled schema
+        """
+        compiled_sections = {
+            int(section_id): Section(int(section_id), title, info)
+            for section_id, title, info in zip(
+                sections.index, sections["title"], sections["info"], strict=True
+            )
+        }
+
+        # the questions table may contain plain dicts if it was built manually
+        choices, choice_set_ids = intern_choices(questions["choices"])
+        compiled_questions = {}
+        for row, row_choices, choice_set in zip(
+            questions.itertuples(), choices, choice_set_ids, strict=True
+        ):
+            compiled_questions[row.Index] = Question(
+                name=row.Index,
+                label=row.label,
+                format=_value(row.format),
+                choices=cast(ChoiceSet | None, _value(row_choices)),
+                choice_set=None if choice_set is pd.NA else int(choice_set),
+                question_group=row.question_group,
+                question_label=row.question_label,
+                question_description=row.question_description,
+                type=row.type,
+                section_id=int(row.section_id),
+                contingent_of_name=_value(row.contingent_of_name),
+                contingent_of_choice=_value(row.contingent_of_choice),
+            )
+
+        return cls(compiled_questions, compiled_sections)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether there is a response column with this name."""
+        return name in self.questions
+
+    def __getitem__(self, name: str) -> Question:
+        """Get the record of a response column.
+
+        Args:
+            name: column name
+
+        Raises:
+            KeyError: There is no such column
+
+        Returns:
+            The question record
+        """
+        return self.questions[name]
+
+    def group(self, question_group: str) -> tuple[Question, ...]:
+        """Get the records of all columns of a question.
+
+        Args:
+            question_group: question code, e.g. "B1"
+
+        Raises:
+            KeyError: There is no such question
+
+        Returns:
+            The question records, in survey order
+        """
+        return tuple(self.questions[name] for name in self.groups[question_group])
+
+    def section_of(self, name: str) -> Section:
+        """Get the section containing a response column.
+
+        Args:
+            name: column name
+
+        Raises:
+            KeyError: There is no such column
+
+        Returns:
+            The section record
+        """
+        return self.sections[self.questions[name].section_id]
@@ -0,0 +1,300 @@
+"""Survey tables in shared memory, for worker processes.
+
+Sending a `LimeSurveyData` to a `ProcessPoolExecutor` pickles all of its tables
+for every task, and every worker keeps its own copy. `SharedTables.publish`
+instead copies the column arrays (category codes, numbers, dates and missing
+value masks) once into a `multiprocessing.shared_memory` block. Workers
+`attach_tables` by the name of the block and get DataFrames on top of these
+arrays, without copying them. The arrays are read-only.
+
+Columns of Python objects (e.g. free texts) cannot be shared like this. They
+are pickled into the same block, together with the indexes, and unpickled once
+per process. Only share surveys with processes you trust, since attaching
+unpickles data.
+
+The process that publishes the tables owns the block: it must stay alive while
+workers use the tables, and `SharedTables.close` (or leaving the `with` block)
+frees the shared memory. Attached tables are kept until the worker exits.
+"""
+
+import contextlib
+import pickle
+import struct
+import sys
+import weakref
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from typing import Any, Self
+
+import numpy as np
+import pandas as pd
+from pandas.core.arrays.masked import BaseMaskedArray
+
+__all__ = ["SharedTables", "attach_tables"]
+
+# offsets of arrays in the block are multiples of this
+_ALIGNMENT = 64
+# length of the pickled layout at the start of the block
+_HEADER = struct.Struct("<Q")
+
+ColumnMeta = dict[str, Any]
+
+# tables attached in this process, by block name
+_attached: dict[str, dict[str, pd.DataFrame]] = {}
+
+
+class _AttachedMemory(shared_memory.SharedMemory):
+    """Shared memory block that stays mapped as long as arrays use it."""
+
+    def __init__(self, name: str) -> None:
+        """Attach to an existing block.
+
+        Args:
+            name: name of the block
+        """
+        if sys.version_info >= (3, 13):
+            # only the publishing process should unlink the block
+            super().__init__(name, track=False)  # ty: ignore[unknown-argument]
+        else:
+            super().__init__(name)
+
+    def __del__(self) -> None:
+        """Close the block, unless arrays still use it.
+
+        Arrays created with `np.frombuffer` keep the memory mapped, and it is
+        unmapped when the last of them is garbage collected.
+        """
+        with contextlib.suppress(BufferError, OSError):
+            self.close()
+
+
+def _describe_column(
+    name: Any, series: pd.Series, arrays: list[np.ndarray]
+) -> ColumnMeta:
+    """Describe how a column is stored, and collect its arrays.
+
+    Args:
+        name: column name
+        series: column data
+        arrays: list of arrays to share, the arrays of this column are appended
+
+    Returns:
+        Column metadata, with the positions of its arrays in `arrays`
+    """
+    dtype = series.dtype
+    meta: ColumnMeta = {"name": name, "dtype": dtype}
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        meta.update(kind="category", codes=len(arrays))
+        arrays.append(np.asarray(series.cat.codes))
+    elif isinstance(series.array, BaseMaskedArray):
+        # nullable integer / float / boolean: values and missing value mask
+        meta.update(kind="masked", values=len(arrays), mask=len(arrays) + 1)
+        arrays.append(series.to_numpy(dtype=series.array.dtype.type, na_value=0))
+        arrays.append(series.isna().to_numpy())
+    elif isinstance(dtype, np.dtype) and not pd.api.types.is_object_dtype(dtype):
+        meta.update(kind="numpy", values=len(arrays))
+        arrays.append(series.to_numpy())
+    else:
+        # Python objects and other extension arrays are pickled
+        meta.update(kind="pickle", values=series.array)
+
+    return meta
+
+
+def _build_column(
+    meta: ColumnMeta, arrays: list[np.ndarray]
+) -> pd.api.extensions.ExtensionArray | np.ndarray:
+    """Rebuild a column on top of the shared arrays.
+
+    Args:
+        meta: column metadata from `_describe_column`
+        arrays: read-only views of the shared arrays
+
+    Returns:
+        Column data
+    """
+    match meta["kind"]:
+        case "category":
+            # pandas-stubs lack `validate` and accept only sequences as codes
+            return pd.Categorical.from_codes(
+                arrays[meta["codes"]],  # ty: ignore[invalid-argument-type]
+                dtype=meta["dtype"],
+                validate=False,  # ty: ignore[unknown-argument]
+            )
+        case "masked":
+            array_type = meta["dtype"].construct_array_type()
+            return array_type(arrays[meta["values"]], arrays[meta["mask"]])
+        case "numpy":
+            return arrays[meta["values"]]
+        case _:
+            return meta["values"]
+
+
+class SharedTables:
+    """Tables published into a shared memory block, owned by this process.
+
+    Pass `name` to worker processes, which get the tables with `attach_tables`.
+    Use this as context manager, or call `close` when the workers are done. The
+    block is also freed when this object is garbage collected.
+
+    Attributes:
+        name: name of the shared memory block
+        nbytes: size of the block
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        """Take ownership of a block, see `publish` for creating one.
+
+        Args:
+            memory: shared memory block created by this process
+        """
+        self.name = memory.name
+        self.nbytes = memory.size
+        self._finalizer = weakref.finalize(self, _free, memory)
+
+    @classmethod
+    def publish(cls, tables: Mapping[str, pd.DataFrame]) -> Self:
+        """Copy tables into a new shared memory block.
+
+        Args:
+            tables: DataFrames with unique column names, by table name
+
+        Returns:
+            Owner of the new block
+        """
+        arrays: list[np.ndarray] = []
+        layout: dict[str, Any] = {"tables": {}, "arrays": []}
+        for table, df in tables.items():
+            layout["tables"][table] = {
+                "index": df.index,
+                "column_index": df.columns,
+                "columns": [
+                    _describe_column(name, series, arrays)
+                    for name, series in df.items()
+                ],
+            }
+
+        # place the arrays behind the layout, aligned for fast access
+        offset = 0
+        for array in arrays:
+            layout["arrays"].append((offset, array.dtype, len(array)))
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        pickled = pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL)
+        start = -(-(_HEADER.size + len(pickled)) // _ALIGNMENT) * _ALIGNMENT
+
+        memory = shared_memory.SharedMemory(create=True, size=max(start + offset, 1))
+        buffer = memory.buf
+        assert buffer is not None
+        try:
+            _HEADER.pack_into(buffer, 0, len(pickled))
+            buffer[_HEADER.size : _HEADER.size + len(pickled)] = pickled
+            for (array_offset, dtype, length), array in zip(
+                layout["arrays"], arrays, strict=True
+            ):
+                if length == 0:
+                    continue
+                target = np.ndarray(
+                    (length,),
+                    dtype=dtype,
+                    buffer=buffer,
+                    offset=start + array_offset,
+                )
+                target[:] = array
+                del target
+        except BaseException:
+            _free(memory)
+            raise
+
+        return cls(memory)
+
+    def close(self) -> None:
+        """Free the shared memory block.
+
+        Workers that attached the tables before keep them, but they cannot be
+        attached anymore.
+        """
+        self._finalizer()
+
+    def __enter__(self) -> Self:
+        """Use the shared tables in a `with` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Free the shared memory block at the end of the `with` block."""
+        self.close()
+
+
+def _free(memory: shared_memory.SharedMemory) -> None:
+    """Close and destroy a shared memory block created by this process.
+
+    Args:
+        memory: shared memory block
+    """
+    memory.close()
+    memory.unlink()
+
+
+def attach_tables(name: str) -> dict[str, pd.DataFrame]:
+    """Get the tables published by another process, without copying them.
+
+    The tables are kept for the lifetime of this process, so attaching the same
+    block again is cheap. Every call returns new shallow copies of them, so
+    columns added, replaced or dropped by one caller are not seen by the next.
+    Their values are read-only: writing into them raises a ValueError.
+
+    Args:
+        name: name of the shared memory block, see `SharedTables.name`
+
+    Raises:
+        FileNotFoundError: There is no such block (anymore).
+
+    Returns:
+        DataFrames by table name
+    """
+    tables = _attached.get(name)
+    if tables is not None:
+        return _copies(tables)
+
+    memory = _AttachedMemory(name)
+    buffer = memory.buf
+    assert buffer is not None
+    (length,) = _HEADER.unpack_from(buffer, 0)
+    layout = pickle.loads(buffer[_HEADER.size : _HEADER.size + length])
+    start = -(-(_HEADER.size + length) // _ALIGNMENT) * _ALIGNMENT
+
+    arrays = []
+    for offset, dtype, count in layout["arrays"]:
+        if count == 0:
+            array = np.empty(0, dtype=dtype)
+        else:
+            array = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=start + offset
+            )
+        array.flags.writeable = False
+        arrays.append(array)
+
+    tables = {}
+    for table, info in layout["tables"].items():
+        df = pd.DataFrame(
+            {meta["name"]: _build_column(meta, arrays) for meta in info["columns"]},
+            index=info["index"],
+            copy=False,
+        )
+        df.columns = info["column_index"]
+        tables[table] = df
+
+    _attached[name] = tables
+    return _copies(tables)
+
+
+def _copies(tables: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Get shallow copies of attached tables, which share the read-only arrays.
+
+    Args:
+        tables: DataFrames by table name
+
+    Returns:
+        New DataFrames by table name
+    """
+    return {table: df.copy(deep=False) for table, df in tables.items()}
@@ -0,0 +1,408 @@
+"""Columnar binary snapshots of survey tables.
+
+A snapshot is an uncompressed zip archive, similar to NumPy's `.npz` files:
+every numeric or categorical column is stored as its own `.npy` member, object
+columns (free text, choice dicts) as JSON members, and `meta.json` describes
+dtypes, categories and indexes. Loading a snapshot does not tokenize or infer
+anything, and single columns can be read without touching the rest of the file.
+
+Tables can be written in several parts (chunks of rows) with `SnapshotWriter`.
+The parts are stored separately and combined when reading. Snapshots are written
+atomically, so a failed write never leaves a partial snapshot behind.
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any, Self, cast
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionDtype
+from pandas.api.types import union_categoricals
+from pandas.core.arrays.masked import BaseMaskedArray
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "SnapshotWriter",
+    "read_snapshot",
+    "read_snapshot_columns",
+    "write_snapshot",
+]
+
+# Increase this whenever the file layout changes
+SNAPSHOT_VERSION = 2
+
+_META = "meta.json"
+
+ColumnMeta = dict[str, Any]
+
+
+def _write_npy(archive: zipfile.ZipFile, member: str, array: np.ndarray) -> None:
+    """Store a numpy array as `.npy` member of the archive.
+
+    Args:
+        archive: zip file opened for writing
+        member: member name
+        array: data to store
+    """
+    with archive.open(member, "w", force_zip64=True) as fp:
+        np.lib.format.write_array(fp, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def _read_npy(archive: zipfile.ZipFile, member: str) -> np.ndarray:
+    """Load a `.npy` member of the archive.
+
+    Args:
+        archive: zip file opened for reading
+        member: member name
+
+    Returns:
+        The stored array
+    """
+    with archive.open(member) as fp:
+        return np.lib.format.read_array(fp, allow_pickle=False)
+
+
+def _write_column(
+    archive: zipfile.ZipFile, prefix: str, name: Any, values: pd.Series | pd.Index
+) -> ColumnMeta:
+    """Store a single column (or index) and describe it.
+
+    Args:
+        archive: zip file opened for writing
+        prefix: member name prefix for this column
+        name: column name
+        values: column data
+
+    Raises:
+        TypeError: The dtype cannot be stored.
+
+    Returns:
+        Column metadata for `meta.json`
+    """
+    dtype = values.dtype
+    meta: ColumnMeta = {"name": name, "dtype": str(dtype)}
+
+    if isinstance(values, pd.RangeIndex):
+        meta.update(kind="range", start=values.start, stop=values.stop)
+        meta.update(step=values.step)
+    elif isinstance(dtype, pd.CategoricalDtype):
+        codes = cast(pd.Categorical, values.array).codes
+        _write_npy(archive, f"{prefix}.codes.npy", codes)
+        meta.update(
+            kind="category",
+            categories=dtype.categories.tolist(),
+            categories_dtype=str(dtype.categories.dtype),
+            ordered=bool(dtype.ordered),
+        )
+    elif isinstance(values.array, BaseMaskedArray):
+        # nullable integer / float / boolean: values and missing value mask
+        data = values.to_numpy(dtype=values.array.dtype.type, na_value=0)
+        _write_npy(archive, f"{prefix}.values.npy", data)
+        _write_npy(archive, f"{prefix}.mask.npy", values.isna().to_numpy())
+        meta.update(kind="masked")
+    elif pd.api.types.is_object_dtype(dtype):
+        with archive.open(f"{prefix}.json", "w") as fp:
+            fp.write(json.dumps(values.tolist()).encode("utf8"))
+        meta.update(kind="json")
+    elif isinstance(dtype, np.dtype):
+        _write_npy(archive, f"{prefix}.npy", values.to_numpy())
+        meta.update(kind="numpy")
+    else:
+        raise TypeError(f"Cannot store column {name} with dtype {dtype} in snapshot")
+
+    return meta
+
+
+def _read_column(
+    archive: zipfile.ZipFile, prefix: str, meta: ColumnMeta
+) -> pd.api.extensions.ExtensionArray | np.ndarray | pd.Index:
+    """Load a single column (or index) stored by `_write_column`.
+
+    Args:
+        archive: zip file opened for reading
+        prefix: member name prefix for this column
+        meta: column metadata from `meta.json`
+
+    Returns:
+        Column data
+    """
+    match meta["kind"]:
+        case "range":
+            return pd.RangeIndex(meta["start"], meta["stop"], meta["step"])
+        case "category":
+            categories = pd.Index(meta["categories"], dtype=meta["categories_dtype"])
+            dtype = pd.CategoricalDtype(categories, ordered=meta["ordered"])
+            codes = _read_npy(archive, f"{prefix}.codes.npy")
+            # pandas-stubs lack `validate` and accept only sequences as codes
+            return pd.Categorical.from_codes(
+                codes,  # ty: ignore[invalid-argument-type]
+                dtype=dtype,
+                validate=False,  # ty: ignore[unknown-argument]
+            )
+        case "masked":
+            data = _read_npy(archive, f"{prefix}.values.npy")
+            mask = _read_npy(archive, f"{prefix}.mask.npy")
+            dtype = cast(ExtensionDtype, pd.api.types.pandas_dtype(meta["dtype"]))
+            # masked arrays are created from values and missing value mask
+            array_type = cast(
+                Callable[[np.ndarray, np.ndarray], BaseMaskedArray],
+                dtype.construct_array_type(),
+            )
+            return array_type(data, mask)
+        case "json":
+            with archive.open(f"{prefix}.json") as fp:
+                values = json.load(fp)
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+        case "numpy":
+            return _read_npy(archive, f"{prefix}.npy")
+        case kind:
+            raise ValueError(f"Unknown column kind {kind} in snapshot")
+
+
+class SnapshotWriter:
+    """Write DataFrames into a snapshot file, optionally in chunks of rows.
+
+    Every call of `append` stores another part of a table, so tables can be
+    written without ever holding them in memory completely. The parts are
+    combined when reading the snapshot.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Create the snapshot file.
+
+        The snapshot is written to a temporary file next to `path`, which
+        replaces `path` only when the writer is closed successfully.
+
+        Args:
+            path: output file, overwritten if it exists
+        """
+        self._path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+        self._tmp_path = Path(tmp_name)
+        self._file = os.fdopen(fd, "w+b")
+        self._archive = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_STORED)
+        self._meta: dict[str, Any] = {"version": SNAPSHOT_VERSION, "tables": {}}
+
+    def __enter__(self) -> Self:
+        """Use the writer as context manager, closing it at the end."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the writer, or discard the snapshot if an exception occurred."""
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.discard()
+
+    def append(self, table: str, df: pd.DataFrame) -> None:
+        """Store a DataFrame, or append its rows to a table stored before.
+
+        Args:
+            table: name of the table
+            df: data to store, must have the same columns for every part
+
+        Raises:
+            TypeError: A column has a dtype that cannot be stored.
+            ValueError: The columns differ from the previous parts of the table.
+        """
+        if isinstance(df.index, pd.MultiIndex):
+            raise TypeError(f"Cannot store MultiIndex of {table} in snapshot")
+        if not df.columns.is_unique:
+            raise TypeError(f"Cannot store duplicate columns of {table} in snapshot")
+
+        table_meta = self._meta["tables"].setdefault(
+            table,
+            {
+                "columns_name": df.columns.name,
+                "columns": df.columns.tolist(),
+                "parts": [],
+            },
+        )
+        if df.columns.tolist() != table_meta["columns"]:
+            raise ValueError(f"Columns of {table} differ between parts")
+
+        prefix = f"{table}/{len(table_meta['parts'])}"
+        table_meta["parts"].append(
+            {
+                "index": _write_column(
+                    self._archive, f"{prefix}/index", df.index.name, df.index
+                ),
+                "columns": [
+                    _write_column(self._archive, f"{prefix}/{i}", name, df.iloc[:, i])
+                    for i, name in enumerate(df.columns)
+                ],
+            }
+        )
+
+    def close(self) -> None:
+        """Write the metadata and move the finished file to its path."""
+        if self._file.closed:
+            return
+        try:
+            self._archive.writestr(_META, json.dumps(self._meta))
+            self._archive.close()
+            self._file.close()
+            # temporary files are private, give the snapshot the usual permissions
+            os.chmod(self._tmp_path, _new_file_mode())
+            os.replace(self._tmp_path, self._path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        """Close the file without writing a snapshot, and delete it."""
+        # the archive is incomplete, so do not write its central directory
+        self._archive.fp = None
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _new_file_mode() -> int:
+    """Get the permissions that `open` gives new files, according to the umask."""
+    # the umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_snapshot(path: Path, tables: Mapping[str, pd.DataFrame]) -> None:
+    """Write DataFrames into a columnar snapshot file.
+
+    Args:
+        path: output file, overwritten if it exists
+        tables: DataFrames to store, by name
+
+    Raises:
+        TypeError: A column has a dtype that cannot be stored.
+    """
+    with SnapshotWriter(path) as writer:
+        for table, df in tables.items():
+            writer.append(table, df)
+
+
+def _concat(arrays: list[Any]) -> Any:
+    """Combine the parts of a column (or index) that was written in chunks.
+
+    Args:
+        arrays: data of all parts, as returned by `_read_column`
+
+    Returns:
+        Combined data
+    """
+    if len(arrays) == 1:
+        return arrays[0]
+    if isinstance(arrays[0], pd.Index):
+        return arrays[0].append(arrays[1:])
+    if all(isinstance(array, pd.Categorical) for array in arrays):
+        # keep the order of the first part, categories that only occur in later
+        # parts follow in order of appearance
+        return union_categoricals(arrays)
+    return pd.concat(
+        [pd.Series(array, copy=False) for array in arrays], ignore_index=True
+    ).array
+
+
+def _read_meta(archive: zipfile.ZipFile) -> dict[str, Any]:
+    """Load and check the snapshot metadata.
+
+    Args:
+        archive: zip file opened for reading
+
+    Raises:
+        ValueError: The file was written by an incompatible version.
+
+    Returns:
+        Content of `meta.json`
+    """
+    meta = json.loads(archive.read(_META))
+    if meta["version"] != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Snapshot version {meta['version']} is not supported, "
+            f"expected version {SNAPSHOT_VERSION}"
+        )
+    return meta
+
+
+def read_snapshot_columns(path: Path) -> dict[str, list[Any]]:
+    """Read the column names of all tables in a snapshot, but no data.
+
+    Args:
+        path: snapshot file
+
+    Raises:
+        ValueError: The file was written by an incompatible version.
+
+    Returns:
+        Column names of the stored DataFrames, by table name
+    """
+    with zipfile.ZipFile(path) as archive:
+        meta = _read_meta(archive)
+
+    return {
+        table: table_meta["columns"] for table, table_meta in meta["tables"].items()
+    }
+
+
+def read_snapshot(
+    path: Path,
+    tables: Iterable[str] | None = None,
+    columns: Mapping[str, Iterable[Any]] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Read DataFrames from a columnar snapshot file.
+
+    Args:
+        path: snapshot file
+        tables: names of the tables to load, or None for all of them
+        columns: optionally, the subset of columns to load for some tables
+
+    Raises:
+        ValueError: The file was written by an incompatible version.
+
+    Returns:
+        The stored DataFrames, by name
+    """
+    result = {}
+    with zipfile.ZipFile(path) as archive:
+        meta = _read_meta(archive)
+
+        for table in meta["tables"] if tables is None else tables:
+            table_meta = meta["tables"][table]
+            selected = None
+            if columns is not None and table in columns:
+                selected = set(columns[table])
+
+            parts = table_meta["parts"]
+            index = pd.Index(
+                _concat(
+                    [
+                        _read_column(archive, f"{table}/{p}/index", part["index"])
+                        for p, part in enumerate(parts)
+                    ]
+                ),
+                name=parts[0]["index"]["name"],
+            )
+            data = {
+                name: _concat(
+                    [
+                        _read_column(archive, f"{table}/{p}/{i}", part["columns"][i])
+                        for p, part in enumerate(parts)
+                    ]
+                )
+                for i, name in enumerate(table_meta["columns"])
+                if selected is None or name in selected
+            }
+            df = pd.DataFrame(data, index=index, copy=False)
+            if not data:
+                # keep the dtype of empty column indexes consistent
+                df.columns = pd.Index([], dtype=object)
+            df.columns.name = table_meta["columns_name"]
+            result[table] = df
+
+    return result
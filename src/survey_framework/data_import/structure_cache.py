@@ -0,0 +1,149 @@
+"""On-disk cache for parsed survey structures.
+
+Parsing the XML structure file is the slowest part of creating a `LimeSurveyData`
+object, but the file itself rarely changes. The parsed `sections` and `questions`
+tables are therefore pickled into a cache directory, keyed by a hash of the XML
+file content, the parser backend and `STRUCTURE_PARSER_VERSION`.
+
+Only point the cache to a directory you trust, since loading it unpickles data.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import TypedDict
+
+import pandas as pd
+
+from .survey_structure import STRUCTURE_PARSER_VERSION, StructureParser
+
+__all__ = [
+    "CachedStructure",
+    "read_cached_structure",
+    "structure_digest",
+    "write_cached_structure",
+]
+
+
+class CachedStructure(TypedDict):
+    """Cache file content: the key it was created for, and the parsed tables."""
+
+    sha256: str
+    parser: str
+    parser_version: int
+    sections: pd.DataFrame
+    questions: pd.DataFrame
+
+
+def structure_digest(structure_file: Path) -> str:
+    """Hash the content of the structure file, the key of its cache entry.
+
+    Args:
+        structure_file: path to the structure XML file
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(structure_file.read_bytes()).hexdigest()
+
+
+def _cache_path(cache_dir: Path, structure_file: Path, digest: str) -> Path:
+    """Get the cache file location for a structure file.
+
+    Args:
+        cache_dir: directory containing cache files
+        structure_file: path to the structure XML file
+        digest: hash of the structure file content
+
+    Returns:
+        Path of the cache file
+    """
+    return cache_dir / f"{structure_file.stem}.{digest[:16]}.pkl"
+
+
+def read_cached_structure(
+    structure_file: Path,
+    cache_dir: Path,
+    parser: StructureParser,
+    digest: str | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+    """Load the parsed structure tables from the cache, if a valid entry exists.
+
+    Cache files that cannot be read or unpickled, e.g. because they were written
+    with other versions of pandas or numpy, are treated as missing.
+
+    Args:
+        structure_file: path to the structure XML file
+        cache_dir: directory containing cache files
+        parser: parser backend that the cache entry must have been created with
+        digest: `structure_digest` of the structure file, computed if None
+
+    Returns:
+        Tuple of sections and questions tables, or None if there is no valid entry.
+    """
+    if digest is None:
+        digest = structure_digest(structure_file)
+    try:
+        with open(_cache_path(cache_dir, structure_file, digest), "rb") as fp:
+            cached: CachedStructure = pickle.load(fp)
+        valid = (
+            cached["sha256"] == digest
+            and cached["parser"] == parser
+            and cached["parser_version"] == STRUCTURE_PARSER_VERSION
+        )
+    except Exception:
+        # unpickling can raise almost anything, e.g. ModuleNotFoundError
+        return None
+    if not valid:
+        return None
+
+    return cached["sections"], cached["questions"]
+
+
+def write_cached_structure(
+    structure_file: Path,
+    cache_dir: Path,
+    parser: StructureParser,
+    sections: pd.DataFrame,
+    questions: pd.DataFrame,
+    digest: str | None = None,
+) -> Path:
+    """Store the parsed structure tables in the cache.
+
+    The file is written atomically, so concurrent workers never read partial files.
+
+    Args:
+        structure_file: path to the structure XML file
+        cache_dir: directory containing cache files (created if missing)
+        parser: parser backend used to create the tables
+        sections: parsed sections table
+        questions: parsed questions table
+        digest: `structure_digest` of the structure file, computed if None
+
+    Returns:
+        Path of the cache file
+    """
+    if digest is None:
+        digest = structure_digest(structure_file)
+    cached = CachedStructure(
+        sha256=digest,
+        parser=parser,
+        parser_version=STRUCTURE_PARSER_VERSION,
+        sections=sections,
+        questions=questions,
+    )
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_file = _cache_path(cache_dir, structure_file, digest)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            pickle.dump(cached, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_file)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return cache_file
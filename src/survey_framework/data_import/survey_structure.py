@@ -7,12 +7,14 @@ lime survey data such as *.xml structure files
 import os
 import re
 import warnings
+from enum import StrEnum
 from pathlib import Path
 from typing import TypedDict, cast
 from warnings import warn
 
 from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
 from bs4.element import Tag
+from lxml import etree
 
 from ._types import QuestionTypeAlias, ResponseData, ResponseTypeAlias
 from .fixup_2024 import count_responses, name_response, rename_question
@@ -29,10 +31,30 @@ class SurveyStructure(TypedDict):
     sections: list[SectionInfo]
 
 
+class StructureParser(StrEnum):
+    """Backends for parsing the XML structure file.
+
+    Both produce the same `SurveyStructure`. BS4 is the original implementation,
+    LXML walks the file once with `lxml.etree.iterparse` and is much faster.
+    """
+
+    BS4 = "bs4"
+    LXML = "lxml"
+
+
 __all__ = [
+    "STRUCTURE_PARSER_VERSION",
+    "StructureParser",
     "read_lime_questionnaire_structure",
 ]
 
+# Increase this whenever the parsed output changes, to invalidate cached structures
+STRUCTURE_PARSER_VERSION = 2
+
+# characters that are replaced by a simple space when cleaning texts
+_SPACE_LIKE = re.compile(r"[\n\t\xa0]")
+_REPEATED_SPACES = re.compile(" +")
+
 
 def _get_clean_string(tag: Tag) -> str:
     """Clear a text in XML from HTML tags and line breaks.
@@ -40,6 +62,42 @@ def _get_clean_string(tag: Tag) -> str:
     Args:
         tag: bs4 tag which contains text
 
+    Returns:
+        cleaned string
+    """
+    return _clean_text(tag.text)
+
+
+def _clean_text(text: str) -> str:
+    """Clear a text from HTML tags and line breaks.
+
+    Most texts in the structure file are plain text. Those are cleaned with
+    regular expressions only, and just actual HTML fragments (or texts with
+    character references) are run through an HTML parser. The result is the
+    same either way.
+
+    Args:
+        text: text content of an XML element, possibly containing HTML
+
+    Returns:
+        cleaned string
+    """
+    if "<" in text or "&" in text:
+        return _clean_html(text)
+
+    # Without markup, the HTML parser would return the stripped text unchanged
+    clean_string = _SPACE_LIKE.sub(" ", text.strip())
+
+    # Replace multiply repeated spaces by one
+    return _REPEATED_SPACES.sub(" ", clean_string)
+
+
+def _clean_html(text: str) -> str:
+    """Clear an HTML fragment from HTML tags and line breaks.
+
+    Args:
+        text: text content of an XML element containing HTML
+
     Returns:
         cleaned string
     """
@@ -48,7 +106,7 @@ def _get_clean_string(tag: Tag) -> str:
     with warnings.catch_warnings():
         warnings.simplefilter(action="ignore", category=MarkupResemblesLocatorWarning)
         clean_string = (
-            " ".join(BeautifulSoup(tag.text, "html.parser").stripped_strings)
+            " ".join(BeautifulSoup(text, "html.parser").stripped_strings)
             .replace("\n", " ")
             .replace("\t", " ")
             .replace("\xa0", " ")
@@ -56,7 +114,7 @@ def _get_clean_string(tag: Tag) -> str:
         )
 
     # Replace multiply repeated spaces by one
-    clean_string = re.sub(" +", " ", clean_string)
+    clean_string = _REPEATED_SPACES.sub(" ", clean_string)
 
     return clean_string
 
@@ -151,9 +209,14 @@ def _parse_single_question_response(
             * contingent_of_choice - <value> of the parent <choice> element
     """
     # Common response structure
+    parent = cast(Tag, response.parent)
     parsed_response = ResponseData(
         # fixup empty response tag in 2024 survey
-        name=name_response(response),
+        name=name_response(
+            cast(str | None, response.get("varName")),
+            (cast(str, sq["varName"]) for sq in parent.find_all("subQuestion")),
+            len(response.find_all("value")),
+        ),
         format=None,
         length=None,
         label=None,
@@ -336,6 +399,32 @@ def _parse_question(
     # Get question responses
     responses = _parse_question_responses(question)
 
+    return _build_question_columns(
+        question, question_label, question_description, subquestions, responses
+    )
+
+
+def _build_question_columns(
+    question: Tag | etree._Element,
+    question_label: str,
+    question_description: str,
+    subquestions: list[tuple[str, str]],
+    responses: list[ResponseTypeAlias],
+) -> list[QuestionTypeAlias]:
+    """Combine the parsed parts of a <question> section into data columns.
+
+    This is independent of the parser backend.
+
+    Args:
+        question: <question> element, only used in error messages
+        question_label: Parsed question title
+        question_description: Parsed question description
+        subquestions: Parsed subquestions in the question
+        responses: Parsed responses in the question
+
+    Returns:
+        List of parsed response columns, see `_parse_question`.
+    """
     # Get question type
     question_type = _get_question_type(subquestions, responses)
 
@@ -482,18 +571,14 @@ def _parse_section(section: Tag) -> SectionInfo:
     return SectionInfo(id=section_id, title=section_title, info=section_info)
 
 
-def read_lime_questionnaire_structure(filepath: Path) -> SurveyStructure:
-    """Read LimeSurvey XML structure file.
+def _read_structure_bs4(filepath: Path) -> SurveyStructure:
+    """Read LimeSurvey XML structure file using BeautifulSoup.
 
     Args:
         filepath: Path to the XML structure file
 
     Returns:
-        A dictionary
-            {
-                "sections": [...] - list of sections (see _parse_section)
-                "questions": [...] - list of data columns (see _parse_question)
-            }
+        Parsed sections and questions, see `read_lime_questionnaire_structure`.
     """
     # Read the structure file
     with open(filepath, encoding="utf8") as fp:
@@ -503,7 +588,6 @@ def read_lime_questionnaire_structure(filepath: Path) -> SurveyStructure:
     result_sections = list()
     result_questions = list()
     for section in soup.find_all("section"):
-        section = section
         section_dict = _parse_section(section)
         result_sections.append(section_dict)
 
@@ -520,3 +604,253 @@ def read_lime_questionnaire_structure(filepath: Path) -> SurveyStructure:
             result_questions += question_columns_list
 
     return SurveyStructure(sections=result_sections, questions=result_questions)
+
+
+# The functions below mirror the BeautifulSoup functions above for lxml elements.
+# Keep both in sync: `tests/test_structure.py` checks that they agree.
+
+
+def _lxml_clean_string(element: etree._Element | None) -> str:
+    """Clear the text of an lxml element, see `_get_clean_string`.
+
+    Args:
+        element: lxml element which contains text
+
+    Returns:
+        cleaned string
+    """
+    assert element is not None
+    return _clean_text("".join(element.itertext()))
+
+
+def _lxml_parse_single_question_response(
+    response: etree._Element,
+) -> ResponseTypeAlias:
+    """Parse single <response> element of a question.
+
+    Args:
+        response: lxml element of <response>
+
+    Raises:
+        AssertionError: Unknown response type. First child must be
+          either "free" or "fixed".
+
+    Returns:
+        Main response data and contingent question data,
+        see `_parse_single_question_response`.
+    """
+    parent = response.getparent()
+    assert parent is not None
+    parsed_response = ResponseData(
+        # fixup empty response tag in 2024 survey
+        name=name_response(
+            response.get("varName"),
+            (cast(str, sq.get("varName")) for sq in parent.iter("subQuestion")),
+            sum(1 for _ in response.iter("value")),
+        ),
+        format=None,
+        length=None,
+        label=None,
+        choices=None,
+    )
+    contingent_response = None
+
+    # Get first child element of <response> section
+    response_data = response.find("*")
+    assert response_data is not None
+
+    if response_data.tag == "free":
+        parsed_response.update(
+            {
+                "format": _lxml_clean_string(response_data.find(".//format")),
+                "length": _lxml_clean_string(response_data.find(".//length")),
+                "label": _lxml_clean_string(response_data.find(".//label")),
+            }
+        )
+    elif response_data.tag == "fixed":
+        choices = {
+            _lxml_clean_string(category.find(".//value")): _lxml_clean_string(
+                category.find(".//label")
+            )
+            for category in response_data.iterchildren("category")
+        }
+        parsed_response.update({"choices": choices})
+
+        contingent_questions = response_data.findall(".//contingentQuestion")
+        if contingent_questions:
+            assert len(contingent_questions) == 1, (
+                f"Too many 'contingentQuestion's for response {response}"
+            )
+            contingent_question = contingent_questions[0]
+            contingent_parent = contingent_question.getparent()
+            assert contingent_parent is not None
+
+            contingent_response = {
+                "name": cast(str, contingent_question.get("varName")),
+                "text": _lxml_clean_string(contingent_question.find(".//text")),
+                "length": _lxml_clean_string(contingent_question.find(".//length")),
+                "format": _lxml_clean_string(contingent_question.find(".//format")),
+                "contingent_of_name": parsed_response["name"],
+                "contingent_of_choice": _lxml_clean_string(
+                    contingent_parent.find(".//value")
+                ),
+            }
+    else:
+        raise AssertionError(
+            f"Unexpected response format {response}. Unknown response type."
+        )
+
+    return parsed_response, contingent_response
+
+
+def _lxml_parse_question(question: etree._Element) -> list[QuestionTypeAlias]:
+    """Parse single <question> section, see `_parse_question`.
+
+    Args:
+        question: lxml element of <question>
+
+    Returns:
+        List of parsed response columns.
+    """
+    # Get question label
+    text_sections = question.findall("text")
+    if not text_sections:
+        raise AssertionError(f"No question label for question {question}")
+    question_label = " ".join(map(_lxml_clean_string, text_sections)).strip()
+
+    # Get question description
+    question_description = ""
+    directive_sections = question.findall("directive")
+    if directive_sections:
+        question_description = " ".join(
+            [_lxml_clean_string(text) for text in directive_sections[0].iter("text")]
+        )
+        if len(directive_sections) > 1:
+            warn(
+                f"More than one 'directive' section provided for question {question}."
+                " Only the first one was used.",
+                stacklevel=2,
+            )
+
+    # Get question subQuestions, if it has
+    subquestions = [
+        (
+            cast(str, subquestion.get("varName")),
+            _lxml_clean_string(subquestion.find(".//text")),
+        )
+        for subquestion in question.iterchildren("subQuestion")
+    ]
+
+    # Get question responses
+    response_sections = question.findall("response")
+    if not response_sections:
+        raise AssertionError(
+            f"Unexpected question format for question {question}."
+            " There is no 'response' section."
+        )
+    responses = [
+        _lxml_parse_single_question_response(response) for response in response_sections
+    ]
+
+    return _build_question_columns(
+        question, question_label, question_description, subquestions, responses
+    )
+
+
+def _lxml_parse_section(section: etree._Element) -> SectionInfo:
+    """Parse questionnaire section, see `_parse_section`.
+
+    Args:
+        section: lxml element of <section>
+
+    Returns:
+        A dictionary with the section information consisting of id, title and info.
+    """
+    section_id_str = section.get("id")
+    if section_id_str is None:
+        raise AssertionError(
+            f"Unexpected section structure. No id attribute found for section {section}"
+        )
+    section_id = int(section_id_str)
+
+    section_info = ""
+    section_title = None
+    for info in section.iter("sectionInfo"):
+        position = _lxml_clean_string(info.find(".//position"))
+        if position == "title":
+            # like bs4's `section.sectionInfo`, always use the first <sectionInfo>
+            first_info = section.find(".//sectionInfo")
+            assert first_info is not None
+            section_title = _lxml_clean_string(first_info.find(".//text"))
+        elif position in ("before", "after"):
+            current_text = " ".join(
+                [_lxml_clean_string(description) for description in info.iter("text")]
+            )
+            section_info = f"{section_info} {current_text}".strip()
+        else:
+            raise AssertionError(
+                "Unexpected section structure."
+                f" Unexpected sectionInfo position '{position}' for section {section}"
+            )
+
+    if section_title is None:
+        raise AssertionError(
+            f"Unexpected section structure. No title found for section {section}"
+        )
+
+    return SectionInfo(id=section_id, title=section_title, info=section_info)
+
+
+def _read_structure_lxml(filepath: Path) -> SurveyStructure:
+    """Read LimeSurvey XML structure file using lxml.
+
+    The file is streamed with `iterparse`, so each <section> is handled as soon
+    as it is complete and freed afterwards.
+
+    Args:
+        filepath: Path to the XML structure file
+
+    Returns:
+        Parsed sections and questions, see `read_lime_questionnaire_structure`.
+    """
+    result_sections = list()
+    result_questions = list()
+    for _, section in etree.iterparse(filepath, events=("end",), tag="section"):
+        section_dict = _lxml_parse_section(section)
+        result_sections.append(section_dict)
+
+        for question in section.iter("question"):
+            result_questions += [
+                {**column, "section_id": str(section_dict["id"])}
+                for column in _lxml_parse_question(question)
+            ]
+
+        # free memory of everything parsed so far
+        section.clear()
+        while section.getprevious() is not None:
+            del cast(etree._Element, section.getparent())[0]
+
+    return SurveyStructure(sections=result_sections, questions=result_questions)
+
+
+def read_lime_questionnaire_structure(
+    filepath: Path, parser: StructureParser = StructureParser.LXML
+) -> SurveyStructure:
+    """Read LimeSurvey XML structure file.
+
+    Args:
+        filepath: Path to the XML structure file
+        parser: Which backend to use for parsing the XML file
+
+    Returns:
+        A dictionary
+            {
+                "sections": [...] - list of sections (see _parse_section)
+                "questions": [...] - list of data columns (see _parse_question)
+            }
+    """
+    match parser:
+        case StructureParser.BS4:
+            return _read_structure_bs4(filepath)
+        case StructureParser.LXML:
+            return _read_structure_lxml(filepath)
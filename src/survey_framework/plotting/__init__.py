@@ -0,0 +1,5 @@
+"""Plotting functions for survey results.
+
+seaborn, ausankey and plot_likert are imported inside the functions that use them,
+because importing them takes longer than drawing most plots.
+"""
@@ -3,7 +3,6 @@ from textwrap import wrap
 from typing import cast
 
 import pandas as pd
-import seaborn as sns
 from matplotlib import pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.container import BarContainer
@@ -107,6 +106,8 @@ def barplot_internal(
     Returns:
         Modified figure and axes
     """
+    import seaborn as sns
+
     # set up input for hue and colors for plotting
     colors: list[str] | list[tuple[float, float, float]] = list()
     match comparison:
@@ -195,10 +196,14 @@ def add_tick_labels(
         # get labels from survey data
         match survey.get_question_type(question=question):
             case QuestionType.SINGLE_CHOICE:
-                lookup_name = survey.questions.choices[question].get(label)
+                choices = survey.schema[question].choices
+                assert choices is not None
+                lookup_name = choices.get(label)
                 new_label = label if lookup_name is None else lookup_name
             case QuestionType.MULTIPLE_CHOICE:
-                new_label = survey.questions.choices[label]["Y"]
+                choices = survey.schema[label].choices
+                assert choices is not None
+                new_label = choices["Y"]
             case other:
                 raise NotImplementedError(f"Labels for {other} not implemented.")
         # clean up & shorten labels
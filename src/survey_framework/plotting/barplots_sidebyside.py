@@ -5,7 +5,6 @@ from typing import cast
 
 import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
@@ -54,6 +53,8 @@ def plot_bar_side_by_side(
     Returns:
         New Figure and Axes
     """
+    import seaborn as sns
+
     # set seaborn theme
     set_plotstyle()
 
@@ -67,8 +68,11 @@ def plot_bar_side_by_side(
     ax_left, ax_right = cast(tuple[Axes, Axes], axs)
 
     # determine order according to answers
-    order_left = [i for i in survey.questions.choices[y_left]]
-    order_right = [i for i in survey.questions.choices[y_right]]
+    choices_left = survey.schema[y_left].choices
+    choices_right = survey.schema[y_right].choices
+    assert choices_left is not None and choices_right is not None
+    order_left = list(choices_left)
+    order_right = list(choices_right)
 
     # .loc[:,var] -> left side is for index, right side for column
     # make countplots for total numbers
@@ -135,9 +139,9 @@ def plot_bar_side_by_side(
 
     # get titles
     if title_left is None:
-        title_left = survey.questions.label[y_left]
+        title_left = survey.schema[y_left].label
     if title_right is None:
-        title_right = survey.questions.label[y_right]
+        title_right = survey.schema[y_right].label
 
     # set titles
     plot_left.set_title("\n".join(wrap(title_left, 40)))
@@ -155,7 +159,7 @@ def plot_bar_side_by_side(
     # https://stackoverflow.com/questions/11244514/modify-tick-label-text
     y_ticklabels = [item.get_text() for item in plot_left.get_yticklabels()]
     for i in range(0, len(y_ticklabels)):
-        label = survey.questions.choices[y_right][y_ticklabels[i]]
+        label = choices_right[y_ticklabels[i]]
         y_ticklabels[i] = "\n".join(wrap(label, 20))
     plot_right.set_yticks(range(len(y_ticklabels)))
     plot_right.set_yticklabels(y_ticklabels)
@@ -223,6 +227,8 @@ def plot_sidebyside_comparison_singleQ(
     Returns:
         New matplotlib Figure and Axes for this bar plot.
     """
+    import seaborn as sns
+
     # set seaborn theme
     set_plotstyle()
 
@@ -289,19 +295,11 @@ def plot_sidebyside_comparison_singleQ(
 
     if title_left == "":
         title_left = (
-            base_q_left
-            + ": "
-            + survey.questions.loc[
-                survey.questions["question_group"] == base_q_left
-            ].question_label.iloc[0]
+            base_q_left + ": " + survey.schema.group(base_q_left)[0].question_label
         )
     if title_right == "":
         title_right = (
-            base_q_right
-            + ": "
-            + survey.questions.loc[
-                survey.questions["question_group"] == base_q_right
-            ].question_label.iloc[0]
+            base_q_right + ": " + survey.schema.group(base_q_right)[0].question_label
         )
 
     # set title
@@ -1,29 +1,24 @@
 """A heatmap, used to visualize correlation strength."""
 
-from enum import StrEnum
-
 import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 import survey_framework.plotting.helmholtzcolors as hc
-from survey_framework.data_analysis.scoring import (
-    Condition,
-    rate_burnout,
-    rate_mental_health,
-    rate_somatic,
-)
+from survey_framework.data_analysis.correlation import CorrMethod, correlate
 from survey_framework.data_import.data_import import LimeSurveyData
 
-
-class CorrMethod(StrEnum):
-    """Correlation Method used by Pandas."""
-
-    KENDALL = "kendall"  # Kendall's tau
-    PEARSON = "pearson"  # Pearson's rho
-    SPEARMAN = "spearman"  # Spearman's rho
+# health scores shown by the heatmap, by column of `LimeSurveyData.health_scores`
+HEALTH_SCORES = {
+    "state_anxiety_score": "State Anxiety",
+    "trait_anxiety_score": "Trait Anxiety",
+    "depression_score": "Depression",
+    "somatic_score": "Somatic Symptoms",
+    # "Exhaustion": "Exhaustion",
+    # "Cynicism": "Cynicism",
+    # "Professional Efficacy": "Professional Efficacy",
+}
 
 
 def plot_heatmap(
@@ -45,42 +40,12 @@ def plot_heatmap(
     Returns:
         tuple of matplotlib figure and axes for the heatmap
     """
-    """"""
-    SOMATIC = "D4"
-    BURNOUT = "D3d"
-
-    # health scores
-    sta = rate_mental_health(
-        survey.get_responses(Condition.STATE_ANXIETY), Condition.STATE_ANXIETY
-    )
-    tra = rate_mental_health(
-        survey.get_responses(Condition.TRAIT_ANXIETY), Condition.TRAIT_ANXIETY
-    )
-    depr = rate_mental_health(
-        survey.get_responses(Condition.DEPRESSION), Condition.DEPRESSION
-    )
-    somatic = rate_somatic(survey.get_responses(SOMATIC))
-    _bout = rate_burnout(survey.get_responses(BURNOUT)).set_index("id")
+    import seaborn as sns
 
-    correlations = pd.DataFrame(
-        {
-            "State Anxiety": df.corrwith(
-                sta["state_anxiety_score"], method=method.value
-            ),
-            "Trait Anxiety": df.corrwith(
-                tra["trait_anxiety_score"], method=method.value
-            ),
-            "Depression": df.corrwith(depr["depression_score"], method=method.value),
-            "Somatic Symptoms": df.corrwith(
-                somatic["somatic_score"], method=method.value
-            ),
-            # "Exhaustion": df.corrwith(bout["Exhaustion"], method=method.value),
-            # "Cynicism": df.corrwith(bout["Cynicism"], method=method.value),
-            # "Professional Efficacy": df.corrwith(
-            #     bout["Professional Efficacy"], method=method.value
-            # ),
-        }
-    )
+    # health scores, computed once per survey
+    health = survey.health_scores()[list(HEALTH_SCORES)].rename(columns=HEALTH_SCORES)
+    # all columns are ranked once, instead of once per health score
+    correlations = correlate(df, health, method).coefficients
 
     correlations.sort_values(by="State Anxiety", inplace=True)
     # print(correlations)
@@ -2,8 +2,6 @@
 
 from typing import cast
 
-import seaborn as sns
-
 helmholtz_information = "#a0235a"
 helmholtz_health = "#D23264"
 helmholtz_matter = "#F0781e"
@@ -32,6 +30,8 @@ transparent = "#ffffff00"
 
 def set_plotstyle() -> None:
     """Set the global seaborn plot style to our color scheme."""
+    import seaborn as sns
+
     sns.set_style("darkgrid", {"axes.facecolor": "#f2f0f0"})
 
 
@@ -44,6 +44,8 @@ def get_blues(n: int) -> list[tuple[float, float, float]]:
     Returns:
         List of colors as RGB tuples.
     """
+    import seaborn as sns
+
     blues = sns.blend_palette([darkblue, helmholtzblue, blue60, blue40], n)
     return cast(list[tuple[float, float, float]], blues)
 
@@ -57,6 +59,8 @@ def get_greens(n: int) -> list[tuple[float, float, float]]:
     Returns:
         List of colors as RGB tuples.
     """
+    import seaborn as sns
+
     greens = sns.blend_palette([darkgreen, helmholtzgreen, green60, "#dbeeaa"], n)
     return cast(list[tuple[float, float, float]], greens)
 
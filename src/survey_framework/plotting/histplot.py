@@ -7,7 +7,6 @@ from collections.abc import Sequence
 from typing import cast
 
 import pandas as pd
-import seaborn as sns
 from matplotlib import pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.container import BarContainer
@@ -51,6 +50,8 @@ def simple_histplot(
     Returns:
         New figure and axes of the histogram
     """
+    import seaborn as sns
+
     orderlist = order_dict.get(question_code)
     if orderlist:
         data_df[question_code] = pd.Categorical(
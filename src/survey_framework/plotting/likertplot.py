@@ -9,7 +9,6 @@ import pandas as pd
 from matplotlib.axes import Axes
 from matplotlib.container import BarContainer
 from matplotlib.figure import Figure
-from plot_likert import plot_likert as _likert  # type: ignore [import-untyped]
 
 from ..data_import.data_import import LimeSurveyData
 from ._barplot_enums import BarLabels
@@ -45,6 +44,8 @@ def plot_likertplot(
     Returns:
         The matplotlib figure and axis
     """
+    from plot_likert import plot_likert as _likert  # type: ignore [import-untyped]
+
     assert "id" not in data_df.columns
     set_plotstyle()
     colors = palette[len(order)]
@@ -62,17 +63,16 @@ def plot_likertplot(
         ax = _likert(dropped_df, order, colors=colors, ax=ax)
 
     # set the title (overarching question)
-    title = survey.questions.loc[survey.questions["question_group"] == question][
-        "question_label"
-    ].unique()
+    subquestions = survey.schema.group(question)
+    title = {subquestion.question_label for subquestion in subquestions}
     assert len(title) == 1, "Multiple question_labels found, check data correctness."
-    # ax.set_title(title[0])
+    # ax.set_title(title.pop())
 
     # set subquestion labels (y ticks)
     if relabel_subquestions:
         new_labels = []
         for old_label in ax.get_yticklabels():
-            label = cast(str, survey.questions.loc[old_label.get_text()]["label"])
+            label = survey.schema[old_label.get_text()].label
             clean_str = label.replace("/", " / ")
             new_labels.append("\n".join(wrap(clean_str, text_wrap, max_lines=3)))
         ax.set_yticklabels(new_labels, linespacing=0.9)
@@ -87,9 +87,9 @@ def plot_likertplot(
         old_legend.remove()
 
     # set the legend labels
-    choices = survey.questions.loc[survey.questions["question_group"] == question][
-        "choices"
-    ].iloc[0]  # underlying assumption: all subquestions use the same scale
+    # underlying assumption: all subquestions use the same scale
+    choices = subquestions[0].choices
+    assert choices is not None
     for text in legend.get_texts():
         text.set_text(choices[text.get_text()])
 
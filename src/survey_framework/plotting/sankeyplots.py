@@ -1,9 +1,7 @@
 """Sankey Plot -- visualizes the "flow" of participants between questions."""
 
-import ausankey as sky  # type: ignore[import-untyped]
 import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 from matplotlib.figure import Figure
 
 from .helmholtzcolors import set_plotstyle
@@ -33,6 +31,9 @@ def plot_sankey(
     Returns:
         New Figure and Axes
     """
+    import ausankey as sky  # type: ignore[import-untyped]
+    import seaborn as sns
+
     set_plotstyle()
 
     # Colors
@@ -5,7 +5,6 @@ from textwrap import wrap
 
 import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
@@ -22,11 +21,12 @@ def plot_survival_plot(
     colors: list[tuple[float, float, float]] | None = None,
     width: int = 6,
     height: int = 4,
+    column: str = "data",
 ) -> tuple[Figure, Axes]:
     """Plots the given DataFrame as a survival plot, approaching zero.
 
     Args:
-        df: DataFrame with a column of numerical data called "data".
+        df: DataFrame with a column of numerical data, see `column`.
         category: Column in `df` to categorize the data.
         ticks: Iterable of x axis ticks.
         tick_map: Function to generate strings from ticks.
@@ -35,10 +35,14 @@ def plot_survival_plot(
         colors: Line colors, instead of shades of blue.
         width: Horizontal figure size.
         height: Vertical figure size.
+        column: Column in `df` with the data, e.g. "somatic_score" of
+            `LimeSurveyData.health_scores`. Missing values are not counted.
 
     Returns:
         The matplotlib figure and axes.
     """
+    import seaborn as sns
+
     if legend_replace is None:
         legend_replace = dict()
     set_plotstyle()
@@ -52,7 +56,7 @@ def plot_survival_plot(
     sns.ecdfplot(
         data=df,
         ax=ax,
-        x="data",  # hard-coded for simplicity
+        x=column,
         hue=category,
         stat="percent",
         complementary=True,
@@ -73,10 +77,10 @@ def plot_survival_plot(
             # get number of participants...
             try:
                 # ...for string keys
-                group_n = counts.loc[label]["data"]
+                group_n = counts.loc[label][column]
             except KeyError:
                 # ...for integer keys
-                group_n = counts.loc[int(label)]["data"]
+                group_n = counts.loc[int(label)][column]
             # also replace the label if it's in the replacement dictionary
             replacement = legend_replace.get(label, label)
 
@@ -89,7 +93,7 @@ def plot_survival_plot(
         ax.text(
             0.99,
             0.99,
-            f"N = {len(df)}",
+            f"N = {df[column].count()}",
             ha="right",
             va="top",
             transform=ax.transAxes,
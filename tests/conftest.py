@@ -1,3 +1,4 @@
+import warnings
 from pathlib import Path
 
 import pytest
@@ -13,6 +14,8 @@ XML_FILE_NAME = "survey_738345_en.xml"
 CSV_FILE_NAME = "results-survey738345-Qcode-Acode.csv"
 # output directory
 OUTPUT_PATH = Path("output")
+# dummy data shipped with the repository (no confidential data)
+DUMMY_PATH = Path(__file__).parent.parent / "data"
 
 
 @pytest.fixture
@@ -25,3 +28,14 @@ def survey() -> LimeSurveyData:
 @pytest.fixture
 def output_path() -> Path:
     return OUTPUT_PATH
+
+
+@pytest.fixture
+def dummy_survey() -> LimeSurveyData:
+    # the dummy data does not match the structure file exactly, ignore warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return LimeSurveyData(
+            DUMMY_PATH / "survey_structure_2021.xml",
+            DUMMY_PATH / "dummy_data_2021_codeonly.csv",
+        )
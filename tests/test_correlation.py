@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from survey_framework.data_analysis.correlation import CorrMethod, correlate
+
+
+# pandas warns about the constant column, for which the coefficients are NaN
+@pytest.mark.filterwarnings("ignore:invalid value encountered in divide:RuntimeWarning")
+@pytest.mark.filterwarnings("ignore::scipy.stats.ConstantInputWarning")
+@pytest.mark.parametrize("method", CorrMethod)
+def test_correlate(method: CorrMethod) -> None:
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.integers(1, 6, (200, 5)), columns=list("abcde"))
+    data = data.where(rng.random(data.shape) > 0.2)
+    data["constant"] = 1
+    scores = pd.DataFrame(
+        {"x": rng.normal(size=150), "y": rng.integers(0, 20, 150)},
+        index=range(50, 200),
+    )
+    scores.loc[60:80, "x"] = np.nan
+
+    result = correlate(data, scores, method, p_values=True)
+
+    # same as pandas, on the pairwise-complete rows of the common index
+    expected = pd.DataFrame(
+        {
+            name: data.corrwith(score, method=method.value)
+            for name, score in scores.items()
+        }
+    )
+    pd.testing.assert_frame_equal(result.coefficients, expected)
+    assert (
+        result.counts.loc["a", "x"]
+        == (data.loc[50:, "a"].notna() & scores["x"].notna()).sum()
+    )
+    assert result.p_values is not None
+    assert np.isnan(result.p_values.loc["constant"]).all()
+
+    complete = data.loc[50:, "b"].notna() & scores["x"].notna()
+    test = {
+        CorrMethod.KENDALL: stats.kendalltau,
+        CorrMethod.PEARSON: stats.pearsonr,
+        CorrMethod.SPEARMAN: stats.spearmanr,
+    }[method](data.loc[50:, "b"][complete], scores["x"][complete])
+    assert result.p_values.loc["b", "x"] == pytest.approx(test.pvalue)
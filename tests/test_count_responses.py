@@ -0,0 +1,131 @@
+from collections.abc import Hashable
+
+import pandas as pd
+import pytest
+
+from survey_framework.data_analysis.count_responses import (
+    prepare_df_comparison,
+    prepare_df_comparison_multiple,
+    prepare_df_single,
+)
+from survey_framework.data_import.data_import import LimeSurveyData
+
+# group to compare by in the dummy data
+GROUP = "A6"
+
+
+def _as_read(values: pd.Series) -> pd.Series:
+    """Categories like read from the CSV alone: the occurring values, sorted."""
+    return values.astype(object).astype("category")
+
+
+def _ordered(values: pd.Series, ordering: dict[str, list[str]], q: str) -> pd.Series:
+    if q in ordering:
+        return pd.Series(
+            pd.Categorical(values, categories=ordering[q], ordered=True),
+            index=values.index,
+        )
+    return values
+
+
+def _baseline_single(
+    data: pd.DataFrame, q: str, ordering: dict[str, list[str]]
+) -> pd.DataFrame:
+    """`prepare_df_single` before fixed answer-option categories."""
+    counts = (
+        data.reset_index()
+        .groupby(q, observed=False)
+        .count()
+        .rename(columns={"id": "count"})
+        .reset_index()
+    )
+    if q in ordering:
+        counts[q] = _ordered(counts[q], ordering, q)
+        counts = counts.sort_values(by=q)
+    counts["proportion"] = counts["count"] / data.count().iloc[0]
+    return counts
+
+
+def _baseline_comparison_multiple(
+    data: pd.DataFrame, groups: pd.Series, q: str, q_comparison: str
+) -> tuple[pd.DataFrame, dict[Hashable, int]]:
+    """`prepare_df_comparison_multiple` before packed multiple-choice answers."""
+    data = data.copy()
+    data["total"] = data.sum(axis="columns").gt(0)
+    melted = pd.melt(
+        data.reset_index(), id_vars=["id", "total"], var_name=q, value_name="count"
+    ).join(groups, on="id")
+    counts = melted.groupby([q_comparison, q], observed=False).sum()
+    counts = counts.drop(columns=["id"])
+    counts["proportion"] = counts["count"] / counts["total"]
+    counts = counts.reset_index()
+    # one size per group, not only the distinct sizes
+    participants = counts.drop_duplicates(q_comparison).set_index(q_comparison)
+    participants = participants["total"]
+    return counts, participants.astype(int).to_dict()
+
+
+def _comparable(df: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """Same rows in the same order, with plain values instead of categories."""
+    df = df.astype({column: object for column in by})
+    return df.sort_values(by=by, key=lambda x: x.astype(str)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_single_like_baseline(dummy_survey: LimeSurveyData, reverse: bool) -> None:
+    for q in dummy_survey._type_groups["single-choice"]:
+        if q not in dummy_survey.responses.columns:
+            continue
+        data = dummy_survey.get_responses(q, drop_other=True)
+        if list(data.columns) != [q] or data[q].isna().all():
+            continue
+        choices = list(dummy_survey.get_choices(q))
+        ordering = {q: choices[::-1]} if reverse else {}
+        baseline = _baseline_single(data.apply(_as_read), q, ordering)
+
+        counts, participants = prepare_df_single(data, q, ordering)
+
+        assert participants == data[q].count()
+        assert (counts["count"] > 0).all()
+        if reverse:
+            pd.testing.assert_frame_equal(
+                counts.reset_index(drop=True), baseline.reset_index(drop=True)
+            )
+        else:
+            pd.testing.assert_frame_equal(
+                _comparable(counts, [q]), _comparable(baseline, [q])
+            )
+
+
+def test_comparison_like_baseline(dummy_survey: LimeSurveyData) -> None:
+    groups = dummy_survey.get_responses(GROUP)[GROUP]
+    for q in ("A1", "B2", "C2"):
+        data = dummy_survey.get_responses(q, drop_other=True)
+        baseline, baseline_sizes = prepare_df_comparison(
+            data.apply(_as_read), _as_read(groups), q, GROUP, {}
+        )
+
+        counts, sizes = prepare_df_comparison(data, groups, q, GROUP, {})
+
+        assert sizes == baseline_sizes
+        pd.testing.assert_frame_equal(
+            _comparable(counts, [GROUP, q]), _comparable(baseline, [GROUP, q])
+        )
+
+
+def test_comparison_multiple_like_baseline(dummy_survey: LimeSurveyData) -> None:
+    groups = dummy_survey.get_responses(GROUP)[GROUP]
+    for q in ("A10", "B1", "C3"):
+        data = dummy_survey.get_responses(q, drop_other=True)
+        baseline, baseline_sizes = _baseline_comparison_multiple(
+            data, _as_read(groups), q, GROUP
+        )
+
+        counts, sizes = prepare_df_comparison_multiple(data, groups, q, GROUP, {})
+
+        assert sizes == baseline_sizes
+        pd.testing.assert_frame_equal(
+            _comparable(counts, [GROUP, q]),
+            _comparable(baseline, [GROUP, q]),
+            check_dtype=False,
+        )
@@ -1,14 +1,6 @@
 from pathlib import Path
 
-import pandas as pd
-
-from survey_framework.data_analysis.scoring import (
-    Condition,
-    rate_burnout,
-    rate_mental_health,
-    rate_satisfaction,
-    rate_somatic,
-)
+from survey_framework.data_analysis.scoring import Scale, rate_satisfaction
 from survey_framework.data_import.data_import import LimeSurveyData
 from survey_framework.plotting.heatmap import plot_heatmap
 
@@ -31,28 +23,20 @@ def test_heatmap(survey: LimeSurveyData, output_path: Path) -> None:
 
 
 def test_heatmap_crossover(survey: LimeSurveyData, output_path: Path) -> None:
-    SOMATIC = "D4"
-    BURNOUT = "D3d"
     SECTION = "D"
 
-    # health scores (copied from plot_heatmap)
-    sta = rate_mental_health(
-        survey.get_responses(Condition.STATE_ANXIETY), Condition.STATE_ANXIETY
-    ).drop("state_anxiety_class", axis=1)
-    tra = rate_mental_health(
-        survey.get_responses(Condition.TRAIT_ANXIETY), Condition.TRAIT_ANXIETY
-    ).drop("trait_anxiety_class", axis=1)
-    depr = rate_mental_health(
-        survey.get_responses(Condition.DEPRESSION), Condition.DEPRESSION
-    ).drop("depression_class", axis=1)
-    somatic = rate_somatic(survey.get_responses(SOMATIC)).drop("somatic_class", axis=1)
-    bout = (
-        rate_burnout(survey.get_responses(BURNOUT))
-        .set_index("id")
-        .drop(["Profile", "EX_critical", "CY_critical", "PE_critical"], axis=1)
-    )
-
-    health = pd.concat([sta, tra, depr, somatic, bout], axis=1)
+    # health scores, the same table that plot_heatmap uses
+    health = survey.health_scores()[
+        [
+            "state_anxiety_score",
+            "trait_anxiety_score",
+            "depression_score",
+            "somatic_score",
+            Scale.EX,
+            Scale.CY,
+            Scale.PE,
+        ]
+    ]
     health.rename(
         {
             "state_anxiety_score": "State Anxiety",
@@ -0,0 +1,349 @@
+import gzip
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import cast
+
+import pandas as pd
+import pytest
+
+from survey_framework.data_import.data_import import (
+    CsvEngine,
+    LimeSurveyData,
+    QuestionType,
+    load_surveys,
+)
+
+DUMMY_PATH = Path(__file__).parent.parent / "data"
+
+
+def test_compressed_responses(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    compressed = tmp_path / "responses.csv.gz"
+    with gzip.open(compressed, "wb") as fp:
+        fp.write((DUMMY_PATH / "dummy_data_2021_codeonly.csv").read_bytes())
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        survey = LimeSurveyData(DUMMY_PATH / "survey_structure_2021.xml", compressed)
+
+    pd.testing.assert_frame_equal(survey.responses, dummy_survey.responses)
+    pd.testing.assert_frame_equal(
+        survey.lime_system_info, dummy_survey.lime_system_info
+    )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_string_paths(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    survey = LimeSurveyData(
+        str(DUMMY_PATH / "survey_structure_2021.xml"),
+        str(DUMMY_PATH / "dummy_data_2021_codeonly.csv"),
+        structure_cache=str(tmp_path),
+    )
+
+    pd.testing.assert_frame_equal(survey.questions, dummy_survey.questions)
+    pd.testing.assert_frame_equal(survey.responses, dummy_survey.responses)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_pyarrow_engine(dummy_survey: LimeSurveyData) -> None:
+    pytest.importorskip("pyarrow")
+    survey = LimeSurveyData(
+        DUMMY_PATH / "survey_structure_2021.xml",
+        DUMMY_PATH / "dummy_data_2021_codeonly.csv",
+        csv_engine=CsvEngine.PYARROW,
+    )
+
+    pd.testing.assert_frame_equal(survey.responses, dummy_survey.responses)
+    pd.testing.assert_frame_equal(
+        survey.lime_system_info, dummy_survey.lime_system_info
+    )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("csv_engine", list(CsvEngine))
+def test_lazy(dummy_survey: LimeSurveyData, csv_engine: CsvEngine) -> None:
+    if csv_engine == CsvEngine.PYARROW:
+        pytest.importorskip("pyarrow")
+    survey = LimeSurveyData(
+        DUMMY_PATH / "survey_structure_2021.xml",
+        DUMMY_PATH / "dummy_data_2021_codeonly.csv",
+        csv_engine=csv_engine,
+        lazy=True,
+    )
+    lazy = survey._lazy_tables["responses"]
+    assert lazy.loaded_columns == []
+
+    # only the columns of the requested question are read, including B1T
+    # which is filled from the contingent B1other column
+    b1 = survey.get_responses("B1")
+    assert set(lazy.loaded_columns) == set(b1.columns)
+    pd.testing.assert_frame_equal(b1, dummy_survey.get_responses("B1"))
+    pd.testing.assert_frame_equal(
+        survey.get_responses("D1"), dummy_survey.get_responses("D1")
+    )
+
+    pd.testing.assert_frame_equal(survey.responses, dummy_survey.responses)
+    pd.testing.assert_frame_equal(
+        survey.lime_system_info, dummy_survey.lime_system_info
+    )
+
+
+def test_question_index(dummy_survey: LimeSurveyData) -> None:
+    questions = dummy_survey.questions
+    for key in set(questions.index) | set(questions["question_group"]):
+        expected = questions[
+            (questions["question_group"] == key) | (questions.index == key)
+        ]
+        pd.testing.assert_frame_equal(dummy_survey.get_question(key), expected)
+
+    with pytest.raises(ValueError):
+        dummy_survey.get_question_type("XYZ")
+    assert dummy_survey.get_question_type("B1") == QuestionType.MULTIPLE_CHOICE
+    assert dummy_survey.get_choices("B1") is dummy_survey.get_choices("B1")
+    # cached choices are read-only for multiple-choice questions too
+    with pytest.raises(TypeError):
+        dummy_survey.get_choices("B1")["B1_SQ001"] = "changed"
+    with pytest.raises(TypeError):
+        dummy_survey.get_choices("D1").pop("A1")
+
+
+def test_responses_cache(dummy_survey: LimeSurveyData) -> None:
+    b1 = dummy_survey.get_responses("B1")
+    pd.testing.assert_frame_equal(b1, dummy_survey._select_responses("B1", False))
+
+    # cached values cannot be modified, but columns of the copy can
+    with pytest.raises(ValueError, match="read-only"):
+        b1.iloc[0, 0] = False
+    b1["B1_SQ001"] = True
+    assert not dummy_survey.get_responses("B1")["B1_SQ001"].all()
+
+    # replacing the responses discards the cache
+    responses = dummy_survey.responses.copy()
+    responses["B1_SQ001"] = "Y"
+    dummy_survey.responses = responses
+    assert dummy_survey.get_responses("B1")["B1_SQ001"].all()
+
+
+def test_multiple_choice_bits(dummy_survey: LimeSurveyData) -> None:
+    b1 = dummy_survey.get_responses("B1", drop_other=True)
+    bits = dummy_survey.get_multiple_choice("B1")
+    assert bits is dummy_survey.get_multiple_choice("B1")
+    pd.testing.assert_frame_equal(bits.to_frame(), b1)
+    pd.testing.assert_series_equal(
+        bits.counts(), b1.sum().rename("count"), check_dtype=False
+    )
+    assert bits.total() == b1.any(axis="columns").sum()
+
+    # counts within groups are the same as for the selected respondents
+    groups = dummy_survey.get_responses("A1")["A1"]
+    group_counts = bits.group_counts(groups)
+    for group in groups.cat.categories:
+        selected = b1[groups == group]
+        mask = bits.pack_mask(groups == group)
+        assert bits.total(mask) == selected.any(axis="columns").sum()
+        # like grouping the responses, groups without respondents are left out
+        if selected.empty:
+            assert group not in group_counts.index.get_level_values(0)
+            continue
+        assert group_counts.loc[group, "count"].tolist() == selected.sum().tolist()
+
+    with pytest.raises(ValueError, match="not multiple-choice"):
+        dummy_survey.get_multiple_choice("A1")
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_choice_categories(dummy_survey: LimeSurveyData) -> None:
+    # categories are the answer codes in the order of the survey structure
+    for column in ["A1", "A3", "B1T"]:
+        dtype = dummy_survey.responses[column].dtype
+        assert isinstance(dtype, pd.CategoricalDtype)
+        assert list(dtype.categories) == list(dummy_survey.get_choices(column))
+
+    # so all chunks of a file share the same codes
+    chunks = dummy_survey.iter_responses(
+        DUMMY_PATH / "dummy_data_2021_codeonly.csv", chunksize=7
+    )
+    for responses, _ in chunks:
+        assert responses["A1"].dtype == dummy_survey.responses["A1"].dtype
+
+
+def test_schema(dummy_survey: LimeSurveyData) -> None:
+    path = DUMMY_PATH / "dummy_data_2021_codeonly.csv"
+    with path.open(encoding="utf-8-sig") as fp:
+        names, dtypes, dates = dummy_survey._read_header(fp)
+    assert names[0] == "id"
+    assert dtypes["A1"] == "category"
+    assert dtypes["lastpage"] == pd.Int16Dtype()
+    assert dtypes["interviewtime"] == "float64"
+    assert "submitdate" in dates and "submitdate" not in dtypes
+
+    # the schema is compiled once per header
+    with path.open(encoding="utf-8-sig") as fp:
+        assert dummy_survey._read_header(fp)[1] is dtypes
+
+
+def test_synthesized_columns(dummy_survey: LimeSurveyData) -> None:
+    synthesized = dummy_survey.synthesized_columns
+    assert synthesized["B1T"] == "B1other"
+
+    responses = dummy_survey.responses
+    for column, other in synthesized.items():
+        # inserted in front of the contingent question
+        position = cast(int, responses.columns.get_loc(other))
+        assert responses.columns[position - 1] == column
+        pd.testing.assert_series_equal(
+            responses[column].notna(), responses[other].notna(), check_names=False
+        )
+
+
+def test_sections(dummy_survey: LimeSurveyData) -> None:
+    questions = dummy_survey.questions
+    groups = list(questions["question_group"].unique())
+    assert dummy_survey.get_section_questions("D") == [
+        group for group in groups if group.startswith("D")
+    ]
+    section_id = int(dummy_survey.get_question("D1")["section_id"].iloc[0])
+    assert "D1" in dummy_survey.get_section_questions(section_id)
+
+    single_choice = dummy_survey.get_questions_by_type(QuestionType.SINGLE_CHOICE)
+    assert dummy_survey.get_section_questions("B", QuestionType.SINGLE_CHOICE) == [
+        group for group in single_choice if group.startswith("B")
+    ]
+
+    # same columns and values as the responses to each question
+    responses = dummy_survey.get_section_responses("C", drop_other=True)
+    expected = pd.concat(
+        [
+            dummy_survey.get_responses(question, drop_other=True)
+            for question in dummy_survey.get_section_questions("C")
+        ],
+        axis="columns",
+    )
+    pd.testing.assert_frame_equal(responses, expected)
+
+    with pytest.raises(ValueError, match="Unexpected section"):
+        dummy_survey.get_section_responses("Z")
+
+
+def test_choice_sets(dummy_survey: LimeSurveyData) -> None:
+    questions = dummy_survey.questions
+    c1 = questions[questions["question_group"] == "C1"]
+    # all subquestions share one read-only choice set
+    assert c1["choice_set"].nunique() == 1
+    assert all(choices is c1["choices"].iloc[0] for choices in c1["choices"])
+    with pytest.raises(TypeError):
+        c1["choices"].iloc[0]["A1"] = "changed"
+
+    # columns without choices have no choice set
+    pd.testing.assert_series_equal(
+        questions["choice_set"].isna(),
+        questions["choices"].map(lambda choices: not isinstance(choices, dict)),
+        check_names=False,
+    )
+
+    # sharing survives pickling, e.g. for worker processes
+    unpickled = pickle.loads(pickle.dumps(c1))
+    assert all(
+        choices is unpickled["choices"].iloc[0] for choices in unpickled["choices"]
+    )
+
+
+def _add_shared_column(name: str) -> bool:
+    """Worker task: add a column to a shared survey, report if it was there."""
+    survey = LimeSurveyData.from_shared(name)
+    added_before = "extra" in survey.responses
+    survey.responses["extra"] = 1
+    return added_before
+
+
+def test_shared_memory(dummy_survey: LimeSurveyData) -> None:
+    with dummy_survey.publish_shared() as shared:
+        survey = LimeSurveyData.from_shared(shared.name)
+        for table in ["responses", "questions", "sections", "lime_system_info"]:
+            pd.testing.assert_frame_equal(
+                getattr(survey, table), getattr(dummy_survey, table)
+            )
+        pd.testing.assert_frame_equal(
+            survey.get_responses("C1"), dummy_survey.get_responses("C1")
+        )
+
+        # values are read-only, but columns can be replaced
+        responses = survey.responses
+        with pytest.raises(ValueError, match="read-only"):
+            responses.iloc[0, 1] = responses.iloc[1, 1]
+        responses["A3"] = responses["A3"].copy()
+        responses["extra"] = 1
+
+    # columns added to one survey do not leak into the next one
+    assert "extra" not in LimeSurveyData.from_shared(shared.name).responses
+
+    # the block is gone, only already attached tables can still be used
+    shared = dummy_survey.publish_shared()
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        LimeSurveyData.from_shared(shared.name)
+
+
+def test_shared_memory_workers(dummy_survey: LimeSurveyData) -> None:
+    # one worker process runs all tasks, on the same attached tables
+    with (
+        dummy_survey.publish_shared() as shared,
+        ProcessPoolExecutor(max_workers=1) as pool,
+    ):
+        assert list(pool.map(_add_shared_column, [shared.name] * 3)) == [False] * 3
+
+
+def test_compiled_schema(dummy_survey: LimeSurveyData) -> None:
+    schema = dummy_survey.schema
+    questions = dummy_survey.questions
+    assert list(schema.questions) == list(questions.index)
+
+    for name, row in questions.iterrows():
+        name = cast(str, name)
+        question = schema[name]
+        assert question.label == row["label"]
+        assert question.question_group == row["question_group"]
+        assert question.is_contingent == row["is_contingent"]
+        if isinstance(row["choices"], dict):
+            assert question.choices == row["choices"]
+        else:
+            assert question.choices is None
+        assert (
+            schema.section_of(name).title
+            == dummy_survey.sections.loc[int(row["section_id"]), "title"]
+        )
+
+    # equal answer options share one read-only mapping
+    group = schema.group("C1")
+    assert [question.name for question in group] == list(
+        questions.index[questions["question_group"] == "C1"]
+    )
+    assert all(question.choices is group[0].choices for question in group)
+    with pytest.raises(TypeError):
+        group[0].choices["A1"] = "changed"  # type: ignore[index]
+
+    # compiled again for new questions
+    dummy_survey.questions = questions.drop(index=group[0].name)
+    assert group[0].name not in dummy_survey.schema
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_load_surveys(dummy_survey: LimeSurveyData) -> None:
+    files: dict[str, tuple[Path, Path]] = {
+        "2021": (
+            DUMMY_PATH / "survey_structure_2021.xml",
+            DUMMY_PATH / "dummy_data_2021_codeonly.csv",
+        ),
+        "2024": (
+            DUMMY_PATH / "survey_structure.xml",
+            DUMMY_PATH / "dummy_data_codeonly.csv",
+        ),
+    }
+    surveys = load_surveys(files)
+    assert list(surveys) == ["2021", "2024"]
+
+    pd.testing.assert_frame_equal(surveys["2021"].questions, dummy_survey.questions)
+    pd.testing.assert_frame_equal(surveys["2021"].responses, dummy_survey.responses)
+    survey_2024 = LimeSurveyData(*files["2024"])
+    pd.testing.assert_frame_equal(surveys["2024"].responses, survey_2024.responses)
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+# modules that are slow to import, and the modules that must not load them
+HEAVY_PLOTTING = {"seaborn", "ausankey", "plot_likert"}
+IMPORT_BUDGETS = {
+    "survey_framework.data_import.data_import": HEAVY_PLOTTING | {"matplotlib"},
+    "survey_framework.data_analysis.analysis": HEAVY_PLOTTING | {"matplotlib"},
+    "survey_framework.data_analysis.count_responses": HEAVY_PLOTTING | {"matplotlib"},
+    "survey_framework.data_analysis.scoring": HEAVY_PLOTTING | {"matplotlib"},
+    "survey_framework.data_analysis.correlation": HEAVY_PLOTTING
+    | {"matplotlib", "scipy"},
+    "survey_framework.plotting.helmholtzcolors": HEAVY_PLOTTING | {"matplotlib"},
+    "survey_framework.plotting.barplots": HEAVY_PLOTTING,
+    "survey_framework.plotting.barplots_sidebyside": HEAVY_PLOTTING,
+    "survey_framework.plotting.heatmap": HEAVY_PLOTTING,
+    "survey_framework.plotting.histplot": HEAVY_PLOTTING,
+    "survey_framework.plotting.likertplot": HEAVY_PLOTTING,
+    "survey_framework.plotting.sankeyplots": HEAVY_PLOTTING,
+    "survey_framework.plotting.stacked": HEAVY_PLOTTING,
+    "survey_framework.plotting.survivalplot": HEAVY_PLOTTING,
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and parse `python -X importtime`.
+
+    Returns:
+        Cumulative import time in microseconds, by imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS)
+def test_import_budget(module: str) -> None:
+    times = import_times(module)
+    assert module in times
+
+    # heavy dependencies are imported when they are first used
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded & IMPORT_BUDGETS[module]
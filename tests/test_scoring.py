@@ -1,11 +1,20 @@
+from collections.abc import Iterator
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import pytest
 import seaborn as sns
 from matplotlib.ticker import PercentFormatter
 
+from survey_framework.data_analysis import instruments
+from survey_framework.data_analysis.instruments import (
+    Instrument,
+    compile_instruments,
+    get_instrument,
+    register_instrument,
+)
 from survey_framework.data_analysis.scoring import (
     Condition,
     Profile,
@@ -49,6 +58,84 @@ def test_depression(survey: LimeSurveyData, output_path: Path) -> None:
     print(res_df["depression_class"].value_counts())
 
 
+def test_mental_health_scores() -> None:
+    responses = pd.DataFrame(
+        [
+            ["A1"] * 6,
+            ["A4", "A1", "A1", "A4", "A8", None],
+            ["A2", "A8", "A8", "A8", None, None],
+        ],
+        columns=[f"D1_SQ{i:03d}" for i in range(1, 7)],
+        # answer options of D1, including "I don't want to answer" (A8)
+        dtype=pd.CategoricalDtype(["A1", "A2", "A3", "A4", "A8"]),
+    )
+
+    res_df = rate_mental_health(responses, Condition.STATE_ANXIETY, keep_subscores=True)
+    assert res_df.columns[-2:].tolist() == [
+        "state_anxiety_score",
+        "state_anxiety_class",
+    ]
+    assert res_df["D1_SQ002_score"].tolist()[:2] == pytest.approx([10 / 3, 10 / 3])
+    # scaled up from 4 answers, too few answers for the last participant
+    assert res_df["state_anxiety_score"].tolist()[:2] == pytest.approx([50, 20])
+    assert pd.isna(res_df["state_anxiety_score"].iloc[2])
+    assert res_df["state_anxiety_class"].tolist()[:2] == [
+        "moderate anxiety",
+        "no or low anxiety",
+    ]
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # instruments registered by a test are dropped after it
+    monkeypatch.setattr(instruments, "_REGISTRY", dict(instruments._REGISTRY))
+    instruments._compile.cache_clear()
+    yield
+    instruments._compile.cache_clear()
+
+
+@pytest.mark.usefixtures("registry")
+def test_instrument_registry() -> None:
+    d1 = pd.DataFrame(
+        [["A1"] * 6, ["A4", "A1", "A1", "A4", "A8", None]],
+        columns=[f"D1_SQ{i:03d}" for i in range(1, 7)],
+        dtype=pd.CategoricalDtype(["A1", "A2", "A3", "A4", "A8"]),
+    )
+    responses = d1.assign(B1=[1, 2])
+
+    # e.g. read from a TOML file
+    config = {
+        "name": "test_wellbeing",
+        "question": "D1",
+        "items": ["calm"],
+        "score_tables": {"calm": {"A1": 3, "A2": 2, "A3": 1, "A4": 0}},
+        "scaling": "mean",
+        "min_answered": 4,
+        "boundaries": [0, 1.5, 3],
+        "classes": ["low", "high"],
+    }
+    instrument = register_instrument(Instrument.from_config(config))
+    assert get_instrument("test_wellbeing") is instrument
+    with pytest.raises(ValueError):
+        register_instrument(instrument)
+    with pytest.raises(ValueError):
+        Instrument.from_config({**config, "colour": "blue"})
+
+    # all instruments scored in one batch
+    res_df = compile_instruments(["state_anxiety", "test_wellbeing"]).score(responses)
+    assert res_df.columns.tolist() == [
+        "state_anxiety_score",
+        "state_anxiety_class",
+        "test_wellbeing_score",
+        "test_wellbeing_class",
+    ]
+    pd.testing.assert_frame_equal(
+        res_df.iloc[:, :2], rate_mental_health(d1, Condition.STATE_ANXIETY)
+    )
+    assert res_df["test_wellbeing_score"].tolist() == [3, 1.5]
+    assert res_df["test_wellbeing_class"].tolist() == ["high", "low"]
+
+
 def test_somatic(survey: LimeSurveyData, output_path: Path) -> None:
     res_df = rate_somatic(survey.get_responses("D4"))
     print(res_df["somatic_class"].value_counts())
@@ -74,6 +161,48 @@ def test_burnout(survey: LimeSurveyData, output_path: Path) -> None:
     print(res_df)
 
 
+def test_burnout_profiles() -> None:
+    # item positions of the scales in D3d
+    ex = [0, 1, 2, 3, 5]
+    cy = [7, 8, 12, 13, 14]
+
+    def answers(high: list[int]) -> list[str | None]:
+        # "Every day" for the given items, "Never" for all others
+        return ["A8" if i in high else "A2" for i in range(16)]
+
+    pe = [i for i in range(16) if i not in ex + cy]
+    rows = {
+        Profile.ENGAGED: answers(pe),
+        Profile.INEFFECTIVE: answers([]),
+        Profile.OVEREXTENDED: answers(ex + pe),
+        Profile.DISENGAGED: answers(cy),
+        Profile.BURNOUT: answers(ex + cy),
+    }
+    incomplete = answers(ex)
+    incomplete[7] = None
+    responses = pd.DataFrame(
+        [*rows.values(), incomplete],
+        columns=[f"D3d_SQ{i:03d}" for i in range(1, 17)],
+        # answer options of D3d, without the unused "I don't want to answer" (A9)
+        dtype=pd.CategoricalDtype([f"A{i}" for i in range(2, 9)]),
+    )
+    # participant IDs are not row positions
+    responses.index = pd.Index([41, 7, 3, 12, 5, 0], name="id")
+
+    res_df = rate_burnout(responses)
+    assert res_df["id"].tolist() == responses.index.tolist()
+    assert res_df["Profile"].iloc[:-1].tolist() == list(rows)
+    assert pd.isna(res_df["Profile"].iloc[-1])
+    assert res_df["EX_critical"].tolist()[:-1] == [
+        False,
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert pd.isna(res_df["CY_critical"].iloc[-1])
+
+
 def test_burnout_invalid(survey: LimeSurveyData, output_path: Path) -> None:
     # conversion should fail when using the wrong questions as input
     with pytest.raises(ValueError):
@@ -83,7 +212,7 @@ def test_burnout_invalid(survey: LimeSurveyData, output_path: Path) -> None:
     with pytest.raises(ValueError):
         rate_burnout(survey.get_responses("D3"))
 
-    with pytest.raises(TypeError):
+    with pytest.raises(ValueError):
         rate_burnout(survey.get_responses("D4"))
 
 
@@ -133,6 +262,34 @@ def test_burnout_plot(survey: LimeSurveyData, output_path: Path) -> None:
     fig.savefig(output_path / SECTION / "D3d_scores.pdf")
 
 
+def test_health_scores(survey: LimeSurveyData) -> None:
+    health = survey.health_scores()
+    assert health.index.equals(survey.responses.index)
+
+    # same scores as the single scorers, aligned on the respondent ID
+    trait = rate_mental_health(
+        survey.get_responses(Condition.TRAIT_ANXIETY), Condition.TRAIT_ANXIETY
+    )
+    pd.testing.assert_frame_equal(health[trait.columns], trait)
+    somatic = rate_somatic(survey.get_responses("D4"))
+    pd.testing.assert_series_equal(health["somatic_score"], somatic["somatic_score"])
+    burnout = rate_burnout(survey.get_responses("D3d")).set_index("id")
+    pd.testing.assert_frame_equal(health[burnout.columns], burnout)
+
+    # cached until the responses are assigned
+    again = survey.health_scores()
+    assert np.shares_memory(
+        again["somatic_score"].to_numpy(), health["somatic_score"].to_numpy()
+    )
+    with pytest.raises(ValueError):
+        health["somatic_score"].to_numpy()[0] = 0
+    survey.responses = survey.responses
+    assert not np.shares_memory(
+        survey.health_scores()["somatic_score"].to_numpy(),
+        health["somatic_score"].to_numpy(),
+    )
+
+
 def test_satisfaction(survey: LimeSurveyData, output_path: Path) -> None:
     res_df = rate_satisfaction(survey.get_responses("C1"), calc_average=True)
     print(res_df)
@@ -0,0 +1,125 @@
+import csv
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from survey_framework.data_import.data_import import LimeSurveyData
+
+DUMMY_PATH = Path(__file__).parent.parent / "data"
+
+
+def test_snapshot_roundtrip(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    snapshot = tmp_path / "survey.snapshot"
+    dummy_survey.save_snapshot(snapshot)
+    loaded = LimeSurveyData.from_snapshot(snapshot)
+
+    for table in ["responses", "questions", "sections", "lime_system_info"]:
+        pd.testing.assert_frame_equal(
+            getattr(loaded, table),
+            getattr(dummy_survey, table),
+            check_index_type=True,
+            check_column_type=True,
+        )
+
+    # dtypes and choices are intact, so the usual accessors work the same way
+    assert loaded.get_choices("D1") == dummy_survey.get_choices("D1")
+    pd.testing.assert_frame_equal(
+        loaded.get_responses("B1"), dummy_survey.get_responses("B1")
+    )
+
+
+def test_snapshot_lazy(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    snapshot = tmp_path / "survey.snapshot"
+    dummy_survey.save_snapshot(snapshot)
+    loaded = LimeSurveyData.from_snapshot(snapshot, lazy=True)
+
+    pd.testing.assert_frame_equal(
+        loaded.get_responses("D1"), dummy_survey.get_responses("D1")
+    )
+    pd.testing.assert_frame_equal(loaded.responses, dummy_survey.responses)
+    pd.testing.assert_frame_equal(
+        loaded.lime_system_info, dummy_survey.lime_system_info
+    )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_snapshot_permissions(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    snapshot = tmp_path / "survey.snapshot"
+    umask = os.umask(0o027)
+    try:
+        dummy_survey.save_snapshot(snapshot)
+    finally:
+        os.umask(umask)
+
+    # like any new file, not private like the temporary file it was written to
+    assert snapshot.stat().st_mode & 0o777 == 0o640
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_snapshot_from_csv(dummy_survey: LimeSurveyData, tmp_path: Path) -> None:
+    snapshot = tmp_path / "survey.snapshot"
+    # small chunks, so dtypes and categories differ between parts
+    dummy_survey.save_snapshot_from_csv(
+        DUMMY_PATH / "dummy_data_2021_codeonly.csv", snapshot, chunksize=7
+    )
+    loaded = LimeSurveyData.from_snapshot(snapshot)
+
+    for table in ["responses", "questions", "sections", "lime_system_info"]:
+        pd.testing.assert_frame_equal(
+            getattr(loaded, table), getattr(dummy_survey, table)
+        )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 5, 7])
+def test_snapshot_from_csv_categories(tmp_path: Path, chunksize: int) -> None:
+    # answer texts instead of codes, in different chunks
+    with open(DUMMY_PATH / "dummy_data_2021_codeonly.csv", newline="") as fp:
+        rows = list(csv.reader(fp))
+    column = rows[0].index("A6")
+    rows[3][column] = "Zoology"
+    rows[30][column] = "Arts"
+    responses_file = tmp_path / "responses.csv"
+    with open(responses_file, "w", newline="") as fp:
+        csv.writer(fp).writerows(rows)
+    survey = LimeSurveyData(DUMMY_PATH / "survey_structure_2021.xml", responses_file)
+
+    snapshot = tmp_path / "survey.snapshot"
+    survey.save_snapshot_from_csv(responses_file, snapshot, chunksize=chunksize)
+
+    # answer codes in survey order, then the other values sorted, like when
+    # reading the whole file at once
+    for lazy in [False, True]:
+        loaded = LimeSurveyData.from_snapshot(snapshot, lazy=lazy)
+        pd.testing.assert_frame_equal(loaded.responses, survey.responses)
+        for name, values in survey.responses.items():
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                pd.testing.assert_index_equal(
+                    loaded.responses[name].cat.categories, values.cat.categories
+                )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_snapshot_from_failing_csv(
+    dummy_survey: LimeSurveyData, tmp_path: Path
+) -> None:
+    # a row with too many fields makes a later chunk fail to parse
+    lines = (DUMMY_PATH / "dummy_data_2021_codeonly.csv").read_text().splitlines()
+    lines.insert(28, lines[28] + ',"extra"' * 5)
+    bad_csv = tmp_path / "bad.csv"
+    bad_csv.write_text("\n".join(lines) + "\n")
+
+    snapshot = tmp_path / "survey.snapshot"
+    snapshot.write_bytes(b"previous snapshot")
+    with pytest.raises(pd.errors.ParserError):
+        dummy_survey.save_snapshot_from_csv(bad_csv, snapshot, chunksize=10)
+
+    # the previous file is kept, and no partial snapshot is left behind
+    assert snapshot.read_bytes() == b"previous snapshot"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "bad.csv",
+        "survey.snapshot",
+    ]
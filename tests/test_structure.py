@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from lxml import etree
+
+from survey_framework.data_import.data_import import LimeSurveyData
+from survey_framework.data_import.structure_cache import (
+    read_cached_structure,
+    write_cached_structure,
+)
+from survey_framework.data_import.survey_structure import (
+    StructureParser,
+    _clean_html,
+    _clean_text,
+    read_lime_questionnaire_structure,
+)
+
+# structure files shipped with the repository (no confidential data)
+DATA_PATH = Path(__file__).parent.parent / "data"
+STRUCTURE_FILES = [
+    "survey_structure.xml",
+    "survey_structure_2021.xml",
+    "survey_structure_2021_v2.xml",
+]
+
+
+@pytest.mark.parametrize("xml_file", STRUCTURE_FILES)
+def test_parsers_agree(xml_file: str) -> None:
+    bs4 = read_lime_questionnaire_structure(DATA_PATH / xml_file, StructureParser.BS4)
+    lxml = read_lime_questionnaire_structure(DATA_PATH / xml_file, StructureParser.LXML)
+
+    assert lxml["sections"] == bs4["sections"]
+    assert lxml["questions"] == bs4["questions"]
+
+
+@pytest.mark.parametrize("xml_file", STRUCTURE_FILES)
+def test_clean_text_fast_path(xml_file: str) -> None:
+    # the regex fast path must give the same result as the HTML parser
+    for element in etree.parse(DATA_PATH / xml_file).iter():
+        if isinstance(element.tag, str):
+            text = "".join(element.itertext())
+            assert _clean_text(text) == _clean_html(text)
+
+
+# the dummy data does not match the structure file exactly
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_structure_cache(tmp_path: Path) -> None:
+    xml_file = tmp_path / "structure.xml"
+    xml_file.write_bytes((DATA_PATH / "survey_structure_2021.xml").read_bytes())
+    cache_dir = tmp_path / "cache"
+
+    # creating the survey object fills the cache
+    parsed = LimeSurveyData(
+        xml_file, DATA_PATH / "dummy_data_2021_codeonly.csv", structure_cache=cache_dir
+    )
+    cached = read_cached_structure(xml_file, cache_dir, StructureParser.LXML)
+    assert cached is not None
+    pd.testing.assert_frame_equal(cached[0], parsed.sections)
+    pd.testing.assert_frame_equal(cached[1], parsed.questions)
+
+    # entries are only valid for the same parser and file content
+    assert read_cached_structure(xml_file, cache_dir, StructureParser.BS4) is None
+    xml_file.write_bytes(xml_file.read_bytes().replace(b"Sensitive", b"Sensible"))
+    assert read_cached_structure(xml_file, cache_dir, StructureParser.LXML) is None
+
+    cache_file = write_cached_structure(
+        xml_file, cache_dir, StructureParser.LXML, parsed.sections, parsed.questions
+    )
+    assert read_cached_structure(xml_file, cache_dir, StructureParser.LXML) is not None
+
+    # entries that cannot be unpickled, e.g. written by other pandas versions
+    # (this pickle refers to a module that does not exist), are cache misses
+    cache_file.write_bytes(b"cnot_a_module\nTables\n.")
+    assert read_cached_structure(xml_file, cache_dir, StructureParser.LXML) is None